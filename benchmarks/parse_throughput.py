@@ -0,0 +1,58 @@
+"""
+Throughput of the spring expression parser backends in expressions per second
+
+Run from the repository root:
+>> python -m benchmarks.parse_throughput
+"""
+import argparse
+import time
+
+from fbc.data.parse import parser_backends
+from fbc.samples.expressions import EXPRESSIONS, random_expressions
+
+
+def corpus(n: int):
+    """
+    :param n: number of random expressions to generate
+    :return: expressions accepted by the parsers
+    """
+    parser = parser_backends['pratt']()
+    expressions = []
+    for s in EXPRESSIONS + random_expressions(n):
+        try:
+            parser.parse(s)
+        except ValueError:
+            continue
+        expressions.append(s)
+    return expressions
+
+
+def throughput(backend: str, expressions, repeat: int) -> float:
+    """
+    :param backend: parser backend, one of `parser_backends`
+    :param expressions: expressions to parse
+    :param repeat: number of passes over all expressions
+    :return: parsed expressions per second
+    """
+    parser = parser_backends[backend]()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for s in expressions:
+            parser.parse(s)
+    return repeat * len(expressions) / (time.perf_counter() - start)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('-n', type=int, default=1000, help='number of random expressions')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='number of passes over all expressions')
+    args = arg_parser.parse_args()
+
+    expressions = corpus(args.n)
+    print(f"{len(expressions)} expressions, {args.repeat} passes")
+    for backend in parser_backends:
+        print(f"{backend:>10}: {throughput(backend, expressions, args.repeat):10.1f} expressions/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""
+Wall time and peak memory of the checking phases on synthetic questionnaires of growing size
+
+Each case runs with sympy predicates (the default path) and with BDD predicates (`use_bdd`, cases suffixed '-bdd').
+The predicate phase of the sympy path grows steeply with the number of pages, so its cases are capped at 12 pages;
+the BDD path additionally runs on larger questionnaires. Tracing memory slows the sympy path down a lot (several
+minutes for 'pages12'); `-k` selects cases.
+
+Run from the repository root:
+>> python -m benchmarks.scaling --baseline benchmarks/scaling_baseline.json
+>> python -m benchmarks.scaling --baseline benchmarks/scaling_baseline.json --update
+
+The baseline holds absolute wall times of the machine it was recorded on. Regenerate it with `--update` on the
+machine the results are compared on before looking for regressions; baselines from other machines are not comparable.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from fbc.cache import simplify_scope
+from fbc.data.xml import read_questionnaire
+from fbc.eval import construct_graph, disjointness_check, enum_dict, evaluate_node_predicates, graph_soundness_check, \
+    interval_dict
+from fbc.samples.questionnaires import generate_questionnaire
+
+PHASES = ['read', 'graph', 'predicates', 'soundness', 'disjointness']
+
+# name: generator arguments (see `generate_questionnaire`); all cases use the same seed and run with both predicate
+# representations
+CASES = {
+    'pages4': dict(pages=4),
+    'pages6': dict(pages=6),
+    'pages8': dict(pages=8),
+    'pages12': dict(pages=12),
+    'pages6-branching3': dict(pages=6, branching=3),
+    'pages6-enums6': dict(pages=6, enums=6),
+    'pages6-members6': dict(pages=6, members=6),
+    'pages6-depth2': dict(pages=6, depth=2),
+    'pages6-loops': dict(pages=6, loops=0.5),
+}
+
+# larger cases, run with BDD predicates only
+BDD_CASES = {
+    'pages16': dict(pages=16),
+    'pages32': dict(pages=32),
+    'pages64': dict(pages=64),
+    'pages32-branching3': dict(pages=32, branching=3),
+}
+
+REAL_WORLD = {
+    'questionnaire02': Path('tests', 'context', 'questionnaire02.xml'),
+}
+
+
+def run_phases(path: Path, parser: str, measure: Callable[[str, Callable[[], Any]], Any], use_bdd: bool = False) \
+        -> None:
+    """
+    Runs all phases on the questionnaire, each wrapped by `measure`. Failing soundness checks do not stop the run.
+
+    :param path: questionnaire xml file
+    :param parser: parser backend for transition conditions
+    :param measure: function of phase name and phase function, returning the result of the phase
+    :param use_bdd: represent predicates and filters as BDD nodes (see `fbc.eval.attach_bdd`)
+    """
+    with simplify_scope():
+        q = measure('read', lambda: read_questionnaire(path))
+        g = measure('graph', lambda: construct_graph(q, parser=parser))
+        enums = list(enum_dict(q.pages).values()) + list(interval_dict(q.variables).values())
+        source = q.pages[0].uid
+        measure('predicates', lambda: evaluate_node_predicates(g, source, enums, use_bdd))
+
+        def soundness():
+            try:
+                return graph_soundness_check(g, source, enums)
+            except ValueError:
+                return False
+
+        measure('soundness', soundness)
+        measure('disjointness', lambda: [disjointness_check(g, v, enums) for v in g.nodes if g.out_degree(v) > 1])
+
+
+def benchmark(path: Path, parser: str = 'pratt', use_bdd: bool = False) -> Dict[str, Dict[str, float]]:
+    """
+    Measures wall time (seconds) and peak memory (bytes, traced by `tracemalloc`) of each phase. Both are measured
+    in separate runs, each with an empty simplify cache, as tracing memory slows down the run.
+
+    :param path: questionnaire xml file
+    :param parser: parser backend for transition conditions
+    :param use_bdd: represent predicates and filters as BDD nodes
+    :return: {phase: {'time': ..., 'peak_memory': ...}}
+    """
+    result = {phase: {} for phase in PHASES}
+
+    def timed(phase, fun):
+        start = time.perf_counter()
+        value = fun()
+        result[phase]['time'] = time.perf_counter() - start
+        return value
+
+    def memory(phase, fun):
+        tracemalloc.start()
+        try:
+            value = fun()
+            result[phase]['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return value
+
+    run_phases(path, parser, timed, use_bdd)
+    run_phases(path, parser, memory, use_bdd)
+    return result
+
+
+def regressions(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 1.5,
+                min_time: float = 0.05) -> List[str]:
+    """
+    Compares the results with a baseline. A phase regresses if its time or peak memory exceeds the baseline by the
+    factor `threshold`; time differences below `min_time` seconds are ignored as noise.
+
+    :param results: benchmark results {case: {phase: {'time': ..., 'peak_memory': ...}}}
+    :param baseline: baseline of the same structure; cases and phases missing in the baseline are skipped
+    :param threshold: tolerated ratio of result and baseline
+    :param min_time: minimal time difference in seconds
+    :return: descriptions of all regressions
+    """
+    found = []
+    for case, phases in results.items():
+        for phase, measures in phases.items():
+            base = baseline.get(case, {}).get(phase)
+            if base is None:
+                continue
+            if measures['time'] > threshold * base['time'] and measures['time'] - base['time'] > min_time:
+                found.append(f"{case}/{phase}: time {measures['time']:.3f}s (baseline {base['time']:.3f}s)")
+            if measures['peak_memory'] > threshold * base['peak_memory']:
+                found.append(f"{case}/{phase}: peak memory {measures['peak_memory']} bytes "
+                             f"(baseline {base['peak_memory']} bytes)")
+    return found
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('-k', metavar='PATTERN', default='', help='only run cases whose name contains PATTERN')
+    arg_parser.add_argument('--parser', default='pratt', help='parser backend for transition conditions')
+    arg_parser.add_argument('--seed', type=int, default=0, help='seed of the generated questionnaires')
+    arg_parser.add_argument('--baseline', metavar='FILE', help='JSON baseline to compare with')
+    arg_parser.add_argument('--update', action='store_true', help='write the results to the baseline')
+    arg_parser.add_argument('--threshold', type=float, default=1.5, help='tolerated ratio of result and baseline')
+    args = arg_parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = dict(REAL_WORLD)
+        for name, kwargs in {**CASES, **BDD_CASES}.items():
+            paths[name] = Path(tmp, f'{name}.xml')
+            paths[name].write_text(generate_questionnaire(seed=args.seed, **kwargs))
+
+        # case name: (questionnaire, use_bdd)
+        runs = {name: (paths[name], False) for name in [*REAL_WORLD, *CASES]}
+        runs.update({f'{name}-bdd': (paths[name], True) for name in [*REAL_WORLD, *CASES, *BDD_CASES]})
+        for name, (path, use_bdd) in runs.items():
+            if args.k not in name:
+                continue
+            results[name] = benchmark(path, args.parser, use_bdd)
+            print(f"{name:>20}: " + ' '.join(f"{phase} {m['time']:7.3f}s {m['peak_memory'] / 2 ** 20:6.1f}MiB"
+                                             for phase, m in results[name].items()), flush=True)
+
+    if args.baseline is None:
+        return 0
+
+    if args.update:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        return 0
+
+    with open(args.baseline) as f:
+        found = regressions(results, json.load(f), args.threshold)
+    for r in found:
+        print(f'regression: {r}')
+    return 1 if found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Import time of the validation entry points with and without the rendering layer
+
+Run from the repository root:
+>> python -m benchmarks.startup
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# modules loaded by `fbc check` without `--render`
+CORE = 'import fbc.cli'
+# the same modules plus the rendering layer, as imported eagerly by `fbc.util` before
+RENDER = 'import fbc.cli, fbc.visualize'
+
+
+def import_time(statement: str, repeat: int) -> float:
+    """
+    :param statement: import statement, run in a fresh interpreter
+    :param repeat: number of interpreter starts
+    :return: median wall time in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', statement], check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def loaded_modules(statement: str, prefixes=('pygraphviz', 'PIL')):
+    """
+    :return: top level packages among `prefixes` that are loaded after running the import statement
+    """
+    script = f"{statement}\nimport sys\nprint(' '.join(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    loaded = subprocess.run([sys.executable, '-c', script], check=True, capture_output=True, text=True).stdout.split()
+    return [p for p in prefixes if p in loaded]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--repeat', type=int, default=10, help='number of interpreter starts per statement')
+    args = arg_parser.parse_args()
+
+    baseline = import_time('pass', args.repeat)
+    for name, statement in [('core', CORE), ('render', RENDER)]:
+        t = import_time(statement, args.repeat)
+        print(f"{name:>8}: {t - baseline:6.3f}s (interpreter {baseline:.3f}s excluded), "
+              f"loaded: {loaded_modules(statement) or 'no rendering modules'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+import sys
+
+from fbc.cli import main
+
+sys.exit(main())
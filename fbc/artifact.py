@@ -0,0 +1,118 @@
+import os
+import pickle
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+import networkx as nx
+
+import fbc
+from fbc.data import xml
+from fbc.data.parse import ParseCache
+from fbc.eval import Enum, Interv, construct_graph, enum_dict, evaluate_node_predicates, interval_dict
+
+# version of the artifact layout, to be increased whenever `CompiledQuestionnaire` changes
+ARTIFACT_VERSION = 2
+
+
+@dataclass
+class CompiledQuestionnaire:
+    # graph with 'filter' attributes on all edges and 'pred' attributes on all nodes reachable from `source`
+    graph: nx.DiGraph
+    enums: List[Union[Enum, Interv]]
+    source: Any
+
+
+def compile_questionnaire(data: bytes, parser: str = 'pyparsing', parse_cache: Optional[ParseCache] = None) \
+        -> CompiledQuestionnaire:
+    """
+    Constructs the graph of the questionnaire and evaluates all node predicates
+
+    :param data: questionnaire xml
+    :param parser: parser backend for transition conditions (see `parse.parser_backends`)
+    :param parse_cache: cache of parsed transition conditions (see `construct_graph`)
+    :return: `CompiledQuestionnaire`
+    """
+    q = xml.parse_questionnaire(data)
+    g = construct_graph(q, parser=parser, parse_cache=parse_cache)
+    enums = list(enum_dict(q.pages).values()) + list(interval_dict(q.variables).values())
+    source = q.pages[0].uid
+    evaluate_node_predicates(g, source, enums)
+    return CompiledQuestionnaire(g, enums, source)
+
+
+class ArtifactStore:
+    """
+    On-disk store of compiled questionnaires. Artifacts are keyed by the hash of the questionnaire xml and the parser
+    backend, in a directory per fbc version and `ARTIFACT_VERSION`, so an unchanged questionnaire is compiled once per
+    release. Truncated or corrupt artifacts are compiled again. Artifacts are pickled, i.e. the store must only be
+    shared between trusted users.
+
+    E.g.
+    >> store = ArtifactStore('.fbc_cache')
+    >> compiled, hit = store.load_or_compile('questionnaire.xml')
+    >> compiled.graph.nodes['A01']['pred']
+    var01
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        """
+        :param path: directory of the store
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def version_path(self) -> Path:
+        return Path(self.path, f'v{ARTIFACT_VERSION}-{fbc.__version__}')
+
+    def artifact_path(self, data: bytes, parser: str = 'pyparsing') -> Path:
+        """
+        :param data: questionnaire xml
+        :param parser: parser backend the questionnaire is compiled with
+        :return: file of the compiled questionnaire
+        """
+        digest = sha256(data).hexdigest()
+        return Path(self.version_path, digest[:2], f'{digest}-{parser}.pickle')
+
+    def load_or_compile(self, input_path: Union[Path, str], parser: str = 'pyparsing',
+                        parse_cache: Optional[ParseCache] = None) -> Tuple[CompiledQuestionnaire, bool]:
+        """
+        Loads the compiled questionnaire from the store, or compiles and stores it (see `compile_questionnaire`)
+
+        :param input_path: questionnaire xml file
+        :param parser: parser backend used on misses
+        :param parse_cache: cache of parsed transition conditions used on misses (see `construct_graph`)
+        :return: compiled questionnaire and True, if it was loaded from the store
+        """
+        return self.load_or_compile_data(Path(input_path).read_bytes(), parser, parse_cache)
+
+    def load_or_compile_data(self, data: bytes, parser: str = 'pyparsing', parse_cache: Optional[ParseCache] = None) \
+            -> Tuple[CompiledQuestionnaire, bool]:
+        """
+        See `load_or_compile`
+
+        :param data: questionnaire xml
+        :param parser: parser backend used on misses
+        :param parse_cache: cache of parsed transition conditions used on misses (see `construct_graph`)
+        :return: compiled questionnaire and True, if it was loaded from the store
+        """
+        path = self.artifact_path(data, parser)
+        if path.exists():
+            try:
+                compiled = pickle.loads(path.read_bytes())
+                self.hits += 1
+                return compiled, True
+            except (pickle.UnpicklingError, EOFError):
+                # truncated or corrupt artifact, it is replaced below
+                pass
+
+        self.misses += 1
+        compiled = compile_questionnaire(data, parser, parse_cache)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp_path.write_bytes(pickle.dumps(compiled, protocol=5))
+        os.replace(tmp_path, path)
+        return compiled, False
@@ -0,0 +1,161 @@
+import sys
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+from sympy import Basic, preorder_traversal, simplify
+
+
+def approximate_size(obj: Any) -> int:
+    """
+    Approximates the memory used by an object in bytes. Sympy expressions are summed up over all sub expressions,
+    which are shared between expressions, i.e. the estimate is an upper bound.
+
+    :param obj: object
+    :return: size in bytes
+    """
+    if isinstance(obj, Basic):
+        return sum(sys.getsizeof(e) for e in preorder_traversal(obj))
+    elif isinstance(obj, (tuple, frozenset)):
+        return sys.getsizeof(obj) + sum(approximate_size(o) for o in obj)
+    return sys.getsizeof(obj)
+
+
+class SimplifyCache:
+    """
+    Bounded LRU cache for sympy `simplify`. The cache is limited by number of entries and optionally by the
+    (approximate) memory of keys and results; the least recently used entries are evicted first. Hits, misses and
+    evictions are counted (see `stats`). Other functions of sympy expressions can store their results in the same
+    cache under their own keys (see `memoize`), e.g. `fbc.logic.classify.classify`.
+
+    E.g.
+    >> cache = SimplifyCache(maxsize=1024)
+    >> with simplify_scope(cache):
+    >>     g = construct_graph(q)
+    >> cache.stats()
+    {'hits': 27, 'misses': 31, 'evictions': 0, 'size': 31, 'bytes': 61124, 'maxsize': 1024, 'max_bytes': None}
+    """
+
+    def __init__(self, maxsize: Optional[int] = 4096, max_bytes: Optional[int] = None):
+        """
+        :param maxsize: maximal number of entries (None: unbounded)
+        :param max_bytes: maximal approximate memory of all entries in bytes (None: unbounded)
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+        self._sizes: Dict[Any, int] = {}
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        """
+        Returns the (cached) result of `simplify(*args, **kwargs)`
+        """
+        key = (args, frozenset(kwargs.items())) if kwargs else args
+        return self.memoize(key, lambda: simplify(*args, **kwargs))
+
+    def memoize(self, key: Hashable, fun: Callable[[], Any]) -> Any:
+        """
+        Returns the cached result for `key`, or computes it by `fun` and caches it
+
+        :param key: key of the result, needs to be distinct from the keys of other functions using the cache
+        :param fun: function computing the result
+        :return: result
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+
+        result = fun()
+
+        with self._lock:
+            if key not in self._entries:
+                size = approximate_size(key) + approximate_size(result) if self.max_bytes is not None else 0
+                self._entries[key] = result
+                self._sizes[key] = size
+                self.bytes += size
+                self._evict()
+
+        return result
+
+    def _evict(self) -> None:
+        while self._entries and ((self.maxsize is not None and len(self._entries) > self.maxsize) or
+                                 (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            key, _ = self._entries.popitem(last=False)
+            self.bytes -= self._sizes.pop(key)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Removes all entries; the counters are kept
+        """
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        """
+        :return: counters and current size of the cache
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._entries),
+                'bytes': self.bytes, 'maxsize': self.maxsize, 'max_bytes': self.max_bytes}
+
+
+# cache used outside of `simplify_scope`
+default_simplify_cache = SimplifyCache()
+
+_simplify_cache: ContextVar[SimplifyCache] = ContextVar('simplify_cache', default=default_simplify_cache)
+
+
+def current_simplify_cache() -> SimplifyCache:
+    """
+    :return: cache of the innermost `simplify_scope`, or `default_simplify_cache`
+    """
+    return _simplify_cache.get()
+
+
+@contextmanager
+def simplify_scope(cache: Optional[SimplifyCache] = None) -> Iterator[SimplifyCache]:
+    """
+    Context manager scoping all `simplify_cached` and `memoize_cached` calls (e.g. by `Enum.eq`, `brute_force_enums`,
+    `classify` and `construct_graph`) to the given cache, e.g. to a questionnaire or a session
+
+    :param cache: cache to use (default: a new `SimplifyCache`)
+    :return: the cache
+    """
+    if cache is None:
+        cache = SimplifyCache()
+
+    token = _simplify_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _simplify_cache.reset(token)
+
+
+def simplify_cached(*args, **kwargs) -> Any:
+    """
+    Cached sympy `simplify`, using the cache of the current `simplify_scope`
+    """
+    return _simplify_cache.get()(*args, **kwargs)
+
+
+def memoize_cached(key: Hashable, fun: Callable[[], Any]) -> Any:
+    """
+    Memoizes the result of `fun` in the cache of the current `simplify_scope` (see `SimplifyCache.memoize`)
+    """
+    return _simplify_cache.get().memoize(key, fun)
@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from fbc.artifact import ArtifactStore
+from fbc.cache import SimplifyCache, simplify_scope
+from fbc.data import parse
+from fbc.data.xml import parse_questionnaire, read_questionnaire
+from fbc.eval import construct_graph, enum_dict, evaluate_node_predicates, interval_dict
+from fbc.trace import tracing
+from fbc.util import timer
+from fbc.verify import verify_graph
+
+
+def questionnaire_paths(paths: List[str]) -> Iterator[Path]:
+    """
+    Expands the given paths: files are returned as they are, directories are searched recursively for `*.xml` files
+
+    :param paths: list of files and directories
+    :return: questionnaire files
+    """
+    for p in paths:
+        path = Path(p)
+        if path.is_dir():
+            yield from sorted(path.rglob('*.xml'))
+        else:
+            yield path
+
+
+def check_questionnaire(path: Path, render: bool = False, sat: bool = False, parse_cache: Optional[str] = None,
+                        parser: str = 'pyparsing', simplify_cache_size: Optional[int] = 4096,
+                        trace: Optional[str] = None, artifacts: Optional[str] = None, data: Optional[bytes] = None,
+                        simplify_cache: Optional[SimplifyCache] = None) -> Dict[str, Any]:
+    """
+    Validates a questionnaire: start node (in degree), soundness and disjointness of all outgoing edge conditions and
+    reachability of all final nodes (without out edges), see `fbc.verify.verify_graph`. All failing checks are
+    collected instead of stopping at the first one.
+
+    :param path: questionnaire xml file
+    :param render: draw the evaluated graph next to the questionnaire (`<name>.png` and `<name>_label.png`)
+    :param sat: decide soundness checks as satisfiability queries
+    :param parse_cache: directory of the on-disk store of parsed expressions (see `parse.ParseCache`)
+    :param parser: parser backend for transition conditions (see `parse.parser_backends`)
+    :param simplify_cache_size: maximal number of entries of the simplify cache scoped to the questionnaire
+    :param trace: if given, a Chrome trace of the check is written to `<trace>/<name>.trace.json` (see `fbc.trace`)
+    :param artifacts: directory of the store of compiled questionnaires (see `artifact.ArtifactStore`). If given, the
+                      phases 'read', 'graph' and 'predicates' are replaced by 'compile', i.e. loading or compiling
+                      the questionnaire, and the summary contains the key 'artifact' ('hit' or 'miss')
+    :param data: questionnaire xml; if given, `path` is used as name of the questionnaire only
+    :param simplify_cache: simplify cache to use, e.g. to keep it warm across questionnaires (default: a new cache
+                           with `simplify_cache_size` entries)
+    :return: summary with keys 'path', 'ok', 'errors', 'pages', 'transitions', 'timings' (seconds per phase) and
+             'simplify_cache' (see `SimplifyCache.stats`)
+    """
+    summary = {'path': str(path), 'ok': False, 'errors': [], 'timings': {}}
+    # the process wide parse cache of the parser backend is used, unless an on-disk store is given for this call
+    parse_store = parse.ParseCache(path=parse_cache, backend=parser) if parse_cache is not None else None
+    timings = summary['timings']
+
+    trace_path = str(Path(trace) / f'{path.stem}.trace.json') if trace is not None else None
+    if simplify_cache is None:
+        simplify_cache = SimplifyCache(maxsize=simplify_cache_size)
+    with timer() as total, simplify_scope(simplify_cache) as cache, \
+            (tracing(trace_path) if trace_path is not None else nullcontext()):
+        try:
+            if artifacts is not None:
+                with timer() as t:
+                    store = ArtifactStore(artifacts)
+                    compiled, hit = store.load_or_compile(path, parser, parse_store) if data is None else \
+                        store.load_or_compile_data(data, parser, parse_store)
+                timings['compile'] = float(t)
+                summary['artifact'] = 'hit' if hit else 'miss'
+                g, enums, source = compiled.graph, compiled.enums, compiled.source
+            else:
+                with timer() as t:
+                    q = read_questionnaire(path) if data is None else parse_questionnaire(data)
+                timings['read'] = float(t)
+
+                with timer() as t:
+                    g = construct_graph(q, parser=parser, parse_cache=parse_store)
+                    enums = list(enum_dict(q.pages).values()) + list(interval_dict(q.variables).values())
+                timings['graph'] = float(t)
+                source = q.pages[0].uid
+            summary.update({'pages': g.number_of_nodes(), 'transitions': g.number_of_edges()})
+
+            if artifacts is None:
+                with timer() as t:
+                    evaluate_node_predicates(g, source, enums)
+                timings['predicates'] = float(t)
+
+            with timer() as t:
+                report = verify_graph(g, source, enums, sat=sat)
+            timings['soundness'] = float(t)
+            summary['errors'].extend(report.errors)
+
+            if render:
+                with timer() as t:
+                    from fbc import visualize
+                    layout, _ = visualize.render(g, path.with_suffix('.png'))
+                    visualize.render(g, path.with_name(f'{path.stem}_label.png'), label=visualize.tweak_label,
+                                     layout=layout)
+                timings['render'] = float(t)
+        except Exception as err:
+            summary['errors'].append(f'{type(err).__name__}: {err}')
+
+        summary['ok'] = len(summary['errors']) == 0
+    timings['total'] = float(total)
+    summary['simplify_cache'] = cache.stats()
+
+    return summary
+
+
+def _check_job(args) -> Dict[str, Any]:
+    return check_questionnaire(*args)
+
+
+def check(paths: List[str], jobs: int = 1, render: bool = False, sat: bool = False,
+          parse_cache: Optional[str] = None, parser: str = 'pyparsing',
+          simplify_cache_size: Optional[int] = 4096, trace: Optional[str] = None,
+          artifacts: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Validates all given questionnaires (see `check_questionnaire`), using a pool of `jobs` worker processes
+
+    :param paths: list of questionnaire files and directories
+    :param jobs: number of worker processes
+    :param render: draw the evaluated graphs
+    :param sat: decide soundness checks as satisfiability queries
+    :param parse_cache: directory of the on-disk store of parsed expressions (see `parse.ParseCache`)
+    :param parser: parser backend for transition conditions (see `parse.parser_backends`)
+    :param simplify_cache_size: maximal number of entries of the simplify cache scoped to each questionnaire
+    :param trace: directory for Chrome traces, one per questionnaire
+    :param artifacts: directory of the store of compiled questionnaires
+    :return: summaries in the order of the input files
+    """
+    if trace is not None:
+        os.makedirs(trace, exist_ok=True)
+    job_args = [(path, render, sat, parse_cache, parser, simplify_cache_size, trace, artifacts)
+                for path in questionnaire_paths(paths)]
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from executor.map(_check_job, job_args)
+    else:
+        yield from map(_check_job, job_args)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='fbc', description='filter branching check for Zofar questionnaires')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    check_parser = commands.add_parser('check', help='validate questionnaires; prints one JSON line per questionnaire')
+    check_parser.add_argument('paths', nargs='+', help='questionnaire xml files or directories')
+    check_parser.add_argument('-j', '--jobs', type=int, default=1, help='number of worker processes')
+    check_parser.add_argument('--render', action='store_true', help='draw the evaluated graphs as png')
+    check_parser.add_argument('--sat', action='store_true', help='decide soundness checks as SAT queries')
+    check_parser.add_argument('--parse-cache', metavar='DIR', default=os.environ.get('FBC_PARSE_CACHE'),
+                              help='directory for storing parsed expressions (default: $FBC_PARSE_CACHE)')
+    check_parser.add_argument('--parser', choices=sorted(parse.parser_backends),
+                              help='parser backend for transition conditions (default: pyparsing, with --connect the '
+                                   'default of the daemon)')
+    check_parser.add_argument('--simplify-cache-size', type=int, default=4096, metavar='N',
+                              help='maximal number of cached simplifications per questionnaire')
+    check_parser.add_argument('--artifacts', metavar='DIR', default=os.environ.get('FBC_ARTIFACTS'),
+                              help='directory for storing compiled questionnaires (default: $FBC_ARTIFACTS)')
+    check_parser.add_argument('--trace', metavar='DIR',
+                              help='write a Chrome trace / Perfetto timeline per questionnaire to DIR')
+    check_parser.add_argument('--connect', metavar='SOCKET',
+                              help='send the questionnaires to a running `fbc serve` daemon instead (supports '
+                                   '--sat and --parser only)')
+
+    serve_parser = commands.add_parser('serve', help='run a validation daemon on a Unix domain socket')
+    serve_parser.add_argument('socket', help='path of the Unix domain socket')
+    serve_parser.add_argument('-j', '--jobs', type=int, default=1, help='number of worker processes')
+    serve_parser.add_argument('--parser', choices=sorted(parse.parser_backends), default='pratt',
+                              help='default parser backend for transition conditions')
+    serve_parser.add_argument('--artifacts', metavar='DIR', default=os.environ.get('FBC_ARTIFACTS'),
+                              help='directory for storing compiled questionnaires (default: $FBC_ARTIFACTS)')
+    serve_parser.add_argument('--simplify-cache-size', type=int, default=4096, metavar='N',
+                              help='maximal number of cached simplifications per worker')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        import asyncio
+        from fbc.daemon import Daemon
+        daemon = Daemon(args.socket, jobs=args.jobs, parser=args.parser, artifacts=args.artifacts,
+                        simplify_cache_size=args.simplify_cache_size)
+        try:
+            asyncio.run(daemon.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        except ValueError as err:
+            serve_parser.error(str(err))
+        return 0
+
+    if args.connect is not None:
+        # the daemon checks with its own workers, caches and artifact store
+        unsupported = [f"--{name.replace('_', '-')}" for name in ['jobs', 'render', 'parse_cache',
+                                                                  'simplify_cache_size', 'artifacts', 'trace']
+                       if getattr(args, name) != check_parser.get_default(name)]
+        if unsupported:
+            check_parser.error(f"not supported with --connect: {', '.join(unsupported)}")
+
+        from fbc.daemon import request
+        options = {'sat': args.sat} if args.parser is None else {'sat': args.sat, 'parser': args.parser}
+        summaries = (request(args.connect, path.read_text(encoding='utf-8'), path=str(path), **options)
+                     for path in questionnaire_paths(args.paths))
+    else:
+        summaries = check(args.paths, jobs=args.jobs, render=args.render, sat=args.sat,
+                          parse_cache=args.parse_cache, parser=args.parser or 'pyparsing',
+                          simplify_cache_size=args.simplify_cache_size, trace=args.trace, artifacts=args.artifacts)
+
+    ok = True
+    for summary in summaries:
+        print(json.dumps(summary), flush=True)
+        ok = ok and summary['ok']
+
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
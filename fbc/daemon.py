@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+# the checking modules (sympy) are imported by the worker processes only, so clients using `request` start fast
+
+# simplify cache of a worker process, kept warm across requests
+_worker_cache = None
+
+
+def _init_worker(simplify_cache_size: Optional[int]) -> None:
+    from fbc.cache import SimplifyCache
+    from fbc.data import parse
+
+    global _worker_cache
+    _worker_cache = SimplifyCache(maxsize=simplify_cache_size)
+    # build the parser grammars up front
+    for cache in parse.default_parse_caches.values():
+        cache.parser
+
+
+def _worker_check(request: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    from fbc.cli import check_questionnaire
+
+    data = request['xml'].encode('utf-8')
+    return check_questionnaire(Path(request.get('path', '<daemon>')), data=data, simplify_cache=_worker_cache,
+                               sat=request.get('sat', False), parser=request.get('parser', options['parser']),
+                               artifacts=options['artifacts'])
+
+
+class Daemon:
+    """
+    Validation server on a Unix domain socket. Requests and responses are JSON objects, one per line; a request
+    carries the questionnaire xml ('xml') and optionally a name ('path'), 'sat' and 'parser' (see
+    `fbc.cli.check_questionnaire`). The response is the summary of `check_questionnaire`. The checks run in a pool
+    of `jobs` long-lived worker processes, whose parse and simplify caches stay warm across requests; at most `jobs`
+    requests are processed at once, further requests wait.
+
+    E.g.
+    >> asyncio.run(Daemon('/tmp/fbc.sock', jobs=2).serve_forever())
+
+    >> request('/tmp/fbc.sock', Path('questionnaire.xml').read_text())
+    {'path': '<daemon>', 'ok': True, 'errors': [], ...}
+    """
+
+    def __init__(self, socket_path: Union[Path, str], jobs: int = 1, parser: str = 'pratt',
+                 artifacts: Optional[str] = None, simplify_cache_size: Optional[int] = 4096):
+        """
+        :param socket_path: path of the Unix domain socket
+        :param jobs: number of worker processes
+        :param parser: default parser backend for transition conditions
+        :param artifacts: directory of the store of compiled questionnaires (see `artifact.ArtifactStore`)
+        :param simplify_cache_size: maximal number of entries of the simplify cache of each worker
+        """
+        self.socket_path = str(socket_path)
+        self.jobs = jobs
+        self.options = {'parser': parser, 'artifacts': artifacts}
+        self.simplify_cache_size = simplify_cache_size
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def start(self) -> None:
+        """
+        Starts the worker pool and listens on the socket. A socket file left over by a daemon which is no longer
+        running is replaced.
+        """
+        if os.path.exists(self.socket_path):
+            if _listening(self.socket_path):
+                raise ValueError(f'a daemon is already listening on {self.socket_path}')
+            os.unlink(self.socket_path)
+        self.executor = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker,
+                                            initargs=(self.simplify_cache_size,))
+        self._slots = asyncio.Semaphore(self.jobs)
+        self.server = await asyncio.start_unix_server(self._handle, path=self.socket_path, limit=2 ** 26)
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def check(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        :param request: request object
+        :return: summary (see `fbc.cli.check_questionnaire`)
+        """
+        if not isinstance(request, dict) or not isinstance(request.get('xml'), str):
+            raise ValueError("request must be an object with the questionnaire xml as string 'xml'")
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, _worker_check, request,
+                                                                    self.options)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self.check(json.loads(line))
+                except Exception as err:
+                    # invalid requests as well as failing workers (e.g. `BrokenProcessPool`) are answered
+                    response = {'ok': False, 'errors': [f'{type(err).__name__}: {err}']}
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+def _listening(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(socket_path)
+            return True
+        except OSError:
+            return False
+
+
+def request(socket_path: Union[Path, str], xml: str, path: Optional[str] = None, **options) -> Dict[str, Any]:
+    """
+    Sends a questionnaire to a running `Daemon`
+
+    :param socket_path: path of the Unix domain socket
+    :param xml: questionnaire xml
+    :param path: name of the questionnaire reported in the summary
+    :param options: further request options ('sat', 'parser')
+    :return: summary (see `fbc.cli.check_questionnaire`)
+    """
+    message = {'xml': xml, **options}
+    if path is not None:
+        message['path'] = path
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(str(socket_path))
+        with s.makefile('rwb') as f:
+            f.write(json.dumps(message).encode('utf-8') + b'\n')
+            f.flush()
+            return json.loads(f.readline())
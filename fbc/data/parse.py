@@ -1,6 +1,17 @@
+import os
+import re
+from ast import literal_eval
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
 import pyparsing as pp
 pp.ParserElement.enablePackrat()
 
+# version of the lisp representation; has to be increased whenever the grammar or the parse actions change, since
+# it is part of the key of parsed expressions stored on disk (see `ParseCache`)
+PARSER_VERSION = 1
+
 
 def infix_to_lisp(tokens, op_assoc='left'):
     """
@@ -41,6 +52,7 @@ class LispParser:
     """
     Defines a `LispParser` converting spring expressions into a lisp notation
     """
+    version = f'pyparsing{pp.__version__}'
 
     def __init__(self):
         self.keywords = {'true', 'false', 'gt', 'ge', 'lt', 'le', 'and', 'or'}
@@ -91,3 +103,311 @@ class LispParser:
         :return: lisp expression
         """
         return self.bool_exp.parse_string(s, parse_all=True)[0]
+
+
+class PrattParser:
+    """
+    Defines a `PrattParser` converting spring expressions into the same lisp notation as `LispParser`. It uses a
+    single-pass regex tokenizer and precedence climbing instead of the nested pyparsing grammars. Like `LispParser`,
+    arithmetic operators have distinct precedence levels ('*' > '/' > '+' > '-'), and comparisons are atoms of boolean
+    expressions ('!' > 'and' > 'or').
+    """
+    version = 'pratt'
+
+    token_regex = re.compile(r"""
+        (?P<ws>\s+)
+        |(?P<number>(?:\d+[eE][+-]?\d+|(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?)|\d+)
+        |(?P<string>'(?:[^'\n\r\\]|''|\\(?:[^x]|x[0-9a-fA-F]+))*')
+        |(?P<name>[^\W\d]\w*)
+        |(?P<op>==|!=|[-+*/!().,])
+    """, re.VERBOSE)
+
+    keywords = {'true', 'false', 'gt', 'ge', 'lt', 'le', 'and', 'or'}
+    comparison_ops = {'gt', 'ge', 'lt', 'le', '==', '!='}
+    term_ops = {'*': 4, '/': 3, '+': 2, '-': 1}
+    bool_ops = {'and': 2, 'or': 1}
+
+    def tokenize(self, s: str) -> List[Tuple[str, Any, int]]:
+        """
+        Splits a spring expression into tokens
+
+        :param s: spring expression
+        :return: list of (kind, value, position) tuples, terminated by an 'end' token
+        """
+        tokens = []
+        pos = 0
+        while pos < len(s):
+            match = self.token_regex.match(s, pos)
+            if match is None:
+                raise ValueError(f"unexpected character at position {pos}: {s!r}")
+
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == 'number':
+                tokens.append((kind, int(value) if value.isdigit() else float(value), pos))
+            elif kind == 'name' and value in self.keywords:
+                tokens.append(('op', value, pos))
+            elif kind != 'ws':
+                tokens.append((kind, value, pos))
+            pos = match.end()
+
+        tokens.append(('end', None, pos))
+        return tokens
+
+    def parse(self, s):
+        """
+        Parses given spring expression and converts it into a lisp expression
+
+        :param s: spring expression
+        :return: lisp expression
+        """
+        parser = _PrattState(self, self.tokenize(s), s)
+        lisp = parser.bool_exp()
+        parser.expect('end')
+        return lisp
+
+
+class _PrattState:
+    def __init__(self, grammar: PrattParser, tokens: List[Tuple[str, Any, int]], s: str):
+        self.grammar = grammar
+        self.tokens = tokens
+        self.s = s
+        self.pos = 0
+        # set if only a prefix of the current token was consumed (see `bool_atom`); the remainder matches nothing
+        self.partial = False
+        # parsed function calls and identifiers by start position, which avoids re-parsing nested calls when
+        # backtracking from a term to a function call
+        self.memo = {}
+
+    def mark(self) -> Tuple[int, bool]:
+        return self.pos, self.partial
+
+    def reset(self, mark: Tuple[int, bool]) -> None:
+        self.pos, self.partial = mark
+
+    def peek(self, offset: int = 0) -> Tuple[str, Any, int]:
+        if self.partial and offset == 0:
+            return 'partial', self.tokens[self.pos][1], self.tokens[self.pos][2]
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def is_op(self, *values) -> bool:
+        kind, value, _ = self.peek()
+        return kind == 'op' and value in values
+
+    def error(self) -> ValueError:
+        kind, value, pos = self.peek()
+        return ValueError(f"unexpected {kind} {value!r} at position {pos}: {self.s!r}")
+
+    def expect(self, kind: str, value=None):
+        token = self.peek()
+        if token[0] != kind or (value is not None and token[1] != value):
+            raise self.error()
+        self.pos += 1
+        return token[1]
+
+    def bool_exp(self, min_prec: int = 0):
+        left = self.bool_unary()
+        while self.is_op(*self.grammar.bool_ops) and self.grammar.bool_ops[self.peek()[1]] >= min_prec:
+            op = self.expect('op')
+            right = self.bool_exp(self.grammar.bool_ops[op] + 1)
+            left = (op, left, right)
+        return left
+
+    def bool_unary(self):
+        if self.is_op('!'):
+            self.pos += 1
+            return 'not', self.bool_unary()
+        return self.bool_atom()
+
+    def bool_atom(self):
+        if self.is_op('true', 'false'):
+            return self.expect('op') == 'true'
+        elif self.peek()[0] == 'name' and self.peek()[1].startswith(('true', 'false')):
+            # the pyparsing grammar matches boolean literals without word boundary, e.g. 'trueValue' is parsed as
+            # `True` followed by the unparsable remainder 'Value'
+            self.partial = True
+            return self.peek()[1].startswith('true')
+
+        # a term followed by a comparison operator is a predicate, otherwise (like the ordered choice of the pyparsing
+        # grammar) a function call or identifier, or a parenthesized boolean expression
+        start = self.mark()
+        try:
+            lterm = self.term()
+            if self.is_op(*self.grammar.comparison_ops):
+                op = self.expect('op')
+                return op, lterm, self.term()
+        except ValueError:
+            pass
+        self.reset(start)
+
+        if self.peek()[0] == 'name':
+            return self.call_or_identifier()
+        elif self.is_op('('):
+            self.pos += 1
+            exp = self.bool_exp()
+            self.expect('op', ')')
+            return exp
+        raise self.error()
+
+    def term(self, min_prec: int = 0):
+        left = self.term_unary()
+        while self.is_op(*self.grammar.term_ops) and self.grammar.term_ops[self.peek()[1]] >= min_prec:
+            op = self.expect('op')
+            right = self.term(self.grammar.term_ops[op] + 1)
+            left = (op, left, right)
+        return left
+
+    def term_unary(self):
+        if self.is_op('-'):
+            self.pos += 1
+            return 'neg', self.term_unary()
+        return self.term_atom()
+
+    def term_atom(self):
+        kind, value, pos = self.peek()
+        if kind in ('number', 'string'):
+            self.pos += 1
+            return value
+        elif kind == 'op' and value == '+' and self.peek(1)[0] == 'number' and self.peek(1)[2] == pos + 1:
+            # signed number literal, e.g. '+1'
+            self.pos += 2
+            return self.peek(-1)[1]
+        elif kind == 'name':
+            return self.call_or_identifier()
+        elif self.is_op('('):
+            self.pos += 1
+            exp = self.term()
+            self.expect('op', ')')
+            return exp
+        raise self.error()
+
+    def identifier(self):
+        names = [self.expect('name')]
+        while self.is_op('.') and self.peek(1)[0] == 'name':
+            self.pos += 1
+            names.append(self.expect('name'))
+        return 'lookup', names
+
+    def call_or_identifier(self):
+        start = self.pos
+        if start not in self.memo:
+            try:
+                self.memo[start] = (self._call_or_identifier(), self.pos)
+            except ValueError as err:
+                self.memo[start] = (err, None)
+
+        lisp, self.pos = self.memo[start]
+        if self.pos is None:
+            self.pos = start
+            raise lisp
+        return lisp
+
+    def _call_or_identifier(self):
+        lookup = self.identifier()
+        if not self.is_op('('):
+            return lookup
+
+        self.pos += 1
+        args = [self.function_argument()]
+        while self.is_op(','):
+            self.pos += 1
+            args.append(self.function_argument())
+        self.expect('op', ')')
+        return 'call', lookup, args
+
+    def function_argument(self):
+        start = self.mark()
+        try:
+            return self.bool_exp()
+        except ValueError:
+            self.reset(start)
+        return self.term()
+
+
+parser_backends = {'pyparsing': LispParser, 'pratt': PrattParser}
+
+
+class ParseCache:
+    """
+    Two-level cache for parsed spring expressions: an in-process table of unique expression strings and an optional
+    on-disk store. Stored expressions are content addressed, i.e. keyed by the hash of the expression string, in a
+    directory per parser version (`PARSER_VERSION` and parser backend version), so each distinct expression is parsed
+    once per release.
+
+    E.g.
+    >> cache = ParseCache(path='.fbc_cache')
+    >> cache.parse("a == 1")
+    ('==', ('lookup', ['a']), 1)
+    """
+
+    def __init__(self, path: Optional[Union[Path, str]] = None, backend: str = 'pyparsing'):
+        """
+        :param path: directory of the on-disk store (default: no on-disk store)
+        :param backend: parser used on cache misses, one of `parser_backends`
+        """
+        if backend not in parser_backends:
+            raise ValueError(f"unknown parser backend: {backend}")
+
+        self.path = path
+        self.backend = backend
+        self._parser = None
+        self.table: Dict[str, Any] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def parser(self) -> Union[LispParser, PrattParser]:
+        if self._parser is None:
+            self._parser = parser_backends[self.backend]()
+        return self._parser
+
+    @property
+    def version_path(self) -> Optional[Path]:
+        if self.path is None:
+            return None
+        return Path(self.path, f'v{PARSER_VERSION}-{parser_backends[self.backend].version}')
+
+    def expression_path(self, s: str) -> Optional[Path]:
+        """
+        :param s: spring expression
+        :return: file of the parsed expression in the on-disk store
+        """
+        if self.path is None:
+            return None
+        digest = sha256(s.encode('utf-8')).hexdigest()
+        return Path(self.version_path, digest[:2], f'{digest}.lisp')
+
+    def parse(self, s: str):
+        """
+        Parses given spring expression (see `LispParser.parse`), using the in-process table and the on-disk store
+
+        :param s: spring expression
+        :return: lisp expression
+        """
+        if s in self.table:
+            self.hits += 1
+            return self.table[s]
+
+        path = self.expression_path(s)
+        if path is not None and path.exists():
+            self.disk_hits += 1
+            lisp = literal_eval(path.read_text(encoding='utf-8'))
+        else:
+            self.misses += 1
+            lisp = self.parser.parse(s)
+            if path is not None:
+                # the lisp expression consists of tuples, lists and primitives, i.e. its repr is a python literal
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+                tmp_path.write_text(repr(lisp), encoding='utf-8')
+                os.replace(tmp_path, path)
+
+        self.table[s] = lisp
+        return lisp
+
+
+# process wide parse caches per parser backend; the on-disk store can be enabled with the environment variable
+# `FBC_PARSE_CACHE`
+default_parse_caches = {backend: ParseCache(path=os.environ.get('FBC_PARSE_CACHE'), backend=backend)
+                        for backend in parser_backends}
@@ -1,11 +1,13 @@
 from pathlib import Path
-from typing import List, Dict, Union, Optional
+from typing import List, Dict, Union, Optional, Iterator, Tuple
 from xml.etree import ElementTree
-from fbc.util import flatten
 from dataclasses import dataclass, field
 
 ns = {'zofar': 'http://www.his.de/zofar/xml/questionnaire'}
 
+tags = {name: f"{{{ns['zofar']}}}{name}" for name in ['page', 'preloads', 'variables', 'body', 'transitions',
+                                                          'transition', 'responseDomain', 'answerOption']}
+
 
 var_type_map = {
     'singleChoiceAnswerOption': 'enum'
@@ -60,6 +62,46 @@ class Questionnaire:
     pages: List[Page]
 
 
+@dataclass
+class QuestionnaireStream:
+    variables: Dict[str, Variable]
+    # pages are read lazily from the xml file, i.e. they can only be iterated once
+    pages: Iterator[Page]
+
+
+def preload_declarations(preloads: ElementTree.Element) -> Dict[str, Variable]:
+    """
+    Reads variables from a `zofar:preloads` section
+
+    :param preloads: preloads xml element
+    :return: dictionary mapping from variable name to a `Variable`
+    """
+    variable_dict = {}
+    for preload in preloads.findall("zofar:preload", ns):
+        for preload_item in preload.findall("zofar:preloadItem", ns):
+            variable_name = preload_item.get('variable')
+            if variable_name is not None:
+                variable_dict[f'PRELOAD{variable_name}'] = Variable(f'PRELOAD{variable_name}', 'string', True)
+
+    return variable_dict
+
+
+def variable_section_declarations(variables: ElementTree.Element) -> Dict[str, Variable]:
+    """
+    Reads variables from a `zofar:variables` section
+
+    :param variables: variables xml element
+    :return: dictionary mapping from variable name to a `Variable`
+    """
+    variable_dict = {}
+    for variable in variables.findall("zofar:variable", ns):
+        if variable.get('name') is not None and variable.get('type') is not None:
+            var_type = var_type_map.get(variable.get('type'), variable.get('type'))
+            variable_dict[variable.get('name')] = Variable(variable.get('name'), var_type, False)
+
+    return variable_dict
+
+
 def variable_declarations(root: ElementTree.Element) -> Dict[str, Variable]:
     """
     Reads variables from `zofar:variables` and `zofar:preloads` sections
@@ -72,38 +114,64 @@ def variable_declarations(root: ElementTree.Element) -> Dict[str, Variable]:
     # read `preloads` section
     preloads = root.find('zofar:preloads', ns)
     if preloads is not None:
-        for preload in preloads.findall("zofar:preload", ns):
-            for preload_item in preload.findall("zofar:preloadItem", ns):
-                variable_name = preload_item.get('variable')
-                if variable_name is not None:
-                    variable_dict[f'PRELOAD{variable_name}'] = Variable(f'PRELOAD{variable_name}', 'string', True)
+        variable_dict.update(preload_declarations(preloads))
 
     # read `variables` section
     variables = root.find('zofar:variables', ns)
     if variables is not None:
-        for variable in variables.findall("zofar:variable", ns):
-            if variable.get('name') is not None and variable.get('type') is not None:
-                var_type = var_type_map.get(variable.get('type'), variable.get('type'))
-                variable_dict[variable.get('name')] = Variable(variable.get('name'), var_type, False)
+        variable_dict.update(variable_section_declarations(variables))
 
     return variable_dict
 
 
-def enum_values(page: ElementTree.Element, variables: Dict[str, Variable]) -> List[EnumValues]:
-    body = page.find('zofar:body', ns)
-    if body is None:
-        return []
+def visit_body(body: ElementTree.Element, variables: Dict[str, Variable]) -> Tuple[List[VarRef], List[EnumValues]]:
+    """
+    Extract variable references and enum values (answer options of response domains) from a page body in a single
+    pre-order traversal with an explicit stack
 
+    :param body: body xml element of a page
+    :param variables: dictionary mapping variable names to a `Variable` (see `variable_declarations`)
+    :return: list of `VarRef`s and list of `EnumValues`, both in document order
+    """
+    refs = []
     evs = []
-    for rd in body.findall(".//zofar:responseDomain[@variable]", ns):
-        var = variables[rd.get('variable')]
 
-        enum_value_list = [EnumValue(ao.get('uid'), int(ao.get('value')), ao.get('label'))
-                           for ao in rd.findall(".//zofar:answerOption", ns)]
+    # stack items: element, accumulated `visible` conditions, answer option lists of enclosing response domains
+    stack = [(body, (), ())]
+    while stack:
+        element, visible, domains = stack.pop()
+
+        # add `visible` predicate if available
+        if element.get('visible') is not None:
+            visible = visible + (element.get('visible').strip(),)
+
+        variable_name = element.get('variable')
+        if variable_name is not None:
+            # check if referenced variable is declared
+            if variable_name not in variables:
+                raise ValueError(f"variable {variable_name} was referenced but not declared")
 
-        evs.append(EnumValues(var, enum_value_list))
+            refs.append(VarRef(variables[variable_name], list(visible)))
 
-    return evs
+            if element.tag == tags['responseDomain'] and element is not body:
+                evs.append(EnumValues(variables[variable_name], []))
+                domains = domains + (evs[-1].values,)
+
+        if element.tag == tags['answerOption']:
+            for values in domains:
+                values.append(EnumValue(element.get('uid'), int(element.get('value')), element.get('label')))
+
+        stack.extend((child, visible, domains) for child in reversed(element))
+
+    return refs, evs
+
+
+def enum_values(page: ElementTree.Element, variables: Dict[str, Variable]) -> List[EnumValues]:
+    body = page.find('zofar:body', ns)
+    if body is None:
+        return []
+
+    return visit_body(body, variables)[1]
 
 
 def var_refs(page: ElementTree.Element, variables: Dict[str, Variable]) -> List[VarRef]:
@@ -114,31 +182,11 @@ def var_refs(page: ElementTree.Element, variables: Dict[str, Variable]) -> List[
     :param variables: dictionary mapping variable names to a `Variable` (see `variable_declarations`)
     :return: list of `VarRef`s
     """
-    # define function for recursive search
-    def _var_refs(_element: ElementTree.Element, _variables: Dict[str, Variable], _visible: List[str]) -> List[VarRef]:
-        # add `visible` predicate if available
-        if _element.get('visible') is not None:
-            _visible = _visible + [_element.get('visible').strip()]
-
-        # if a variable attribute exists, return one-element list containing the `VarRef`. Otherwise, an empty list
-        if _element.get('variable') is not None:
-            # check if referenced variable is declared
-            if _element.get('variable') not in variables:
-                raise ValueError(f"variable {_element.get('variable')} was referenced but not declared")
-
-            ref_list = [VarRef(variables[_element.get('variable')], _visible[:])]
-        else:
-            ref_list = []
-
-        # apply recursive call and flat map on all child elements
-        return ref_list + flatten([_var_refs(ch, variables, _visible) for ch in _element])
-
-    # call recursive function on body, if it exists
     body = page.find('zofar:body', ns)
     if body is None:
         return []
-    else:
-        return _var_refs(body, variables, [])
+
+    return visit_body(body, variables)[0]
 
 
 def transitions(page: ElementTree.Element) -> List[Transition]:
@@ -157,6 +205,28 @@ def transitions(page: ElementTree.Element) -> List[Transition]:
                 for tr in trans.findall('zofar:transition', ns)]
 
 
+def page(element: ElementTree.Element, variables: Dict[str, Variable]) -> Page:
+    """
+    Extract page from a page xml element; the page body is traversed only once (see `visit_body`)
+
+    :param element: page xml element
+    :param variables: dictionary mapping variable names to a `Variable` (see `variable_declarations`)
+    :return: `Page`
+    """
+    trans = None
+    body = None
+    for child in element:
+        if child.tag == tags['transitions'] and trans is None:
+            trans = [Transition(tr.get('target'), tr.get('condition'))
+                     for tr in child if tr.tag == tags['transition']]
+        elif child.tag == tags['body'] and body is None:
+            body = child
+
+    refs, evs = visit_body(body, variables) if body is not None else ([], [])
+
+    return Page(element.attrib['uid'], trans if trans is not None else [], refs, evs)
+
+
 def questionnaire(root: ElementTree.Element) -> Questionnaire:
     """
     Extract questionnaire from xml root element
@@ -166,8 +236,7 @@ def questionnaire(root: ElementTree.Element) -> Questionnaire:
     """
     variables = variable_declarations(root=root)
 
-    pages = [Page(page.attrib['uid'], transitions(page), var_refs(page, variables), enum_values(page, variables))
-             for page in root.findall("zofar:page", ns)]
+    pages = [page(element, variables) for element in root.findall("zofar:page", ns)]
 
     return Questionnaire(variables, pages)
 
@@ -182,3 +251,57 @@ def read_questionnaire(input_path: Union[Path, str]) -> Questionnaire:
     xml_root = ElementTree.parse(input_path)
 
     return questionnaire(xml_root.getroot())
+
+
+def parse_questionnaire(data: Union[bytes, str]) -> Questionnaire:
+    """
+    Converts the xml document in `data` into a `Questionnaire`
+
+    :param data: questionnaire xml
+    :return: `Questionnaire`
+    """
+    return questionnaire(ElementTree.fromstring(data))
+
+
+def stream_questionnaire(input_path: Union[Path, str]) -> QuestionnaireStream:
+    """
+    Reads file from `input_path` incrementally (via `iterparse`). The `zofar:preloads` and `zofar:variables` sections
+    are read up to the first page; the pages are then extracted one at a time and their xml elements are released, so
+    the memory used for the xml tree is bounded by a single page.
+
+    :param input_path: path to input file as `str` or `Path`
+    :return: `QuestionnaireStream` with all variables and a lazy iterator over the pages
+    """
+    events = ElementTree.iterparse(str(input_path), events=('start', 'end'))
+    _, root = next(events)
+
+    variables = {}
+    depth = 0
+    for event, element in events:
+        if event == 'start':
+            depth += 1
+            if depth == 1 and element.tag == tags['page']:
+                break
+        else:
+            depth -= 1
+            if depth == 0:
+                if element.tag == tags['preloads']:
+                    variables.update(preload_declarations(element))
+                elif element.tag == tags['variables']:
+                    variables.update(variable_section_declarations(element))
+                root.remove(element)
+    else:
+        return QuestionnaireStream(variables, iter([]))
+
+    def _pages(_depth: int) -> Iterator[Page]:
+        for _event, _element in events:
+            if _event == 'start':
+                _depth += 1
+            else:
+                _depth -= 1
+                if _depth == 0:
+                    if _element.tag == tags['page']:
+                        yield page(_element, variables)
+                    root.remove(_element)
+
+    return QuestionnaireStream(variables, _pages(depth))
@@ -1,52 +1,190 @@
+import logging
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 import networkx as nx
+import numpy as np
 from functools import reduce, cached_property, lru_cache
+from math import prod
 from typing import Any, List, Union, Dict, Tuple, Optional
 
-from fbc.util import bfs_nodes, flatten, group_by, timeit
+from fbc.util import bfs_nodes, topological_nodes, flatten, group_by
 from sympy import simplify, true, false, Expr, Symbol, Eq, Ne, Not, Le, Lt, Ge, Gt, And, Or, Float, Integer, Basic, \
-    Interval
+    Interval, FiniteSet, Set, S, oo, nsimplify
+from sympy.core.relational import Relational
 from sympy.core import evaluate as sympy_evaluate
 from sympy.logic.boolalg import Boolean, to_dnf, BooleanTrue, BooleanAtom
+from fbc.cache import simplify_cached
 from fbc.data import xml
-from fbc.data.parse import LispParser
+from fbc.data.parse import ParseCache, default_parse_caches
+from fbc.logic.atoms import AtomIndex, UnsupportedExpression
+from fbc.logic.bdd import BDD
+from fbc.logic.bitset import TruthTable
+from fbc.logic.classify import CONTRADICTION, TAUTOLOGY, classify, filter_checks
+from fbc.logic.sat import CNF
+from fbc.trace import enum_product_size, span, traced
 
-
-@lru_cache(maxsize=None)
-def simplify_cached(*args, **kwargs) -> Any:
-    return simplify(*args, **kwargs)
+logger = logging.getLogger(__name__)
 
 class Con:
     def __init__(self):
         pass
 
 class Interv:
-    def __init__(self, name, interval: Interval):
-        self.interval = interval
+    """
+    Defines the domain of a number variable as finite union of intervals. The domain is partitioned into disjoint
+    cells by the constants the variable is compared with (boundaries): each boundary is a cell of its own, the
+    intervals between two boundaries form the remaining cells. Any comparison with a boundary has the same truth value
+    for all values of a cell, i.e. the cells can be enumerated like enum members.
+    """
+
+    def __init__(self, name, domain: Set = Interval(-oo, oo)):
+        """
+        Initialize an interval domain
+
+        :param name: name of the number variable
+        :param domain: interval or union of intervals the variable ranges over
+        """
         self.name = name
-        self.var = Symbol(name, integer=True)
+        self.domain = domain
+
+        self.var = Symbol(name, real=True, finite=True)
+
+        self.boundaries = set()
+        # interval domains do not have literal symbols, their atoms are comparisons with constants
+        self.member_vars = {}
+
+    @property
+    def cells(self) -> List[Set]:
+        """
+        Returns the partition of the domain into disjoint cells (in ascending order)
+
+        :return: list of cells
+        """
+        pieces = []
+        lo = -oo
+        for b in sorted(self.boundaries):
+            pieces += [Interval.open(lo, b), FiniteSet(b)]
+            lo = b
+        pieces.append(Interval.open(lo, oo))
+        return [c for c in [self.domain.intersect(p) for p in pieces] if c is not S.EmptySet]
+
+    @property
+    def members(self) -> List[Set]:
+        return self.cells
+
+    def refine(self, exps: List[Expr]) -> None:
+        """
+        Adds the constants the variable is compared with in the given expressions to the boundaries
+
+        :param exps: expressions
+        """
+        for exp in exps:
+            if isinstance(exp, Basic):
+                for rel in exp.atoms(Relational):
+                    c = self._constant(rel)
+                    if c is not None:
+                        self.boundaries.add(c)
+
+    def _constant(self, rel: Relational) -> Optional[Expr]:
+        # constant of a comparison `var <op> constant` (or `constant <op> var`); floats are converted to rationals, such
+        # that equal constants (e.g. `5` and `5.0`) are the same boundary
+        for a, b in [rel.args, rel.args[::-1]]:
+            if a == self.var and b.is_number and b.is_finite and b.is_extended_real:
+                return nsimplify(b, rational=True) if b.is_Float else b
+        return None
+
+    def satisfies(self, cell: Set, rel: Relational) -> Optional[bool]:
+        """
+        Evaluates a comparison of the variable with a constant for a cell
+
+        :param cell: cell (see `cells`)
+        :param rel: comparison
+        :return: truth value of the comparison for all values of the cell, or None if it is not the same for all values
+                 (i.e. the constant is no boundary)
+        """
+        c = self._constant(rel)
+        if c is None or cell.inf < c < cell.sup:
+            return None
+        # compare with the rational boundary, sympy orders floats and rationals inconsistently
+        rel = rel.func(*[c if a.is_Float else a for a in rel.args])
+        return bool(rel.subs(self.var, _representative(cell)))
+
+    def _relation(self, rel: Relational) -> Relational:
+        self.refine([rel])
+        return rel
 
     def eq(self, v):
-        return simplify_cached(Eq(self.var, v))
+        """
+        Returns predicate checking if the variable is equal to the given value, or lies in the given cell
+
+        :param v: value or cell
+        :return: predicate
+        """
+        if isinstance(v, Set):
+            return v.as_relational(self.var)
+        return self._relation(Eq(self.var, v))
 
     def ne(self, v):
-        return simplify_cached(Ne(self.var, v))
+        return self._relation(Ne(self.var, v))
 
     def gt(self, v):
-        return Gt(self.var, v)
+        return self._relation(Gt(self.var, v))
 
     def ge(self, v):
-        return Ge(self.var, v)
+        return self._relation(Ge(self.var, v))
 
     def lt(self, v):
-        return Lt(self.var, v)
+        return self._relation(Lt(self.var, v))
 
     def le(self, v):
-        return Le(self.var, v)
+        return self._relation(Le(self.var, v))
+
+    @property
+    def null_subs(self):
+        return {}
+
+    def subs(self, m):
+        """
+        Returns a substitution dict replacing the variable with a value of the given cell
+
+        :param m: cell
+        :return: substitution dict
+        """
+        return {self.var: _representative(m)}
+
+    @property
+    def subs_dicts(self):
+        return [self.subs(c) for c in self.cells]
+
+    def __str__(self):
+        return f"{self.name}({self.domain})"
 
     def __repr__(self):
-        return self.interval
+        return str(self)
+
+    def __contains__(self, item):
+        return item in self.domain
+
+    def __iter__(self):
+        return iter(self.cells)
+
+
+def _representative(cell: Set) -> Expr:
+    """
+    :param cell: non-empty interval, union of intervals or finite set
+    :return: a value contained in `cell`
+    """
+    if cell.is_Union:
+        cell = cell.args[0]
+    if isinstance(cell, FiniteSet):
+        return min(cell)
+    lo, hi = cell.inf, cell.sup
+    if lo == -oo:
+        return hi - 1 if hi != oo else Integer(0)
+    elif hi == oo:
+        return lo + 1
+    return (lo + hi) / 2
 
 
 class Enum:
@@ -177,15 +315,17 @@ class Enum:
         return result
 
 
-# duplicate of better implementation in main.main()
-def evaluate_node_predicates(g: nx.DiGraph, source: Any, enums: List[Enum]) -> nx.DiGraph:
+@traced('predicates', lambda g, source, enums, *args, **kwargs: {'source': source,
+                                                                'enum_product': enum_product_size(enums)})
+def evaluate_node_predicates(g: nx.DiGraph, source: Any, enums: List[Enum], use_bdd: bool = False) -> nx.DiGraph:
     """
     Evaluates all node predicates in `g` reachable from `source` node. As a result each node will contain a 'pred'
     attribute containing the condition to be fulfilled in order to reach the respective node.
 
     Each 'pred' attribute is evaluated by following one of the two rules:
 
-    (1) if a node has no inbound edges, 'pred' is true
+    (1) if a node has no inbound edges (except self loops and edges from nodes not reachable from `source`),
+        'pred' is true
     (2) otherwise 'pred' is set to (['pred' of parent 1] and ['filter' of edge from parent 1]) or
                                    (['pred' of parent 2] and ['filter' of edge from parent 2]) or
                                    ...
@@ -193,46 +333,95 @@ def evaluate_node_predicates(g: nx.DiGraph, source: Any, enums: List[Enum]) -> n
     :param g: graph
     :param source: node to start from
     :param enums: list of enumerations regarded during evaluation
+    :param use_bdd: if True, predicates and filters are additionally represented as nodes of a reduced ordered binary
+                    decision diagram (see `attach_bdd`)
     """
-    nodes = bfs_nodes(g, source=source)
+    bdd = attach_bdd(g, enums) if use_bdd else None
 
     # In order to process a node, each node either needs to have no inbound edges or all parent nodes already need
-    # to be evaluated. For this reason we process the nodes in breadth first search node order covering most nodes in
-    # the first run. The evaluation is then repeated until all nodes are covered.
-    while len(nodes) != 0:
-        processed_nodes = set()
+    # to be evaluated. Processing the nodes in topological order guarantees this in a single pass.
+    for v in topological_nodes(g, source):
+        with span('node_predicate', 'predicates', node=v):
+            g.nodes[v].update(node_predicate(g, v, enums, bdd))
 
-        for v in nodes:
-            in_edges = g.in_edges(v, data=True)
+    return g
 
-            if len(in_edges) == 0:
-                g.nodes[v].update({"pred": true})
 
-                processed_nodes.add(v)
-            elif all(['pred' in g.nodes[v_parent] for v_parent, _, _ in in_edges]):
-                # check if all parent nodes are already evaluated
+def node_predicate(g: nx.DiGraph, v: Any, enums: List[Enum], bdd: Optional[BDD] = None) -> Dict[str, Any]:
+    """
+    Evaluates the predicate of node `v` from the predicates of its parent nodes (which need to be evaluated already).
+    Parents without 'pred' attribute (i.e. not reachable from the source node) cannot be taken and are ignored.
+
+    :param g: graph
+    :param v: node to evaluate
+    :param enums: list of enumerations regarded during evaluation
+    :param bdd: optional BDD manager (see `attach_bdd`)
+    :return: node attributes: 'pred' and, if `bdd` is given, 'pred_bdd'
+    """
+    in_edges = [(u, _v, data) for u, _v, data in g.in_edges(v, data=True) if u != v and 'pred' in g.nodes[u]]
+
+    if len(in_edges) == 0:
+        return {"pred": true} if bdd is None else {"pred": true, "pred_bdd": bdd.domain}
+
+    if bdd is not None:
+        node_bdd = bdd.disj([bdd.conj([g.nodes[v_parent]['pred_bdd'], data['filter_bdd']])
+                             for v_parent, _, data in in_edges])
+        if bdd.is_tautology(node_bdd):
+            node_pred = true
+        elif not bdd.is_satisfiable(node_bdd):
+            node_pred = false
+        else:
+            node_pred = bdd.to_expr(node_bdd)
+        return {"pred": node_pred, "pred_bdd": node_bdd}
 
-                # get parent predicate and edge filter for all inbound edges
-                in_nodes = [(g.nodes[v_parent]['pred'], g.edges[v_parent, v_child]['filter'])
-                            for v_parent, v_child, data in in_edges]
+    # get parent predicate and edge filter for all inbound edges
+    in_nodes = [(g.nodes[v_parent]['pred'], data['filter']) for v_parent, _, data in in_edges]
 
-                # determine node predicate via conjunction of each `node predicate`-`edge filter` pair and
-                # disjunction of those results
-                node_pred = simplify_enums(simplify_cached(reduce(lambda res, p: res | (p[0] & p[1]), in_nodes, false)),
-                                           enums)
-                if all(brute_force_enums(node_pred, enums)):
-                    node_pred = true
-                elif not any(brute_force_enums(node_pred, enums)):
-                    node_pred = false
-                g.nodes[v].update({"pred": node_pred})
+    # determine node predicate via conjunction of each `node predicate`-`edge filter` pair and
+    # disjunction of those results
+    node_pred = resolve_enums(reduce(lambda res, p: res | (p[0] & p[1]), in_nodes, false), enums)
+    if node_pred is not true and node_pred is not false:
+        node_pred = simplify_enums(node_pred, enums)
+    return {"pred": node_pred}
 
-                processed_nodes.add(v)
 
-        if len(processed_nodes) == 0:
-            raise ValueError("Could not process in evaluating node predicates")
+def attach_bdd(g: nx.DiGraph, enums: List[Enum]) -> Optional[BDD]:
+    """
+    Creates a BDD manager over all edge filters of `g`, stores it as graph attribute 'bdd' and adds the attribute
+    'filter_bdd' to each edge.
 
-        nodes = [v for v in nodes if v not in processed_nodes]
-    return g
+    :param g: graph
+    :param enums: list of enumerations regarded during evaluation (defines the variable order)
+    :return: BDD manager or None, if a filter contains atoms which cannot be represented in the BDD (BDD attributes
+             of an earlier call are removed then, see `detach_bdd`)
+    """
+    filters = list(g.edges(data='filter'))
+    refine_intervals([f for _, _, f in filters], enums)
+    try:
+        bdd = BDD.from_exprs([f for _, _, f in filters], enums)
+        filter_bdds = [(u, v, bdd.node(f)) for u, v, f in filters]
+    except UnsupportedExpression:
+        detach_bdd(g)
+        return None
+
+    for u, v, f in filter_bdds:
+        g.edges[u, v]['filter_bdd'] = f
+    g.graph['bdd'] = bdd
+    return bdd
+
+
+def detach_bdd(g: nx.DiGraph) -> None:
+    """
+    Removes the BDD manager and all BDD attributes ('filter_bdd', 'pred_bdd') from `g`, such that the checks fall back
+    to the sympy expressions (see `has_bdd`)
+
+    :param g: graph
+    """
+    g.graph.pop('bdd', None)
+    for _, _, data in g.edges(data=True):
+        data.pop('filter_bdd', None)
+    for _, data in g.nodes(data=True):
+        data.pop('pred_bdd', None)
 
 
 def evaluate_edge_filters(g: nx.DiGraph, enums: List[Enum]) -> nx.DiGraph:
@@ -246,16 +435,35 @@ def evaluate_edge_filters(g: nx.DiGraph, enums: List[Enum]) -> nx.DiGraph:
     for u, v, f in edges:
         source_node_predicate = nodes[u]
         f_new = source_node_predicate & f
-        f_simplified = simplify_cached(f_new)
-        if all(brute_force_enums(f_simplified, enums)):
-            f_simplified = true
-        elif not any(brute_force_enums(f_simplified, enums)):
-            f_simplified = false
-        g.edges[(u, v)].update({'filter': f_simplified})
+        g.edges[(u, v)].update({'filter': resolve_enums(f_new, enums)})
+
+        if 'filter_bdd' in g.edges[u, v] and 'pred_bdd' in g.nodes[u]:
+            bdd = g.graph['bdd']
+            g.edges[u, v]['filter_bdd'] = bdd.conj([g.nodes[u]['pred_bdd'], g.edges[u, v]['filter_bdd']])
     return g
 
 
-@timeit
+def resolve_enums(exp: Expr, enums: List[Enum]) -> Expr:
+    """
+    Resolves an expression to `true` or `false` if it is true or false for all enum assignments. Otherwise, the
+    simplified expression is returned.
+
+    The expression is classified once (see `fbc.logic.classify.classify`).
+
+    :param exp: expression
+    :param enums: list of enumerations regarded during evaluation
+    :return: `true`, `false` or the simplified expression
+    """
+    enums = project_enums([exp], enums)
+    classification = classify(exp, enums)
+    if classification is TAUTOLOGY:
+        return true
+    elif classification is CONTRADICTION:
+        return false
+    return simplify_cached(exp)
+
+
+@traced('soundness', lambda g: {'nodes': g.number_of_nodes()})
 def in_degree_soundness_check(g: nx.DiGraph):
     # ToDo: check whether this is still an appropriate check regarding the consistency conditions discussed in
     #  the paper!
@@ -270,8 +478,9 @@ def in_degree_soundness_check(g: nx.DiGraph):
         raise ValueError(f'no start node found (without in edges): {nodes_w_o_in_edges=}')
 
 
-# @timeit
-def graph_soundness_check(g: nx.Graph, source: Any, enums: List[Enum]) -> bool:
+@traced('soundness', lambda g, source, enums, *args, **kwargs: {'source': source,
+                                                               'enum_product': enum_product_size(enums)})
+def graph_soundness_check(g: nx.Graph, source: Any, enums: List[Enum], sat: bool = False, jobs: int = 1) -> bool:
     """
     Checks whether the `soundness_check` applies to all nodes in the graph
 
@@ -281,32 +490,104 @@ def graph_soundness_check(g: nx.Graph, source: Any, enums: List[Enum]) -> bool:
     @param g:
     @param source:
     @param enums:
+    @param sat: decide the checks as satisfiability queries (see `soundness_check`)
+    @param jobs: number of worker processes. If greater than 1, the checks of all nodes are distributed to a process
+                 pool. Each worker receives the node's out-edge filters and relevant enums only.
     @return: True, if the `soundness_check` applies to all nodes in the graph
 
     """
     # ToDo: check whether this is still an appropriate check regarding the consistency conditions discussed in
     #  the paper!
-    soundness_check_results = [soundness_check(g, v, enums, true) for v in bfs_nodes(g, source)]
-    result = all(soundness_check_results)
-
-    soundness_check_results_02 = []
-    soundness_check_nodes_02 = []
-    for v in bfs_nodes(g, source):
-        soundness_check_results_02.append(soundness_check(g, v, enums, true))
-        soundness_check_nodes_02.append(v)
-
-    result02 = all(soundness_check_results_02)
-    nodes_that_failed_soundness_check = [v for b, v in zip(soundness_check_results_02, soundness_check_nodes_02) if
-                                         not b]
-    if not result02:
+    soundness_check_nodes = bfs_nodes(g, source)
+
+    if jobs > 1:
+        job_args = []
+        for v in soundness_check_nodes:
+            out_predicates = [d['filter'] for d in g[v].values()]
+            job_args.append((out_predicates, project_enums(out_predicates, enums, v), sat))
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            soundness_check_results = list(executor.map(_soundness_check_job, job_args,
+                                                        chunksize=max(1, len(job_args) // (4 * jobs))))
+    else:
+        soundness_check_results = []
+        for v in soundness_check_nodes:
+            with span('soundness_check', 'soundness', node=v):
+                soundness_check_results.append(soundness_check(g, v, enums, true, sat=sat))
+
+    nodes_that_failed_soundness_check = [v for b, v in zip(soundness_check_results, soundness_check_nodes) if not b]
+    if len(nodes_that_failed_soundness_check) != 0:
         raise ValueError(
             f'The following nodes do not pass soundness check (outgoing edges conditions): {nodes_that_failed_soundness_check}')
 
-    return result
+    return True
+
+
+def _soundness_check_job(args: Tuple[List[Expr], List[Enum], bool]) -> bool:
+    out_predicates, enums, sat = args
+    return filters_soundness_check(out_predicates, enums, true, sat)
+
+
+def has_bdd(g: nx.Graph, v: Any) -> bool:
+    """
+    :return: True, if all outbound edges of node `v` carry a 'filter_bdd' attribute (see `attach_bdd`)
+    """
+    return 'bdd' in g.graph and all(['filter_bdd' in d for d in g[v].values()])
+
+
+@lru_cache(maxsize=16)
+def _enums_by_symbol(enums: Tuple[Enum, ...]) -> Dict[Symbol, Enum]:
+    return {sym: e for e in enums for sym in [e.var, *e.member_vars.values()]}
+
+
+def relevant_enums(exps: List[Expr], enums: List[Enum]) -> List[Enum]:
+    """
+    Returns the enums whose variable (`var`) or members (`member_vars`) occur as free symbol in any of the given
+    expressions. All other enums do not influence the truth value of the expressions.
+
+    :param exps: expressions
+    :param enums: list of enumerations
+    :return: relevant enums (in the order of `enums`)
+    """
+    by_symbol = _enums_by_symbol(tuple(enums))
+    found = {id(by_symbol[sym]) for exp in exps if not isinstance(exp, bool)
+             for sym in exp.free_symbols if sym in by_symbol}
+    return [e for e in enums if id(e) in found]
+
+
+def project_enums(exps: List[Expr], enums: List[Enum], v: Any = None) -> List[Enum]:
+    """
+    Projects the enum product space onto the enums relevant for the given expressions (see `relevant_enums`) and logs
+    how many assignments are skipped this way. Interval domains are refined by the expressions (see `refine_intervals`).
+
+    :param exps: expressions
+    :param enums: list of enumerations
+    :param v: node the expressions belong to (for logging only)
+    :return: relevant enums
+    """
+    relevant = relevant_enums(exps, enums)
+    refine_intervals(exps, relevant)
+    if logger.isEnabledFor(logging.DEBUG):
+        total = prod([len(e.members) for e in enums])
+        projected = prod([len(e.members) for e in relevant])
+        logger.debug(f'node {v}: enumerating {projected} of {total} assignments ({total - projected} skipped)')
+    return relevant
+
+
+def refine_intervals(exps: List[Expr], enums: List[Union[Enum, Interv]]) -> None:
+    """
+    Refines the cells of all interval domains in `enums` by the constants they are compared with in the given
+    expressions (see `Interv.refine`), so that each comparison resolves to a set of cells
+
+    :param exps: expressions
+    :param enums: list of enumerations and interval domains
+    """
+    for e in enums:
+        if isinstance(e, Interv):
+            e.refine(exps)
 
 
-# @timeit
-def soundness_check(g: nx.Graph, v: Any, enums: List[Enum], in_exp: Expr) -> bool:
+def soundness_check(g: nx.Graph, v: Any, enums: List[Enum], in_exp: Expr, sat: bool = False) -> bool:
     """
     Checks whether the disjunction of all outbound edge filters of a node is True.
 
@@ -314,15 +595,51 @@ def soundness_check(g: nx.Graph, v: Any, enums: List[Enum], in_exp: Expr) -> boo
     @param v: node to evaluate
     @param enums: list of enumerations regarded during evaluation
     @param in_exp: expression to evaluate against
+    @param sat: if True, validity of the disjunction is decided as satisfiability query of its negation (see
+                `fbc.logic.sat.CNF`) instead of enumerating the enum assignments
     :return: True, if the disjunction of all outbound edge filters of the node is True
     """
     # ToDo: check whether this is still an appropriate check regarding the consistency conditions discussed in
     #  the paper!
 
     out_predicates = [d['filter'] for d in g[v].values()]
+    if len(out_predicates) != 0 and in_exp is true and has_bdd(g, v):
+        bdd = g.graph['bdd']
+        return bdd.is_tautology(bdd.disj([d['filter_bdd'] for d in g[v].values()]))
+
+    return filters_soundness_check(out_predicates, enums, in_exp, sat, v)
+
+
+@traced('soundness', lambda out_predicates, enums, in_exp=true, sat=False, v=None: {
+    'node': v, 'enum_product': enum_product_size(relevant_enums(out_predicates, enums))})
+def filters_soundness_check(out_predicates: List[Expr], enums: List[Enum], in_exp: Expr, sat: bool = False,
+                            v: Any = None) -> bool:
+    """
+    Checks whether the disjunction of the given outbound edge filters is True (see `soundness_check`).
+
+    @param out_predicates: outbound edge filters of a node
+    @param enums: list of enumerations regarded during evaluation
+    @param in_exp: expression to evaluate against
+    @param sat: decide validity as satisfiability query
+    @param v: node the filters belong to (for logging only)
+    :return: True, if the disjunction of the filters is True
+    """
     if len(out_predicates) != 0:
+        enums = project_enums(out_predicates, enums, v)
         tmp_veroderte_predicates = reduce(lambda a, b: a | b,
                                           out_predicates)  # Veroderung aller Ausdrücke in der Liste out_predicates
+        if in_exp is true or in_exp is false:
+            if sat:
+                try:
+                    cnf = CNF.from_exprs([tmp_veroderte_predicates], enums)
+                    if in_exp is true:
+                        return cnf.is_valid(tmp_veroderte_predicates)
+                    return not cnf.is_satisfiable(tmp_veroderte_predicates)
+                except UnsupportedExpression:
+                    pass
+
+            return classify(tmp_veroderte_predicates, enums) is (TAUTOLOGY if in_exp is true else CONTRADICTION)
+
         tmp_simplified_enums = simplify_enums(tmp_veroderte_predicates, enums)
 
         tmp_further_simplified_enums = brute_force_enums(tmp_simplified_enums, enums)
@@ -332,31 +649,52 @@ def soundness_check(g: nx.Graph, v: Any, enums: List[Enum], in_exp: Expr) -> boo
         return True
 
 
-# @timeit
-def disjointness_check(g: nx.Graph, v: Any, enums: List[Enum]) -> bool:
+def disjointness_check(g: nx.Graph, v: Any, enums: List[Enum], sat: bool = False) -> bool:
     """
-    Checks whether the conditions of all outbound edge filters of a node are truly disjoint.
+    Checks whether the conditions of all outbound edge filters of a node are truly disjoint, i.e. no enum assignment
+    satisfies the filters of two outbound edges at once.
 
     @param g: graph
     @param v: node to evaluate
     @param enums: list of enumerations regarded during evaluation
-    :return: True, if the disjunction of all outbound edge filters of the node is True
+    @param sat: if True, each pair of filters is checked for overlap as satisfiability query (see `fbc.logic.sat.CNF`)
+                instead of enumerating the enum assignments
+    :return: True, if the outbound edge filters of the node are pairwise disjoint
     """
+    if has_bdd(g, v):
+        bdd = g.graph['bdd']
+        out_bdds = [d['filter_bdd'] for d in g[v].values()]
+        return not any([bdd.is_satisfiable(bdd.conj([a, b])) for i, a in enumerate(out_bdds) for b in out_bdds[i + 1:]])
+
     out_predicates = [d['filter'] for d in g[v].values()]
     # Was passiert hier?
     # die Bedingungen für alle ausgehenden Kanten werden durchiteriert
-    # ToDo: relevante Enums filtern; Kriterium: Enums oder Enum values tauchen als Symbol in IRGENDEINEM der
-    #  out_predicates auf!
+    # nur relevante Enums: Enums oder Enum values tauchen als Symbol in IRGENDEINEM der out_predicates auf
+    enums = project_enums(out_predicates, enums, v)
+    try:
+        if sat:
+            cnf = CNF.from_exprs(out_predicates, enums)
+            lits = [cnf.literal(out_predicate) for out_predicate in out_predicates]
+            return not any([cnf.solve([a, b]) is not None for i, a in enumerate(lits) for b in lits[i + 1:]])
+
+        # one truth table per independent group of filters
+        return filter_checks(out_predicates, enums)[1]
+    except UnsupportedExpression:
+        pass
+
     truth_tables = []
     for out_predicate in out_predicates:
         # wir lassen uns für jede Kante eine Truth Table für die gleichen, auf diesem Knoten relevanten Enums
-        #  ausgeben -> wir vergleichen die Truth Tables auf Identität
-        #  Ratio dahinter: wenn identische Truth Tables, dann nicht "truly disjoint"!
+        #  ausgeben
         truth_tables.append(truth_table_brute_force_enums(out_predicate, enums))
-    return not any([t for t in truth_tables if truth_tables.count(t) > 1])
+
+    # overlap: an assignment for which more than one filter is true (like the BDD, bitset and SAT paths)
+    overlapping = any([sum([t[i][1] == true for t in truth_tables]) > 1 for i in range(len(truth_tables[0]))]) \
+        if len(truth_tables) > 1 else False
+    return not overlapping
 
 
-@timeit
+@traced('simplify', lambda exp, enums: {'enum_product': enum_product_size(enums)})
 def simplify_enums(exp: Expr, enums: List[Enum]) -> Expr:
     """
     Simplifies given expression with regard to given enums. For each enum it is checked, if for all enum
@@ -378,7 +716,7 @@ def simplify_enums(exp: Expr, enums: List[Enum]) -> Expr:
     return exp
 
 
-@timeit
+@traced('brute_force', lambda exp, enums, *args, **kwargs: {'enum_product': enum_product_size(enums)})
 def brute_force_enums(exp: Expr, enums: List[Enum], pred: Optional[Expr] = true) -> List[Expr]:
     """
     Brute Force aller Permutationen/Kombinationsmöglichkeiten der gegebenen Enums
@@ -388,6 +726,14 @@ def brute_force_enums(exp: Expr, enums: List[Enum], pred: Optional[Expr] = true)
     @param pred: predicate of the node
     :return: list of substituted / simplified expression
     """
+    refine_intervals([exp, pred], enums)
+    # fast path: evaluate the whole truth table as bitset, if all atoms can be resolved
+    try:
+        tt = TruthTable(AtomIndex(enums))
+        table = np.logical_and(tt.mask(exp), tt.mask(pred))
+        return [true if b else false for b in np.broadcast_to(table, tt.shape).ravel()]
+    except UnsupportedExpression:
+        pass
 
     from itertools import product
     all_subs_dicts = [e.subs_dicts for e in enums]
@@ -405,7 +751,7 @@ def brute_force_enums(exp: Expr, enums: List[Enum], pred: Optional[Expr] = true)
     return result
 
 
-@timeit
+@traced('brute_force', lambda exp, enums: {'enum_product': enum_product_size(enums)})
 def truth_table_brute_force_enums(exp: Expr, enums: List[Enum]) -> List[Tuple[Basic, Basic]]:
     """
     Brute Force aller Permutationen/Kombinationsmöglichkeiten der gegebenen Enums
@@ -422,13 +768,14 @@ def truth_table_brute_force_enums(exp: Expr, enums: List[Enum]) -> List[Tuple[Ba
     y = [p for p in all_subs_tuples]
     subs_tuples = [flatten(p) for p in product(*all_subs_tuples)]
     tmp_eq_expr = [[Eq(e[0], e[1]) for e in d] for d in subs_tuples]
-    tmp_expr = [to_dnf(reduce(lambda a, b: a & b, e)) for e in tmp_eq_expr]
+    tmp_expr = [to_dnf(reduce(lambda a, b: a & b, e, true)) for e in tmp_eq_expr]
 
     result = []
     for expr in tmp_expr:
-        assert isinstance(expr, And)
+        # `expr` is true, if there are no enums to substitute
+        assert isinstance(expr, And) or expr is true
         subs_dict = {}
-        for arg in expr.args:
+        for arg in And.make_args(expr) if expr is not true else []:
             assert isinstance(arg, Eq)
             assert isinstance(arg.args[1], BooleanAtom)
             subs_dict[arg.args[0]] = arg.args[1]
@@ -879,7 +1226,11 @@ def evaluate_lisp(lisp):
         raise ValueError("")
 
 
-def enum_dict(pages: List[xml.Page]):
+def enum_value_dict(pages: List[xml.Page]) -> Dict[str, Dict[str, Any]]:
+    """
+    :param pages: pages of the questionnaire
+    :return: {enum variable name: {answer option uid: value}}
+    """
     # get flattened list of EnumValues objects from lists of enum values from all pages
     evs_list = flatten([p.enum_values for p in pages])
     # create list of tuples form EnumValues objets
@@ -912,8 +1263,12 @@ def enum_dict(pages: List[xml.Page]):
     #    print(invalid_enum_map_groups)
     #    raise ValueError("found invalid enum")
 
+    return dict(valid_enum_map_groups)
+
+
+def enum_dict(pages: List[xml.Page]):
     enums = {}
-    for var, veg in valid_enum_map_groups.items():
+    for var, veg in enum_value_dict(pages).items():
         if len(veg) == 0:
             raise ValueError(f"Empty enum found: {var}")
         else:
@@ -925,27 +1280,52 @@ def enum_dict(pages: List[xml.Page]):
     return enums
 
 
+def interval_dict(variables: Dict[str, xml.Variable]) -> Dict[str, Interv]:
+    """
+    :param variables: questionnaire variables
+    :return: unbounded interval domain of each number variable (see `Interv`)
+    """
+    return {name: Interv(name) for name, v in variables.items() if v.type == 'number'}
+
+
 class SpringExpEvaluator:
-    def __init__(self, variables: Dict[str, ZofarVariable], enums: Dict[str, Enum], macros=None):
+    def __init__(self, variables: Dict[str, ZofarVariable], enums: Dict[str, Enum], macros=None,
+                 parse_cache: Optional[ParseCache] = None, parser: str = 'pyparsing'):
         if macros is None:
             macros = []
+        if parse_cache is None:
+            parse_cache = default_parse_caches[parser]
 
         self.variables = variables
         self.enums = enums
         self.macros = macros
+        self.parse_cache = parse_cache
+        # pre-compiled expressions depend on the variables, so they are cached per evaluator
+        self.compiled = {}
 
     @cached_property
     def scope(self):
         return DictScope({**self.variables, **{'zofar': ZofarModule(), 'ENUM': self.enums}})
 
-    @cached_property
-    def parser(self):
-        return LispParser()
+    def compile_ast(self, s):
+        """
+        Parses a spring expression and resolves its lookups in the evaluator's variables. This step does not depend on
+        the enums, i.e. it can be done before all enum values of a questionnaire are known.
 
-    def eval(self, s):
-        lisp = self.parser.parse(s)
-        lisp = pre_compile(lisp, self.scope)
+        :param s: spring expression
+        :return: pre-compiled lisp ast
+        """
+        if s not in self.compiled:
+            self.compiled[s] = pre_compile(self.parse_cache.parse(s), self.scope)
+        return self.compiled[s]
+
+    def check_ast(self, lisp):
+        """
+        Applies the macros to a pre-compiled lisp ast (see `compile_ast`) and checks that it is a boolean expression
 
+        :param lisp: pre-compiled lisp ast
+        :return: checked lisp ast
+        """
         for macro in self.macros:
             lisp = macro(lisp, self.scope)
 
@@ -954,19 +1334,33 @@ class SpringExpEvaluator:
         if typ != 'boolean':
             raise ValueError("type check for transition does not result in boolean")
 
+        return lisp
+
+    def eval_ast(self, lisp):
+        """
+        Evaluates a pre-compiled lisp ast (see `compile_ast`) to a sympy expression
+
+        :param lisp: pre-compiled lisp ast
+        :return: sympy expression
+        """
+        lisp = self.check_ast(lisp)
+
         with sympy_evaluate(False):
             expr = evaluate_lisp(lisp)
 
         expr.doit()
         return expr
 
+    def eval(self, s):
+        return self.eval_ast(self.compile_ast(s))
+
     def __call__(self, s):
         return self.eval(s)
 
 
 class SpringExpEnumEvaluator(SpringExpEvaluator):
-    def __init__(self, variable, enums):
-        super().__init__(variable, enums, [enum_transform])
+    def __init__(self, variable, enums, parse_cache: Optional[ParseCache] = None, parser: str = 'pyparsing'):
+        super().__init__(variable, enums, [enum_transform], parse_cache, parser)
 
     @classmethod
     def from_questionnaire(cls, q: xml.Questionnaire) -> "SpringExpEnumEvaluator":
@@ -976,16 +1370,34 @@ class SpringExpEnumEvaluator(SpringExpEvaluator):
         return cls(variables, enums)
 
 
-def construct_graph(q: xml.Questionnaire):
-    evaluator = SpringExpEnumEvaluator.from_questionnaire(q)
+@traced('graph')
+def construct_graph(q: Union[xml.Questionnaire, xml.QuestionnaireStream], parser: str = 'pyparsing',
+                    parse_cache: Optional[ParseCache] = None):
+    """
+    Constructs the questionnaire graph with the (mutually exclusive) transition filters as edge attribute 'filter'.
+    Pages may be read lazily (see `xml.stream_questionnaire`): transition conditions are parsed while the pages are
+    read, and evaluated after the last page, when all enum values are known. The enums are stored as graph attribute
+    'enums'.
+
+    :param q: questionnaire
+    :param parser: parser backend for transition conditions (see `parse.parser_backends`)
+    :param parse_cache: cache of parsed transition conditions (default: the process wide cache of the parser backend,
+                        see `parse.default_parse_caches`)
+    :return: graph
+    """
+    variables = {v.name: ZofarVariable.from_variable(v) for v in q.variables.values()}
+    compiler = SpringExpEvaluator(variables, {}, parse_cache=parse_cache, parser=parser)
 
     g = nx.DiGraph()
-    g.add_nodes_from([p.uid for p in q.pages])
 
-    edges = []
-    # iterate over all pages and calculate filter conditions
+    pages = []
+    page_transitions = []
+    # iterate over all pages and parse transition conditions
     for page in q.pages:
-        neg_trans_filters = []
+        g.add_node(page.uid)
+        pages.append(page)
+
+        trans_asts = []
         for trans in page.transitions:
             if trans.condition is not None:
                 # ToDo: this is a way too hacky workaround; handling of condition == "true" or condition == "false"
@@ -993,17 +1405,34 @@ def construct_graph(q: xml.Questionnaire):
                 if trans.condition == 'false':
                     continue
                 elif trans.condition == 'true':
-                    edges.append((page.uid, trans.target_uid, {'filter': true}))
+                    trans_asts.append((trans.target_uid, True))
                     break
                 else:
-                    trans_filter = evaluator(trans.condition)
-
+                    trans_asts.append((trans.target_uid, compiler.compile_ast(trans.condition)))
             else:
+                trans_asts.append((trans.target_uid, None))
+        page_transitions.append((page.uid, trans_asts))
+
+    enums = enum_dict(pages)
+    evaluator = SpringExpEnumEvaluator(variables, enums, parse_cache=parse_cache, parser=parser)
+
+    edges = []
+    # calculate filter conditions
+    for uid, trans_asts in page_transitions:
+        neg_trans_filters = []
+        for target_uid, lisp in trans_asts:
+            if lisp is True:
+                edges.append((uid, target_uid, {'filter': true}))
+                break
+            elif lisp is None:
                 trans_filter = true
+            else:
+                trans_filter = evaluator.eval_ast(lisp)
             excluding_trans_filter = simplify_cached(And(*neg_trans_filters + [trans_filter]))
-            edges.append((page.uid, trans.target_uid, {'filter': excluding_trans_filter}))
+            edges.append((uid, target_uid, {'filter': excluding_trans_filter}))
             neg_trans_filters.append(Not(trans_filter))
 
     g.add_edges_from(edges)
+    g.graph['enums'] = enums
 
     return g
@@ -0,0 +1,186 @@
+from functools import reduce
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sympy import Symbol, Eq, Ne, Not, And, Or
+from sympy.core.relational import Relational
+from sympy.logic.boolalg import BooleanTrue, BooleanFalse, Xor, Implies, Equivalent, ITE
+
+
+class UnsupportedExpression(ValueError):
+    """
+    Raised if an expression contains an atom which can neither be mapped onto an enum member nor onto a free
+    boolean symbol (e.g. a relation over a number variable without interval domain or an enum which was not passed).
+    """
+
+
+class Algebra:
+    """
+    Boolean algebra an expression can be folded into (see `AtomIndex.fold`)
+    """
+
+    def const(self, b: bool) -> Any:
+        raise NotImplementedError()
+
+    def enum_eq(self, i: int, j: int) -> Any:
+        """
+        :param i: index of the enum
+        :param j: index of the enum member
+        :return: element representing `enums[i] == members[i][j]`
+        """
+        raise NotImplementedError()
+
+    def symbol(self, k: int) -> Any:
+        """
+        :param k: index of the free boolean symbol
+        :return: element representing `symbols[k]`
+        """
+        raise NotImplementedError()
+
+    def neg(self, x: Any) -> Any:
+        raise NotImplementedError()
+
+    def conj(self, xs: List[Any]) -> Any:
+        raise NotImplementedError()
+
+    def disj(self, xs: List[Any]) -> Any:
+        raise NotImplementedError()
+
+
+class AtomIndex:
+    """
+    Maps the atoms of a filter expression onto enum members (`Eq(enum.var, enum.member_vars[m])`) and onto free boolean
+    symbols. Enum members are ordered like `Enum.members` is iterated, i.e. in the same order as `Enum.subs_dicts`.
+    Comparisons of the variable of an interval domain (see `fbc.eval.Interv`) with a constant are mapped onto the
+    disjunction of the cells satisfying them.
+    """
+
+    def __init__(self, enums: Sequence[Any], symbols: Iterable[Symbol] = ()):
+        """
+        :param enums: list of enumerations regarded during evaluation
+        :param symbols: free boolean symbols regarded during evaluation
+        """
+        self.enums = list(enums)
+        self.members = [list(e.members) for e in self.enums]
+        self.symbols = list(symbols)
+
+        self._enum_vars = {e.var: i for i, e in enumerate(self.enums)}
+        self._member_vars = {e.member_vars[m]: (i, j) for i, e in enumerate(self.enums)
+                             for j, m in enumerate(self.members[i]) if m in e.member_vars}
+        self._symbols = {s: k for k, s in enumerate(self.symbols)}
+
+    @classmethod
+    def from_exprs(cls, exps: Iterable[Any], enums: Sequence[Any]) -> "AtomIndex":
+        """
+        Creates an index for the given enums and all remaining free symbols of the given expressions
+
+        :param exps: expressions
+        :param enums: list of enumerations regarded during evaluation
+        :return: `AtomIndex`
+        """
+        enum_symbols = {e.var for e in enums} | {v for e in enums for v in e.member_vars.values()}
+        symbols = set()
+        for exp in exps:
+            if not isinstance(exp, bool):
+                symbols |= {s for s in exp.free_symbols if isinstance(s, Symbol) and s not in enum_symbols}
+        return cls(enums, sorted(symbols, key=str))
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """
+        :return: size of each dimension of the assignment space (enums first, then boolean symbols)
+        """
+        return tuple(len(m) for m in self.members) + (2,) * len(self.symbols)
+
+    def enum_eq(self, a: Any, b: Any) -> Optional[Tuple[int, int]]:
+        """
+        :return: tuple (enum index, member index), if `Eq(a, b)` compares an enum variable with one of its members
+        """
+        if b in self._enum_vars:
+            a, b = b, a
+        if a in self._enum_vars and b in self._member_vars:
+            i, j = self._member_vars[b]
+            if i == self._enum_vars[a]:
+                return i, j
+        return None
+
+    def domain_relation(self, rel: Relational) -> Optional[Tuple[int, List[int]]]:
+        """
+        :return: tuple (enum index, member indices), if `rel` compares the variable of an interval domain (see
+                 `fbc.eval.Interv`) with one of its boundaries; the member indices are the cells satisfying `rel`
+        """
+        syms = rel.free_symbols
+        if len(syms) != 1:
+            return None
+        i = self._enum_vars.get(next(iter(syms)))
+        if i is None or not hasattr(self.enums[i], 'satisfies'):
+            return None
+
+        values = [self.enums[i].satisfies(cell, rel) for cell in self.members[i]]
+        if None in values:
+            return None
+        return i, [j for j, b in enumerate(values) if b]
+
+    def fold(self, exp: Any, algebra: Algebra, memo: Optional[Dict[Any, Any]] = None) -> Any:
+        """
+        Folds a boolean expression into the given algebra
+
+        :param exp: expression
+        :param algebra: target algebra
+        :param memo: optional dictionary memoizing already folded sub expressions
+        :return: element of the algebra
+        """
+        if memo is None:
+            memo = {}
+
+        def _fold(e):
+            if isinstance(e, bool):
+                return algebra.const(e)
+            if e in memo:
+                return memo[e]
+
+            if isinstance(e, BooleanTrue):
+                res = algebra.const(True)
+            elif isinstance(e, BooleanFalse):
+                res = algebra.const(False)
+            elif isinstance(e, Relational):
+                ij = self.enum_eq(*e.args) if isinstance(e, (Eq, Ne)) else None
+                if ij is not None:
+                    res = algebra.enum_eq(*ij)
+                    if isinstance(e, Ne):
+                        res = algebra.neg(res)
+                else:
+                    ijs = self.domain_relation(e)
+                    if ijs is None:
+                        raise UnsupportedExpression(f"cannot resolve atom {e}")
+                    i, js = ijs
+                    res = algebra.disj([algebra.enum_eq(i, j) for j in js])
+            elif isinstance(e, Symbol):
+                if e not in self._symbols:
+                    raise UnsupportedExpression(f"unknown symbol {e}")
+                res = algebra.symbol(self._symbols[e])
+            elif isinstance(e, Not):
+                res = algebra.neg(_fold(e.args[0]))
+            elif isinstance(e, And):
+                res = algebra.conj([_fold(a) for a in e.args])
+            elif isinstance(e, Or):
+                res = algebra.disj([_fold(a) for a in e.args])
+            elif isinstance(e, Implies):
+                a, b = [_fold(a) for a in e.args]
+                res = algebra.disj([algebra.neg(a), b])
+            elif isinstance(e, Equivalent):
+                args = [_fold(a) for a in e.args]
+                res = algebra.disj([algebra.conj(args), algebra.conj([algebra.neg(a) for a in args])])
+            elif isinstance(e, Xor):
+                res = reduce(lambda a, b: algebra.disj([algebra.conj([a, algebra.neg(b)]),
+                                                        algebra.conj([algebra.neg(a), b])]),
+                             [_fold(a) for a in e.args])
+            elif isinstance(e, ITE):
+                c, a, b = [_fold(a) for a in e.args]
+                res = algebra.disj([algebra.conj([c, a]), algebra.conj([algebra.neg(c), b])])
+            else:
+                raise UnsupportedExpression(f"cannot resolve expression {e}")
+
+            memo[e] = res
+            return res
+
+        return _fold(exp)
@@ -0,0 +1,211 @@
+from functools import reduce
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from sympy import true, false, And, Or
+
+from fbc.logic.atoms import Algebra, AtomIndex
+
+# terminal nodes
+FALSE = 0
+TRUE = 1
+
+
+class BDD(Algebra):
+    """
+    Reduced ordered binary decision diagram over the one-hot encoding of a list of enums (one variable per enum member)
+    and free boolean symbols.
+
+    The variable order is derived from the enum list: the members of the first enum come first, the free boolean
+    symbols last. Every node returned by the algebra operations is restricted to the valid assignment space `domain`
+    (exactly one member per enum), so that tautology and contradiction checks are a comparison with `domain` and
+    `FALSE`.
+    """
+
+    def __init__(self, index: AtomIndex):
+        """
+        :param index: atom index defining the variables
+        """
+        self.index = index
+
+        # (enum index, member index) for enum variables, (None, symbol index) for boolean symbols
+        self.vars = [(i, j) for i, members in enumerate(index.members) for j in range(len(members))] + \
+                    [(None, k) for k in range(len(index.symbols))]
+        self._var_ids = {v: n for n, v in enumerate(self.vars)}
+
+        # node table; terminal nodes are placed below the last variable
+        self._var = [len(self.vars), len(self.vars)]
+        self._lo = [FALSE, TRUE]
+        self._hi = [FALSE, TRUE]
+
+        self._unique: Dict[Tuple[int, int, int], int] = {}
+        self._ite_cache: Dict[Tuple[int, int, int], int] = {}
+        self._memo: Dict[Any, int] = {}
+
+        self.domain = self._exactly_one_domain()
+
+    @classmethod
+    def from_exprs(cls, exps: Iterable[Any], enums: Sequence[Any]) -> "BDD":
+        """
+        Creates a BDD manager over the given enums and all remaining free boolean symbols of the given expressions
+
+        :param exps: expressions
+        :param enums: list of enumerations regarded during evaluation
+        :return: `BDD`
+        """
+        return cls(AtomIndex.from_exprs(exps, enums))
+
+    def __len__(self) -> int:
+        return len(self._var)
+
+    def mk(self, v: int, lo: int, hi: int) -> int:
+        """
+        Returns the unique node for variable `v` with the given children
+
+        :param v: variable
+        :param lo: child if `v` is false
+        :param hi: child if `v` is true
+        :return: node
+        """
+        if lo == hi:
+            return lo
+
+        key = (v, lo, hi)
+        n = self._unique.get(key)
+        if n is None:
+            n = len(self._var)
+            self._var.append(v)
+            self._lo.append(lo)
+            self._hi.append(hi)
+            self._unique[key] = n
+        return n
+
+    def _cofactors(self, n: int, v: int) -> Tuple[int, int]:
+        if self._var[n] == v:
+            return self._lo[n], self._hi[n]
+        return n, n
+
+    def ite(self, f: int, g: int, h: int) -> int:
+        """
+        If-then-else: returns the node representing `(f and g) or (not f and h)`
+
+        :return: node
+        """
+        if f == TRUE:
+            return g
+        if f == FALSE:
+            return h
+        if g == h:
+            return g
+        if g == TRUE and h == FALSE:
+            return f
+
+        key = (f, g, h)
+        n = self._ite_cache.get(key)
+        if n is None:
+            v = min(self._var[f], self._var[g], self._var[h])
+            f0, f1 = self._cofactors(f, v)
+            g0, g1 = self._cofactors(g, v)
+            h0, h1 = self._cofactors(h, v)
+            n = self.mk(v, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+            self._ite_cache[key] = n
+        return n
+
+    def _exactly_one_domain(self) -> int:
+        n = TRUE
+        for i in reversed(range(len(self.index.enums))):
+            # `none` / `one`: no member / exactly one member of the remaining members of enum i is chosen
+            none, one = n, FALSE
+            for j in reversed(range(len(self.index.members[i]))):
+                v = self._var_ids[(i, j)]
+                none, one = self.mk(v, none, FALSE), self.mk(v, one, none)
+            n = one
+        return n
+
+    def const(self, b: bool) -> int:
+        return self.domain if b else FALSE
+
+    def enum_eq(self, i: int, j: int) -> int:
+        return self.ite(self.mk(self._var_ids[(i, j)], FALSE, TRUE), self.domain, FALSE)
+
+    def symbol(self, k: int) -> int:
+        return self.ite(self.mk(self._var_ids[(None, k)], FALSE, TRUE), self.domain, FALSE)
+
+    def neg(self, x: int) -> int:
+        return self.ite(x, FALSE, self.domain)
+
+    def conj(self, xs: List[int]) -> int:
+        return reduce(lambda a, b: self.ite(a, b, FALSE), xs, self.domain)
+
+    def disj(self, xs: List[int]) -> int:
+        return reduce(lambda a, b: self.ite(a, TRUE, b), xs, FALSE)
+
+    def node(self, exp: Any) -> int:
+        """
+        Returns the node representing the given expression
+
+        :param exp: expression
+        :return: node
+        """
+        return self.index.fold(exp, self, self._memo)
+
+    def is_tautology(self, f: int) -> bool:
+        return f == self.domain
+
+    def is_satisfiable(self, f: int) -> bool:
+        return f != FALSE
+
+    def size(self, f: int) -> int:
+        """
+        :param f: node
+        :return: number of nodes reachable from `f` (including terminals)
+        """
+        seen = set()
+        stack = [f]
+        while stack:
+            n = stack.pop()
+            if n not in seen:
+                seen.add(n)
+                if n > TRUE:
+                    stack += [self._lo[n], self._hi[n]]
+        return len(seen)
+
+    def _enum_cofactor(self, n: int, i: int, j: int) -> int:
+        # follow the path choosing member j of enum i
+        while n > TRUE and self.vars[self._var[n]][0] == i:
+            n = self._hi[n] if self.vars[self._var[n]][1] == j else self._lo[n]
+        return n
+
+    def to_expr(self, f: int) -> Any:
+        """
+        Converts a node into a sympy expression. Each enum is expanded over its members, members leading to the same
+        sub diagram are grouped into one disjunction.
+
+        :param f: node
+        :return: sympy expression
+        """
+        memo = {FALSE: false, TRUE: true}
+
+        def _expr(n):
+            if n in memo:
+                return memo[n]
+
+            i, j = self.vars[self._var[n]]
+            if i is None:
+                s = self.index.symbols[j]
+                res = Or(And(s, _expr(self._hi[n])), And(~s, _expr(self._lo[n])))
+            else:
+                enum = self.index.enums[i]
+                groups = {}
+                for k, m in enumerate(self.index.members[i]):
+                    groups.setdefault(self._enum_cofactor(n, i, k), []).append(m)
+
+                if len(groups) == 1:
+                    res = _expr(next(iter(groups)))
+                else:
+                    res = Or(*[And(Or(*[enum.eq(m) for m in ms]), _expr(c)) for c, ms in groups.items()
+                               if c != FALSE])
+
+            memo[n] = res
+            return res
+
+        return _expr(f)
@@ -0,0 +1,91 @@
+from functools import reduce
+from typing import Any, Iterable, List, Sequence
+
+import numpy as np
+
+from fbc.logic.atoms import Algebra, AtomIndex
+
+
+class TruthTable(Algebra):
+    """
+    Evaluates boolean expressions over the assignment space of a list of enums (and free boolean symbols) as NumPy
+    boolean masks. Each enum is one axis of the assignment space, each atom `Eq(enum.var, enum.member_vars[m])` a mask
+    along that axis. Masks are kept in broadcastable shape, so a mask only spans the axes its expression depends on.
+    """
+
+    def __init__(self, index: AtomIndex):
+        """
+        :param index: atom index defining the axes of the assignment space
+        """
+        self.index = index
+        self.shape = index.shape
+        self._masks = {}
+
+    @classmethod
+    def from_exprs(cls, exps: Iterable[Any], enums: Sequence[Any]) -> "TruthTable":
+        """
+        Creates a truth table over the given enums and all remaining free boolean symbols of the given expressions
+
+        :param exps: expressions
+        :param enums: list of enumerations regarded during evaluation
+        :return: `TruthTable`
+        """
+        return cls(AtomIndex.from_exprs(exps, enums))
+
+    def _axis(self, axis: int, values: np.ndarray) -> np.ndarray:
+        shape = [1] * len(self.shape)
+        shape[axis] = self.shape[axis]
+        return values.reshape(shape)
+
+    def const(self, b: bool) -> np.ndarray:
+        return np.array(b)
+
+    def enum_eq(self, i: int, j: int) -> np.ndarray:
+        values = np.zeros(self.shape[i], dtype=bool)
+        values[j] = True
+        return self._axis(i, values)
+
+    def symbol(self, k: int) -> np.ndarray:
+        return self._axis(len(self.index.enums) + k, np.array([False, True]))
+
+    def neg(self, x: np.ndarray) -> np.ndarray:
+        return np.logical_not(x)
+
+    def conj(self, xs: List[np.ndarray]) -> np.ndarray:
+        return reduce(np.logical_and, xs, np.array(True))
+
+    def disj(self, xs: List[np.ndarray]) -> np.ndarray:
+        return reduce(np.logical_or, xs, np.array(False))
+
+    def mask(self, exp: Any) -> np.ndarray:
+        """
+        Returns the (broadcastable) mask of all assignments satisfying the expression
+
+        :param exp: expression
+        :return: boolean mask
+        """
+        return self.index.fold(exp, self, self._masks)
+
+    def table(self, exp: Any) -> np.ndarray:
+        """
+        Returns the mask of the expression over the full assignment space (C order equals the order of
+        `itertools.product` over the enum members)
+
+        :param exp: expression
+        :return: boolean array of shape `self.shape`
+        """
+        return np.broadcast_to(self.mask(exp), self.shape)
+
+    def is_tautology(self, exp: Any) -> bool:
+        """
+        :param exp: expression
+        :return: True, if the expression is true for all assignments
+        """
+        return bool(np.all(self.mask(exp)))
+
+    def is_satisfiable(self, exp: Any) -> bool:
+        """
+        :param exp: expression
+        :return: True, if the expression is true for at least one assignment
+        """
+        return bool(np.any(self.mask(exp)))
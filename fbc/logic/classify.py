@@ -0,0 +1,248 @@
+from enum import Enum
+from itertools import product
+from math import prod
+from typing import Any, Dict, Iterator, List, Sequence, Set, Tuple
+
+import numpy as np
+from sympy import And, Basic, Not, Or
+from sympy.logic.boolalg import BooleanTrue, BooleanFalse
+
+from fbc.cache import memoize_cached, simplify_cached
+from fbc.logic.atoms import UnsupportedExpression
+from fbc.logic.bitset import TruthTable
+
+
+class Classification(Enum):
+    """
+    Truth value of an expression over all enum assignments
+    """
+    TAUTOLOGY = 'tautology'
+    CONTRADICTION = 'contradiction'
+    CONTINGENT = 'contingent'
+
+
+TAUTOLOGY, CONTRADICTION, CONTINGENT = Classification
+
+
+def substitute_enums(exp: Basic, enums: Sequence[Any]) -> Iterator[Basic]:
+    """
+    Lazily substitutes all assignments of the given enums into the expression (in the order of `itertools.product`
+    over `Enum.subs_dicts`)
+
+    :param exp: expression
+    :param enums: list of enumerations regarded during evaluation
+    :return: iterator over the substituted expressions
+    """
+    for permutation in product(*[e.subs_dicts for e in enums]):
+        subs_dict = {}
+        for d in permutation:
+            subs_dict.update({simplify_cached(k): v for k, v in d.items()})
+        exp_new = exp.subs(subs_dict)
+        yield exp_new if isinstance(exp_new, (BooleanTrue, BooleanFalse)) else simplify_cached(exp_new)
+
+
+def classify(exp: Any, enums: Sequence[Any]) -> Classification:
+    """
+    Classifies an expression as true for all enum assignments (`TAUTOLOGY`), false for all assignments
+    (`CONTRADICTION`) or neither (`CONTINGENT`). Interval domains are refined by the expression first (see
+    `fbc.eval.Interv.refine`).
+
+    Conjunctions and disjunctions of independent groups (see `split`) are decided per group, i.e. over the product of
+    the enums of each group instead of the product of all enums. The truth table of each group is evaluated as bitset
+    (see `fbc.logic.bitset.TruthTable`). Only if a group contains atoms the bitset cannot resolve, the assignments are
+    substituted one by one (see `substitute_enums`), stopping as soon as the group turned out to be true and false,
+    or to be unresolved (which is `CONTINGENT`). Results are memoized per expression and enums in the cache of the
+    current `fbc.cache.simplify_scope`.
+
+    :param exp: expression
+    :param enums: list of enumerations regarded during evaluation
+    :return: classification
+    """
+    if isinstance(exp, bool):
+        return TAUTOLOGY if exp else CONTRADICTION
+    for e in enums:
+        if hasattr(e, 'refine'):
+            e.refine([exp])
+    return _classify(exp, tuple(enums))
+
+
+def _by_symbol(enums: Sequence[Any]) -> Dict[Any, Any]:
+    return {sym: e for e in enums for sym in [e.var, *e.member_vars.values()]}
+
+
+def _variables(exp: Basic, by_symbol: Dict[Any, Any]) -> Set[Any]:
+    # enums and remaining free symbols the expression depends on
+    return {by_symbol.get(sym, sym) for sym in exp.free_symbols}
+
+
+def _args(exp: Basic) -> List[Basic]:
+    # arguments of a conjunction or disjunction, with negated dual operations flattened (De Morgan), e.g.
+    # `a | ~(b & c)` has the arguments `a`, `~b` and `~c`
+    dual = Or if isinstance(exp, And) else And
+    args, stack = [], list(exp.args)
+    while stack:
+        arg = stack.pop(0)
+        if isinstance(arg, Not) and isinstance(arg.args[0], dual):
+            stack[:0] = [Not(a) for a in arg.args[0].args]
+        elif isinstance(arg, exp.func):
+            stack[:0] = list(arg.args)
+        else:
+            args.append(arg)
+    return args
+
+
+def split(exp: Basic, enums: Sequence[Any]) -> List[Basic]:
+    """
+    Splits the arguments of a conjunction or disjunction into independent groups, i.e. groups which do not share an
+    enum or free symbol (connected components of the variable-interaction graph of the arguments). Negated
+    disjunctions within a conjunction (and vice versa) are split as well.
+
+    :param exp: expression
+    :param enums: list of enumerations regarded during evaluation
+    :return: one expression per group, combined like `exp` (`exp` itself, if it is no conjunction or disjunction)
+    """
+    if not isinstance(exp, (And, Or)):
+        return [exp]
+
+    by_symbol = _by_symbol(enums)
+    groups: List[Tuple[Set[Any], List[Basic]]] = []
+    for arg in _args(exp):
+        variables, args = _variables(arg, by_symbol), [arg]
+        for group in [g for g in groups if not g[0].isdisjoint(variables)]:
+            groups.remove(group)
+            variables |= group[0]
+            args = group[1] + args
+        groups.append((variables, args))
+    return [exp.func(*args) for _, args in groups]
+
+
+def filter_groups(exps: Sequence[Basic], enums: Sequence[Any]) -> List[Tuple[List[int], List[Any]]]:
+    """
+    Groups expressions into independent groups, i.e. groups which do not share an enum or free symbol (connected
+    components of the variable-interaction graph of the expressions)
+
+    :param exps: expressions
+    :param enums: list of enumerations regarded during evaluation
+    :return: indices of the expressions and enums of each group
+    """
+    by_symbol = _by_symbol(enums)
+    groups: List[Tuple[Set[Any], List[int]]] = []
+    for i, exp in enumerate(exps):
+        variables, indices = _variables(exp, by_symbol) if isinstance(exp, Basic) else set(), [i]
+        for group in [g for g in groups if not g[0].isdisjoint(variables)]:
+            groups.remove(group)
+            variables |= group[0]
+            indices = group[1] + indices
+        groups.append((variables, indices))
+    return [(sorted(indices), [e for e in enums if e in variables]) for variables, indices in groups]
+
+
+def filter_checks(exps: Sequence[Basic], enums: Sequence[Any]) -> Tuple[bool, bool]:
+    """
+    Decides whether the disjunction of the expressions is true for all enum assignments (sound) and whether no
+    assignment satisfies two expressions (disjoint). The expressions are grouped into independent groups (see
+    `filter_groups`) and the truth table of each group is evaluated as bitset over the enums of the group only: the
+    disjunction is true, if the disjunction of any group is true, and two expressions of different groups overlap,
+    if both are satisfiable.
+
+    :param exps: expressions
+    :param enums: list of enumerations regarded during evaluation
+    :return: tuple (sound, disjoint)
+    :raise UnsupportedExpression: if an expression contains atoms the bitset cannot resolve
+    """
+    sound, disjoint, satisfiable_groups = False, True, 0
+    for indices, group_enums in filter_groups(exps, enums):
+        tt = TruthTable.from_exprs([exps[i] for i in indices], group_enums)
+        # number of expressions of the group true for each assignment of the group
+        taken = sum([tt.table(exps[i]).astype(int) for i in indices], np.array(0))
+        sound = sound or bool(np.all(taken > 0))
+        disjoint = disjoint and not bool(np.any(taken > 1))
+        satisfiable_groups += int(bool(np.any(taken > 0)))
+    return sound, disjoint and satisfiable_groups < 2
+
+
+def components(exp: Basic, enums: Sequence[Any]) -> List[List[Any]]:
+    """
+    Returns the components `classify` decides the expression by: conjunctions, disjunctions and negations are split
+    recursively into independent groups (see `split`). The components are disjoint.
+
+    :param exp: expression
+    :param enums: list of enumerations regarded during evaluation
+    :return: enums and free symbols of each component
+    """
+    if isinstance(exp, bool) or isinstance(exp, (BooleanTrue, BooleanFalse)):
+        return []
+    if isinstance(exp, Not):
+        return components(exp.args[0], enums)
+
+    groups = split(exp, enums)
+    if len(groups) == 1:
+        return [sorted(_variables(exp, _by_symbol(enums)), key=str)]
+    return [c for group in groups for c in components(group, enums)]
+
+
+def component_size(component: List[Any]) -> int:
+    """
+    :param component: enums and free symbols (see `components`)
+    :return: number of assignments of the component
+    """
+    return prod([len(e.members) if hasattr(e, 'members') else 2 for e in component])
+
+
+def _negate(c: Classification) -> Classification:
+    return {TAUTOLOGY: CONTRADICTION, CONTRADICTION: TAUTOLOGY}.get(c, CONTINGENT)
+
+
+def _state(e: Any) -> Any:
+    # interval domains gain boundaries (see `fbc.eval.Interv.refine`), which changes their cells
+    return frozenset(e.boundaries) if hasattr(e, 'boundaries') else None
+
+
+def _classify(exp: Basic, enums: Tuple[Any, ...]) -> Classification:
+    key = ('classify', exp, tuple([(e, _state(e)) for e in enums]))
+    return memoize_cached(key, lambda: _classify_uncached(exp, enums))
+
+
+def _classify_uncached(exp: Basic, enums: Tuple[Any, ...]) -> Classification:
+    if isinstance(exp, BooleanTrue):
+        return TAUTOLOGY
+    elif isinstance(exp, BooleanFalse):
+        return CONTRADICTION
+    elif isinstance(exp, Not):
+        return _negate(_classify(exp.args[0], enums))
+
+    groups = split(exp, enums)
+    if len(groups) > 1:
+        # the groups are independent: the product of their assignment spaces is decided as sum
+        classifications = [_classify(group, _project(group, enums)) for group in groups]
+        if isinstance(exp, And):
+            if CONTRADICTION in classifications:
+                return CONTRADICTION
+            return TAUTOLOGY if all([c is TAUTOLOGY for c in classifications]) else CONTINGENT
+        if TAUTOLOGY in classifications:
+            return TAUTOLOGY
+        return CONTRADICTION if all([c is CONTRADICTION for c in classifications]) else CONTINGENT
+
+    try:
+        mask = TruthTable.from_exprs([exp], enums).mask(exp)
+        if np.all(mask):
+            return TAUTOLOGY
+        elif not np.any(mask):
+            return CONTRADICTION
+        return CONTINGENT
+    except UnsupportedExpression:
+        pass
+
+    seen = set()
+    for exp_new in substitute_enums(exp, enums):
+        if not isinstance(exp_new, (BooleanTrue, BooleanFalse)):
+            return CONTINGENT
+        seen.add(bool(exp_new))
+        if len(seen) == 2:
+            return CONTINGENT
+    return TAUTOLOGY if True in seen else CONTRADICTION
+
+
+def _project(exp: Basic, enums: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    variables = _variables(exp, _by_symbol(enums))
+    return tuple([e for e in enums if e in variables])
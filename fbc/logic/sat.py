@@ -0,0 +1,195 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fbc.logic.atoms import Algebra, AtomIndex
+
+
+def dpll(clauses: Iterable[List[int]], num_vars: int) -> Optional[Dict[int, bool]]:
+    """
+    Decides satisfiability of a CNF formula with DPLL (unit propagation over two watched literals and chronological
+    backtracking).
+
+    :param clauses: clauses as lists of non-zero integers (DIMACS style literals)
+    :param num_vars: number of variables
+    :return: satisfying assignment (variable -> value) or None, if the formula is unsatisfiable
+    """
+    values = [0] * (num_vars + 1)
+    watches = {}
+    trail = []
+    # decision levels: (index in trail, decision literal, already flipped)
+    levels = []
+
+    def value(lit):
+        return values[abs(lit)] if lit > 0 else -values[abs(lit)]
+
+    def assign(lit):
+        values[abs(lit)] = 1 if lit > 0 else -1
+        trail.append(lit)
+
+    units = []
+    watched = []
+    for clause in clauses:
+        clause = list(dict.fromkeys(clause))
+        lits = set(clause)
+        if any([-lit in lits for lit in clause]):
+            continue
+        if len(clause) == 0:
+            return None
+        elif len(clause) == 1:
+            units.append(clause[0])
+        else:
+            watched.append(clause)
+            watches.setdefault(clause[0], []).append(clause)
+            watches.setdefault(clause[1], []).append(clause)
+
+    for lit in units:
+        if value(lit) < 0:
+            return None
+        elif value(lit) == 0:
+            assign(lit)
+
+    def propagate(qhead):
+        while qhead < len(trail):
+            false_lit = -trail[qhead]
+            qhead += 1
+            watching = watches.get(false_lit, [])
+            i = 0
+            while i < len(watching):
+                clause = watching[i]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], clause[0]
+
+                if value(clause[0]) > 0:
+                    i += 1
+                    continue
+
+                for k in range(2, len(clause)):
+                    if value(clause[k]) >= 0:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        watching[i] = watching[-1]
+                        watching.pop()
+                        watches.setdefault(clause[1], []).append(clause)
+                        break
+                else:
+                    if value(clause[0]) < 0:
+                        return False
+                    assign(clause[0])
+                    i += 1
+        return True
+
+    qhead = 0
+    next_var = 1
+    while True:
+        if propagate(qhead):
+            qhead = len(trail)
+            while next_var <= num_vars and values[next_var] != 0:
+                next_var += 1
+            if next_var > num_vars:
+                return {v: values[v] > 0 for v in range(1, num_vars + 1)}
+
+            levels.append((len(trail), -next_var, False))
+            assign(-next_var)
+        else:
+            # backtrack to the last decision which has not been flipped yet
+            while levels and levels[-1][2]:
+                levels.pop()
+            if not levels:
+                return None
+
+            start, lit, _ = levels.pop()
+            for undo in trail[start:]:
+                values[abs(undo)] = 0
+            del trail[start:]
+            next_var = 1
+
+            levels.append((start, -lit, True))
+            assign(-lit)
+        qhead = min(qhead, len(trail) - 1)
+
+
+class CNF(Algebra):
+    """
+    Tseitin encoding of boolean expressions over the one-hot encoding of a list of enums (one variable per enum member)
+    and free boolean symbols. Each enum contributes an exactly-one constraint over its member variables.
+    """
+
+    def __init__(self, index: AtomIndex):
+        """
+        :param index: atom index defining the variables
+        """
+        self.index = index
+        self._enum_vars = []
+        self.num_vars = 0
+        self.clauses: List[List[int]] = []
+        self._memo: Dict[Any, int] = {}
+
+        self._true = self.new_var()
+        self.clauses.append([self._true])
+
+        for members in index.members:
+            vs = [self.new_var() for _ in members]
+            self._enum_vars.append(vs)
+            # exactly one member: at least one and pairwise at most one
+            self.clauses.append(vs)
+            self.clauses += [[-a, -b] for n, a in enumerate(vs) for b in vs[n + 1:]]
+
+        self._symbol_vars = [self.new_var() for _ in index.symbols]
+
+    @classmethod
+    def from_exprs(cls, exps: Iterable[Any], enums: Sequence[Any]) -> "CNF":
+        """
+        Creates an encoding over the given enums and all remaining free boolean symbols of the given expressions
+
+        :param exps: expressions
+        :param enums: list of enumerations regarded during evaluation
+        :return: `CNF`
+        """
+        return cls(AtomIndex.from_exprs(exps, enums))
+
+    def new_var(self) -> int:
+        self.num_vars += 1
+        return self.num_vars
+
+    def const(self, b: bool) -> int:
+        return self._true if b else -self._true
+
+    def enum_eq(self, i: int, j: int) -> int:
+        return self._enum_vars[i][j]
+
+    def symbol(self, k: int) -> int:
+        return self._symbol_vars[k]
+
+    def neg(self, x: int) -> int:
+        return -x
+
+    def conj(self, xs: List[int]) -> int:
+        if len(xs) == 1:
+            return xs[0]
+        y = self.new_var()
+        self.clauses += [[-y, x] for x in xs]
+        self.clauses.append([y] + [-x for x in xs])
+        return y
+
+    def disj(self, xs: List[int]) -> int:
+        return -self.conj([-x for x in xs])
+
+    def literal(self, exp: Any) -> int:
+        """
+        Returns the literal which is equivalent to the given expression
+
+        :param exp: expression
+        :return: literal
+        """
+        return self.index.fold(exp, self, self._memo)
+
+    def solve(self, assumptions: List[int]) -> Optional[Dict[int, bool]]:
+        """
+        :param assumptions: literals that have to be true
+        :return: satisfying assignment or None, if the formula is unsatisfiable under the given assumptions
+        """
+        return dpll([c[:] for c in self.clauses] + [[lit] for lit in assumptions], self.num_vars)
+
+    def is_satisfiable(self, exp: Any) -> bool:
+        return self.solve([self.literal(exp)]) is not None
+
+    def is_valid(self, exp: Any) -> bool:
+        return self.solve([-self.literal(exp)]) is None
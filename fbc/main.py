@@ -3,17 +3,16 @@ from pathlib import Path
 
 import networkx as nx
 from sympy import true, Symbol
-from fbc.eval import graph_soundness_check, Enum, construct_graph, evaluate_node_predicates, in_degree_soundness_check
-from fbc.util import show_graph, draw_graph, flatten
+from fbc.eval import graph_soundness_check, Enum, construct_graph, evaluate_node_predicates
+from fbc.util import flatten
+from fbc.verify import verify_graph
+from fbc.visualize import show_graph, draw_graph, render, tweak_label
 from fbc.data.xml import read_questionnaire, EnumValue
-import re
 from fbc.eval import bfs_nodes
 from sympy import simplify, true, false, Expr, Symbol, Eq, Ne, Not, Le, Lt, Ge, Gt, And, Or, Float, Integer
 from functools import reduce
-from fbc.util import timeit
 
 
-# @timeit
 def main2():
     g = nx.DiGraph()
 
@@ -51,124 +50,25 @@ def main2():
     show_graph(g)
 
 
-def add_line_breaks_to_str(input_str: str, line_char_width: int = 20) -> str:
-    if len(input_str) <= line_char_width:
-        return input_str
-    index = input_str[:line_char_width].rfind(' ')
-    if index == -1:
-        index = input_str.find(' ')
-    if index == -1:
-        return input_str
-    input_str = input_str[:index] + '\n' + add_line_breaks_to_str(input_str[index + 1:])
-    return input_str
-
-
-def add_line_breaks_to_values(input_dict: dict) -> dict:
-    tmp_dict = input_dict.copy()
-    tmp_dict.update(
-        {key: add_line_breaks_to_str(replace_sympy_expressions(str(val))) for key, val in input_dict.items()})
-    return tmp_dict
-
-
-def replace_sympy_expressions(input_str: str) -> str:
-    input_str = re.sub(r'Ne\(LIT_([a-zA-Z0-9]+)_NUM_([0-9]+), [a-zA-Z0-9]+_NUM\)', r'\1!=\2', input_str)
-    input_str = re.sub(r'Ne\(LIT_([a-zA-Z0-9]+)_([0-9]+), [a-zA-Z0-9]+_NUM\)', r'\1!=\2', input_str)
-    input_str = re.sub(r'Eq\(LIT_([a-zA-Z0-9]+)_NUM_([0-9]+), [a-zA-Z0-9]+_NUM\)', r'\1==\2', input_str)
-    input_str = re.sub(r'Eq\(LIT_([a-zA-Z0-9]+)_([0-9]+), [a-zA-Z0-9]+_NUM\)', r'\1==\2', input_str)
-    input_str = re.sub(r'~([a-zA-Z0-9]+)_IS_MISSING', r'\1==MIS', input_str)
-    input_str = re.sub(r'([a-zA-Z0-9]+)_IS_MISSING', r'\1==MIS', input_str)
-    return input_str
-
-
-def tweak_label_strings(g: nx.DiGraph) -> nx.DiGraph:
-    h = nx.DiGraph()
-    for node in g.nodes(data=True):
-        h.add_node(node[0], **add_line_breaks_to_values(node[1]))
-
-    for edge in g.edges(data=True):
-        h.add_edge(edge[0], edge[1], **add_line_breaks_to_values(edge[2]))
-    print()
-    return h
-
-
 def main(input_path: Path):
     q = read_questionnaire(input_path)
 
     # call construct graph() -> create graph & add filter attribute to edges
     g = construct_graph(q)
 
-    nodes = bfs_nodes(g, source='index')
-
-    processed_nodes = set()
-
-    in_degree_soundness_check(g)
-
-    while len(nodes) != 0:
-        print(f'{nodes=}')
-        for v in nodes:
-            print(f'{v=}')
-            print(f'{len(nodes)=}')
-            in_edges = [edge for edge in g.in_edges(v, data=True) if edge[0] != v]
-            print(f'{in_edges=}')
-            print(f'{(len(in_edges) == 0)=}')
-
-            x = str(all(['pred' in g.nodes[v_parent] for v_parent, _, _ in in_edges]))
-            print("all(['pred' in g.nodes[v_parent] for v_parent, _, _ in in_edges])=" + x)
-
-            if len(in_edges) == 0:
-                g.nodes[v].update({"pred": true})
-                processed_nodes.add(v)
-
-            elif all(['pred' in g.nodes[v_parent] for v_parent, _, _ in in_edges]):
-                # check if all parent nodes are already evaluated
-                print('drin')
-
-                # get parent predicate and edge filter for all inbound edges
-                in_nodes = [(g.nodes[v_parent]['pred'], g.edges[v_parent, v_child]['filter'])
-                            for v_parent, v_child, data in in_edges]
-
-                # determine node predicate via conjunction of each `node predicate`-`edge filter` pair and
-                # disjunction of th(ose results
-                node_pred = simplify(reduce(lambda res, p: res | (p[0] & p[1]), in_nodes, false))
-                g.nodes[v].update({"pred": node_pred})
-                processed_nodes.add(v)
-
-            if len(processed_nodes) == 0:
-                raise ValueError("Could not process in evaluating node predicates")
-
-            nodes = [v for v in nodes if v not in processed_nodes]
-            print(f'{processed_nodes=}')
-    draw_graph(g, 'graph.png')
-    h = tweak_label_strings(g)
-    draw_graph(h, 'graph_label.png')
-
     enums = [Enum(name=enum.variable.name,
                   members={v.value for v in enum.values}) for enum in flatten([p.enum_values for p in q.pages])]
 
-    try:
-        assert graph_soundness_check(g, source='index', enums=enums)
-    except ValueError as err:
-        raise ValueError(err)
-    except AssertionError as err:
-        raise AssertionError(err)
-
-    # evaluate_node_predicates(g, source='index', enums=enums)
-
-    try:
-        assert end_nodes_soundness_check(g, enums=enums)
-    finally:
-        print()
+    evaluate_node_predicates(g, source='index', enums=enums)
 
-    all_end_nodes = [u for u, n in g.out_degree if n == 0]
+    layout, _ = render(g, 'graph.png')
+    render(g, 'graph_label.png', label=tweak_label, layout=layout)
 
-    for u in all_end_nodes:
-        # ToDo: refactor into own function
-        for v, data in g.nodes(data=True):
-            if v == u:
-                if data['pred'] not in [true, True]:
-                    raise ValueError(f'Graph evaluation failed: final node "{v}" cannot be reached unless "{data["pred"]}"')
+    # every final node needs to be reached for all assignments
+    report = verify_graph(g, source='index', enums=enums, final_nodes=True)
+    if not report.ok:
+        raise ValueError(f'Graph evaluation failed: {report.errors}')
 
-# def end_nodes_soundness_check(g: nx.DiGraph, enums: )
 
 if __name__ == "__main__":
     main2()
@@ -0,0 +1,197 @@
+import operator
+from typing import Any, Callable, Dict, List, Optional
+
+from sympy import Symbol
+
+from fbc.data import xml
+from fbc.eval import Enum, SpringExpEnumEvaluator, ZofarVariable, enum_dict, enum_value_dict
+
+# answers of a respondent: variable name -> value; enum variables are answered with the uid of the answer option
+Answers = Dict[str, Any]
+
+
+def _compare(op: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def _op(a, b):
+        return a is not None and b is not None and op(a, b)
+    return _op
+
+
+def _arith(op: Callable[[Any, Any], Any]) -> Callable[[Any, Any], Any]:
+    def _op(a, b):
+        if a is None or b is None:
+            return None
+        try:
+            return op(a, b)
+        except ZeroDivisionError:
+            return None
+    return _op
+
+
+# helpers of the generated code: comparisons with missing answers are false, arithmetic on missing answers is missing
+runtime = {
+    '_lt': _compare(operator.lt),
+    '_le': _compare(operator.le),
+    '_gt': _compare(operator.gt),
+    '_ge': _compare(operator.ge),
+    '_add': _arith(operator.add),
+    '_sub': _arith(operator.sub),
+    '_mul': _arith(operator.mul),
+    '_div': _arith(operator.truediv),
+    '_neg': lambda a: None if a is None else -a,
+}
+
+comparison_helpers = {'lt': '_lt', 'le': '_le', 'gt': '_gt', 'ge': '_ge'}
+arith_helpers = {'+': '_add', '-': '_sub', '*': '_mul', '/': '_div'}
+
+
+def string_literal(s: str) -> str:
+    """
+    :param s: single quoted string literal of a spring expression, e.g. "'it''s'"
+    :return: string value
+    """
+    return s[1:-1].replace("''", "'")
+
+
+class ConditionCompiler:
+    """
+    Translates checked lisp asts (see `SpringExpEvaluator.check_ast`) into python expressions over an answer dict `a`
+    """
+
+    def __init__(self, enums: Dict[str, Enum], values: Dict[str, Dict[str, Any]]):
+        """
+        :param enums: enums of the questionnaire (see `enum_dict`)
+        :param values: enum variable -> {answer option uid: value} (see `enum_value_dict`)
+        """
+        # enum literal symbols -> member
+        self.literals: Dict[Symbol, Any] = {sym: m for enum in enums.values() for m, sym in enum.member_vars.items()}
+        # enum variable -> {answer option uid: value}; taken from the answer options themselves, since the members of
+        # the `_NUM` enum are the distinct values only
+        self.values: Dict[str, Dict[str, Any]] = {name: dict(values[name]) for name in values if name in enums}
+
+    def symbol(self, sym) -> str:
+        if sym in self.literals:
+            return repr(self.literals[sym])
+
+        name = str(sym)
+        if name.endswith('_NUM') and name[:-len('_NUM')] in self.values:
+            return f"_values[{name[:-len('_NUM')]!r}].get(a.get({name[:-len('_NUM')]!r}))"
+        elif name.endswith('_IS_MISSING'):
+            return f"(a.get({name[:-len('_IS_MISSING')]!r}) is None)"
+        return f"a.get({name!r})"
+
+    def expression(self, lisp) -> str:
+        """
+        :param lisp: checked lisp ast
+        :return: python expression
+        """
+        if isinstance(lisp, tuple):
+            op = lisp[0]
+            args = lisp[1:]
+
+            if op == 'symbol':
+                return self.symbol(args[0])
+            elif op == 'not':
+                return f"(not {self.expression(args[0])})"
+            elif op in ['and', 'or']:
+                return f"({self.expression(args[0])} {op} {self.expression(args[1])})"
+            elif op in ['==', '!=']:
+                return f"({self.expression(args[0])} {op} {self.expression(args[1])})"
+            elif op in comparison_helpers:
+                return f"{comparison_helpers[op]}({self.expression(args[0])}, {self.expression(args[1])})"
+            elif op in arith_helpers:
+                return f"{arith_helpers[op]}({self.expression(args[0])}, {self.expression(args[1])})"
+            elif op == 'neg':
+                return f"_neg({self.expression(args[0])})"
+            else:
+                raise ValueError(f"unexpected operator: '{op}'")
+        elif isinstance(lisp, str):
+            return repr(string_literal(lisp))
+        elif type(lisp) in [bool, int, float]:
+            return repr(lisp)
+        else:
+            raise ValueError(f"unexpected lisp expression: {lisp}")
+
+
+class Router:
+    """
+    Decides the next page of a respondent given their answers. The transitions of each page are compiled into a
+    python function returning the target of the first transition whose condition holds (first-match semantics, as
+    encoded by the mutually exclusive edge filters of `construct_graph`).
+
+    E.g.
+    >> router = Router.from_questionnaire(q)
+    >> router.next_page('A01', {'var01': True, 'var02': 'ao3'})
+    'A02'
+    """
+
+    def __init__(self, routes: Dict[str, Callable[[Answers], Optional[str]]], source: Dict[str, str], start: str):
+        """
+        :param routes: page uid -> function mapping answers to the uid of the next page (or None)
+        :param source: page uid -> generated code of the routing function
+        :param start: uid of the first page
+        """
+        self.routes = routes
+        self.source = source
+        self.start = start
+
+    @classmethod
+    def from_questionnaire(cls, q: xml.Questionnaire, parser: str = 'pyparsing') -> "Router":
+        """
+        :param q: questionnaire
+        :param parser: parser backend for transition conditions (see `parse.parser_backends`)
+        :return: `Router`
+        """
+        variables = {v.name: ZofarVariable.from_variable(v) for v in q.variables.values()}
+        evaluator = SpringExpEnumEvaluator(variables, enum_dict(q.pages), parser=parser)
+        compiler = ConditionCompiler(evaluator.enums, enum_value_dict(q.pages))
+
+        namespace = {**runtime, '_values': compiler.values}
+        routes = {}
+        source = {}
+        for i, page in enumerate(q.pages):
+            lines = [f"def _route_{i}(a):"]
+            for trans in page.transitions:
+                if trans.condition == 'false':
+                    continue
+                elif trans.condition is None or trans.condition == 'true':
+                    lines.append(f"    return {trans.target_uid!r}")
+                    break
+                else:
+                    lisp = evaluator.check_ast(evaluator.compile_ast(trans.condition))
+                    lines.append(f"    if {compiler.expression(lisp)}:")
+                    lines.append(f"        return {trans.target_uid!r}")
+            else:
+                lines.append("    return None")
+
+            source[page.uid] = '\n'.join(lines)
+            exec(compile(source[page.uid], f'<route {page.uid}>', 'exec'), namespace)
+            routes[page.uid] = namespace.pop(f'_route_{i}')
+
+        return cls(routes, source, q.pages[0].uid)
+
+    def next_page(self, page_uid: str, answers: Answers) -> Optional[str]:
+        """
+        :param page_uid: uid of the current page
+        :param answers: answers of the respondent
+        :return: uid of the next page, None if no transition fires (or the page has no transitions)
+        """
+        route = self.routes.get(page_uid)
+        return None if route is None else route(answers)
+
+    def path(self, answers: Answers, start: Optional[str] = None) -> List[str]:
+        """
+        Follows the transitions from `start` until no transition fires or a page would be visited a second time
+
+        :param answers: answers of the respondent
+        :param start: uid of the first page (default: first page of the questionnaire)
+        :return: list of visited page uids
+        """
+        page_uid = self.start if start is None else start
+        visited = [page_uid]
+        seen = {page_uid}
+        while True:
+            page_uid = self.next_page(page_uid, answers)
+            if page_uid is None or page_uid in seen:
+                return visited
+            visited.append(page_uid)
+            seen.add(page_uid)
@@ -0,0 +1,108 @@
+"""
+Spring expressions shared by the parser tests and `benchmarks.parse_throughput`
+"""
+import random
+from typing import List
+
+# spring expressions, including expressions the grammar does not accept
+EXPRESSIONS = [
+    "var01.value",
+    "!var01.value and !flag_index.value",
+    "!var01.value and flag_index.value",
+    "zofar.asNumber(var01) == 1",
+    "zofar.asNumber(var02) != 3",
+    "navigatorBean.isSame() or zofar.isBooleanSet('flag_A01',sessionController.participant)",
+    "zofar.isBooleanSet('flag_index',sessionController.participant)",
+    "var01.valueId == 'ao1' or var01.valueId == 'ao2' and !(var02.value gt 3)",
+    "true",
+    "false or true",
+    "(true) and !false",
+    "!!a",
+    "a . b",
+    "(a)",
+    "((a)) == 1",
+    "(a == 1) and b",
+    "(a + 1) == 2",
+    "a == (1)",
+    "a - b + c == 1",
+    "a / b * c*d-e == 1",
+    "- - a == 1",
+    "a+ +1 == b",
+    "1.5e3 == a",
+    "1 == 1.",
+    "a*.5 ge -2",
+    "'it''s' != a.b",
+    "f(1)",
+    "f(+4) lt 2",
+    "f(a == 1, 'x', -2)",
+    "f(g(h(a)), b.c) le 1",
+    "trueValue",
+    "f(trueValue)",
+    "f((trueValue))",
+    "a == trueValue",
+    "a == true",
+    "f(a + 1)",
+    "f()",
+    "-3",
+    "+3",
+    "a - b + c",
+    "'x'",
+    "zofar.f(a).b",
+    "a.and",
+    "a ==",
+    "a == 1 and",
+    "(a",
+    "a # b",
+]
+
+
+def random_expressions(n: int, seed: int = 0) -> List[str]:
+    """
+    Generates random spring expressions, about one third of them can be parsed
+
+    :param n: number of expressions
+    :param seed: random seed
+    :return: list of spring expressions
+    """
+    rnd = random.Random(seed)
+
+    def identifier():
+        return '.'.join(rnd.choice(['a', 'var01', 'zofar', 'value', 'x_1', 'trueX', 'order'])
+                        for _ in range(rnd.randint(1, 3)))
+
+    def term(depth):
+        r = rnd.random()
+        if depth > 3 or r < 0.3:
+            c = rnd.random()
+            if c < 0.3:
+                return rnd.choice(['0', '1', '13', '1.5', '.5', '2e3', '+4'])
+            elif c < 0.45:
+                return rnd.choice(["'ao1'", "'x y'", "''"])
+            elif c < 0.6:
+                return f"{identifier()}({', '.join(argument(depth + 1) for _ in range(rnd.randint(0, 2)))})"
+            return identifier()
+        elif r < 0.45:
+            return '-' + rnd.choice(['', ' ']) + term(depth + 1)
+        elif r < 0.6:
+            return '(' + term(depth + 1) + ')'
+        return term(depth + 1) + rnd.choice([' ', '']) + rnd.choice('+-*/') + rnd.choice([' ', '']) + term(depth + 1)
+
+    def argument(depth):
+        return rnd.choice([bool_exp, term])(depth)
+
+    def bool_exp(depth):
+        r = rnd.random()
+        if depth > 3 or r < 0.3:
+            c = rnd.random()
+            if c < 0.1:
+                return rnd.choice(['true', 'false'])
+            elif c < 0.6:
+                return f"{term(depth + 1)} {rnd.choice(['==', '!=', 'gt', 'ge', 'lt', 'le'])} {term(depth + 1)}"
+            return term(depth + 1)
+        elif r < 0.45:
+            return '!' + bool_exp(depth + 1)
+        elif r < 0.6:
+            return '(' + bool_exp(depth + 1) + ')'
+        return f"{bool_exp(depth + 1)} {rnd.choice(['and', 'or'])} {bool_exp(depth + 1)}"
+
+    return [bool_exp(0) for _ in range(n)]
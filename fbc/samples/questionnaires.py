@@ -0,0 +1,90 @@
+"""
+Generator for synthetic Zofar questionnaires of controllable size and shape (shared by the tests and the scaling
+benchmark, see `benchmarks/scaling.py`)
+"""
+import random
+from typing import List, Optional
+from xml.sax.saxutils import quoteattr
+
+HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<zofar:questionnaire xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+	xmlns:zofar="http://www.his.de/zofar/xml/questionnaire" xmlns:display="http://www.dzhw.eu/zofar/xml/display"
+	language="de">
+	<zofar:name>GENERATED</zofar:name>
+	<zofar:description></zofar:description>
+	<zofar:preloads></zofar:preloads>
+'''
+
+
+def condition(rng: random.Random, enums: int, members: int, depth: int) -> str:
+    """
+    :param rng: random number generator
+    :param enums: number of enum variables `e<j>`
+    :param members: number of answer options of each enum variable
+    :param depth: depth of the boolean expression tree; 1 yields a single comparison
+    :return: spring expression
+    """
+    if depth <= 1:
+        op = rng.choice(['==', '!='])
+        return f'zofar.asNumber(e{rng.randrange(enums)}) {op} {rng.randrange(members) + 1}'
+    op = rng.choice(['and', 'or'])
+    return f'({condition(rng, enums, members, depth - 1)}) {op} ({condition(rng, enums, members, depth - 1)})'
+
+
+def generate_questionnaire(pages: int = 10, branching: int = 2, enums: int = 3, members: int = 3, depth: int = 1,
+                           loops: float = 0.0, seed: Optional[int] = None) -> str:
+    """
+    Generates a questionnaire with a single start page, whose graph is acyclic except for self loops. The enum
+    questions `e<j>` are distributed over the pages. Each page except the last one has up to `branching` transitions
+    to later pages with random conditions over the enums and an unconditional transition to the next page, so all
+    pages are reachable and all soundness checks pass.
+
+    :param pages: number of pages
+    :param branching: maximal number of transitions per page
+    :param enums: number of enum variables
+    :param members: number of answer options of each enum variable
+    :param depth: depth of the transition conditions (see `condition`)
+    :param loops: probability of a page (except the start and the last page) to have a self loop, conditioned on a
+                  boolean variable `flag<i>`
+    :param seed: random seed
+    :return: questionnaire xml
+    """
+    if pages < 1 or branching < 1 or enums < 1 or members < 1:
+        raise ValueError(f'invalid questionnaire shape: {pages=}, {branching=}, {enums=}, {members=}')
+    rng = random.Random(seed)
+
+    looping = [i for i in range(1, pages - 1) if rng.random() < loops]
+
+    lines = [HEADER, '\t<zofar:variables>']
+    lines += [f'\t\t<zofar:variable name="e{j}" type="singleChoiceAnswerOption"/>' for j in range(enums)]
+    lines += [f'\t\t<zofar:variable name="flag{i}" type="boolean"/>' for i in looping]
+    lines.append('\t</zofar:variables>')
+
+    for i in range(pages):
+        lines.append(f'\t<zofar:page uid="p{i}">')
+        lines.append('\t\t<zofar:body uid="body">')
+        for j in range(i, enums, pages):
+            lines.append(f'\t\t\t<zofar:questionSingleChoice uid="sc{j}">')
+            lines.append(f'\t\t\t\t<zofar:responseDomain variable="e{j}" uid="rd">')
+            lines += [f'\t\t\t\t\t<zofar:answerOption uid="ao{m + 1}" value="{m + 1}"/>' for m in range(members)]
+            lines.append('\t\t\t\t</zofar:responseDomain>')
+            lines.append('\t\t\t</zofar:questionSingleChoice>')
+        lines.append('\t\t</zofar:body>')
+
+        if i < pages - 1:
+            transitions: List[str] = []
+            if i in looping:
+                transitions.append(f'<zofar:transition target="p{i}" condition="flag{i}.value"/>')
+            later = range(i + 2, pages)
+            for target in sorted(rng.sample(later, min(branching - 1, len(later)))):
+                exp = quoteattr(condition(rng, enums, members, depth))
+                transitions.append(f'<zofar:transition target="p{target}" condition={exp}/>')
+            transitions.append(f'<zofar:transition target="p{i + 1}"/>')
+
+            lines.append('\t\t<zofar:transitions>')
+            lines += [f'\t\t\t{t}' for t in transitions]
+            lines.append('\t\t</zofar:transitions>')
+        lines.append('\t</zofar:page>')
+
+    lines.append('</zofar:questionnaire>')
+    return '\n'.join(lines) + '\n'
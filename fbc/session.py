@@ -0,0 +1,195 @@
+from typing import Any, Dict, List, Optional, Set, Union
+
+import networkx as nx
+from networkx import bfs_edges
+from sympy import Expr, true
+
+from fbc.cache import SimplifyCache, current_simplify_cache, simplify_scope
+from fbc.data import xml
+from fbc.eval import Enum, Interv, construct_graph, detach_bdd, enum_dict, evaluate_node_predicates, interval_dict, \
+    node_predicate, soundness_check
+from fbc.logic.atoms import UnsupportedExpression
+
+
+class Session:
+    """
+    Owns a questionnaire graph and keeps node predicates and soundness check results up to date while transitions are
+    added, removed or updated. After an edit only the descendants of the edited edge are re-evaluated; the propagation
+    stops at nodes whose predicate did not change.
+    """
+
+    def __init__(self, g: nx.DiGraph, source: Any, enums: List[Union[Enum, Interv]], use_bdd: bool = False,
+                 cache: Optional[SimplifyCache] = None):
+        """
+        Evaluates all node predicates and soundness checks of `g` once
+
+        :param g: graph with 'filter' attributes on all edges
+        :param source: node to start from
+        :param enums: list of enumerations regarded during evaluation
+        :param use_bdd: represent predicates and filters as BDD nodes (see `fbc.eval.attach_bdd`)
+        :param cache: simplify cache used by all operations of the session (default: the cache of the current
+                      `simplify_scope`)
+        """
+        self.g = g
+        self.source = source
+        self.enums = enums
+        self.use_bdd = use_bdd
+        self.cache = cache if cache is not None else current_simplify_cache()
+
+        # nodes (re-)evaluated by the last operation
+        self.recomputed: List[Any] = []
+        # soundness check result of each node reachable from `source`
+        self.soundness: Dict[Any, bool] = {}
+
+        with simplify_scope(self.cache):
+            self._evaluate()
+
+    @classmethod
+    def from_questionnaire(cls, q: xml.Questionnaire, use_bdd: bool = False,
+                           cache: Optional[SimplifyCache] = None) -> "Session":
+        """
+        Creates a session from a questionnaire. The first page is used as source node, the enums of the answer options
+        and the interval domains of the number variables are regarded during evaluation.
+
+        :param q: questionnaire
+        :param use_bdd: represent predicates and filters as BDD nodes
+        :param cache: simplify cache used by all operations of the session (default: the cache of the current
+                      `simplify_scope`)
+        :return: `Session`
+        """
+        if cache is None:
+            cache = current_simplify_cache()
+
+        with simplify_scope(cache):
+            g = construct_graph(q)
+        enums = list(enum_dict(q.pages).values()) + list(interval_dict(q.variables).values())
+        return cls(g, q.pages[0].uid, enums, use_bdd, cache)
+
+    @property
+    def bdd(self):
+        return self.g.graph.get('bdd') if self.use_bdd else None
+
+    def _evaluate(self) -> None:
+        for _, data in self.g.nodes(data=True):
+            data.pop('pred', None)
+            data.pop('pred_bdd', None)
+
+        evaluate_node_predicates(self.g, self.source, self.enums, self.use_bdd)
+
+        self.recomputed = [v for v, data in self.g.nodes(data=True) if 'pred' in data]
+        self.soundness = {v: soundness_check(self.g, v, self.enums, true) for v in self.recomputed}
+
+    def _set_filter(self, u: Any, v: Any, f: Expr) -> bool:
+        self.g.edges[u, v]['filter'] = f
+        if self.bdd is not None:
+            try:
+                self.g.edges[u, v]['filter_bdd'] = self.bdd.node(f)
+            except UnsupportedExpression:
+                # the filter introduces atoms unknown to the BDD manager: the BDD attributes of all other edges are
+                # outdated now and must not be used by the checks
+                detach_bdd(self.g)
+                return False
+        return True
+
+    def add_edge(self, u: Any, v: Any, f: Expr) -> None:
+        """
+        Adds a transition from `u` to `v` and updates the affected predicates and soundness checks
+
+        :param u: source page
+        :param v: target page
+        :param f: filter of the transition
+        """
+        self.g.add_edge(u, v)
+        self.update_edge(u, v, f)
+
+    def update_edge(self, u: Any, v: Any, f: Expr) -> None:
+        """
+        Replaces the filter of the transition from `u` to `v` and updates the affected predicates and soundness checks
+
+        :param u: source page
+        :param v: target page
+        :param f: new filter of the transition
+        """
+        with simplify_scope(self.cache):
+            if self._set_filter(u, v, f):
+                self._propagate(u, v)
+            else:
+                self._evaluate()
+
+    def remove_edge(self, u: Any, v: Any) -> None:
+        """
+        Removes the transition from `u` to `v` and updates the affected predicates and soundness checks
+
+        :param u: source page
+        :param v: target page
+        """
+        self.g.remove_edge(u, v)
+        with simplify_scope(self.cache):
+            self._propagate(u, v)
+
+    def _propagate(self, u: Any, v: Any) -> None:
+        g = self.g
+        affected = {v} | nx.descendants(g, v)
+        reachable = {self.source} | {w for _, w in bfs_edges(g, self.source)}
+
+        # nodes which are no longer reachable lose their predicate and soundness check; their children need to be
+        # re-evaluated
+        dirty = {v}
+        for w in affected - reachable:
+            if 'pred' in g.nodes[w]:
+                dirty |= set(g.successors(w))
+            g.nodes[w].pop('pred', None)
+            g.nodes[w].pop('pred_bdd', None)
+            self.soundness.pop(w, None)
+
+        self.recomputed = []
+        for w in self._topological_order(affected & reachable):
+            if w not in dirty:
+                continue
+
+            old = g.nodes[w].get('pred_bdd' if self.bdd is not None else 'pred')
+            g.nodes[w].update(node_predicate(g, w, self.enums, self.bdd))
+            self.recomputed.append(w)
+
+            if w not in self.soundness:
+                # newly reachable node
+                self.soundness[w] = soundness_check(g, w, self.enums, true)
+            if g.nodes[w].get('pred_bdd' if self.bdd is not None else 'pred') != old:
+                dirty |= set(g.successors(w))
+
+        if u in reachable:
+            self.soundness[u] = soundness_check(g, u, self.enums, true)
+
+    def _topological_order(self, nodes: Set[Any]) -> List[Any]:
+        g = self.g
+        in_degree = {w: sum([1 for p in g.predecessors(w) if p != w and p in nodes]) for w in nodes}
+        order = [w for w in nodes if in_degree[w] == 0]
+        for w in order:
+            for c in g.successors(w):
+                if c != w and c in nodes:
+                    in_degree[c] -= 1
+                    if in_degree[c] == 0:
+                        order.append(c)
+
+        if len(order) != len(nodes):
+            blocking = [w for w in nodes if in_degree[w] > 0]
+            raise ValueError(f"Could not process in evaluating node predicates: {blocking=}")
+        return order
+
+    @property
+    def unsound_nodes(self) -> List[Any]:
+        """
+        :return: nodes which do not pass the soundness check (outgoing edges conditions)
+        """
+        return [v for v, b in self.soundness.items() if not b]
+
+    def check(self) -> bool:
+        """
+        Same as `fbc.eval.graph_soundness_check` based on the maintained results
+
+        :return: True, if all reachable nodes pass the soundness check
+        """
+        if self.unsound_nodes:
+            raise ValueError(f'The following nodes do not pass soundness check (outgoing edges conditions): '
+                             f'{self.unsound_nodes}')
+        return True
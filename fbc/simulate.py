@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+from sympy import Symbol, lambdify
+
+from fbc.eval import Enum
+from fbc.util import topological_nodes
+
+
+@dataclass
+class SimulationResult:
+    # number of respondents visiting each page
+    page_visits: Dict[Any, int]
+    # number of respondents following each edge
+    edge_traversals: Dict[Tuple[Any, Any], int]
+    # number of respondents whose path ends at each page (no transition fires or only the self loop)
+    page_exits: Dict[Any, int]
+    # path_lengths[k] is the number of respondents visiting k pages
+    path_lengths: np.ndarray
+
+    @property
+    def mean_path_length(self) -> float:
+        return float(np.average(np.arange(len(self.path_lengths)), weights=self.path_lengths))
+
+
+class Simulator:
+    """
+    Simulates respondents on a questionnaire graph (see `construct_graph`). Answers are given as a matrix with one row
+    per respondent and one column per variable (see `columns`): enum variables hold the index of the answer option
+    (in the order of `Enum.member_vars`), boolean and number variables hold their value. Pages are processed in
+    topological order and each edge filter is evaluated once per page, as vectorized mask over all respondents
+    arriving at that page.
+
+    E.g.
+    >> simulator = Simulator(g, 'index', list(enum_dict(q.pages).values()))
+    >> result = simulator.run(simulator.random_answers(1_000_000))
+    >> result.page_visits['A01']
+    499713
+    """
+
+    def __init__(self, g: nx.DiGraph, source: Any, enums: Sequence[Enum]):
+        """
+        :param g: graph with 'filter' attributes on all edges
+        :param source: node all respondents start from
+        :param enums: list of enumerations used in the edge filters
+        :raises ValueError: if the graph contains a cycle other than self loops
+        """
+        self.g = g
+        self.source = source
+        self.order = topological_nodes(g, source)
+
+        enums_by_name = {e.name: e for e in enums}
+        # enums answered by a column; number enums `<name>_NUM` are derived from the answer option of `<name>`
+        self.enums = [e for e in enums if not (e.name.endswith('_NUM') and e.name[:-len('_NUM')] in enums_by_name)]
+        self.derived = {f'{e.name}_NUM': (e.name, np.array(list(enums_by_name[f'{e.name}_NUM'].member_vars)))
+                        for e in self.enums if f'{e.name}_NUM' in enums_by_name}
+
+        # literal symbols are replaced by the member index, or by the member itself for derived number enums
+        literals = {}
+        for e in enums:
+            derived = e.name in self.derived
+            literals.update({sym: (m if derived else i) for i, (m, sym) in enumerate(e.member_vars.items())})
+
+        enum_names = {e.name for e in enums}
+        symbols = set()
+        self.edge_masks: Dict[Tuple[Any, Any], Tuple[Callable, List[str]]] = {}
+        for u in self.order:
+            for _, v, f in g.out_edges(u, data='filter'):
+                f = f.subs(literals) if not isinstance(f, bool) else f
+                args = sorted([s for s in getattr(f, 'free_symbols', set()) if isinstance(s, Symbol)], key=str)
+                symbols |= {str(s) for s in args if str(s) not in enum_names}
+                self.edge_masks[(u, v)] = (lambdify(args, f, modules='numpy'), [str(s) for s in args])
+
+        self.columns: List[str] = [e.name for e in self.enums] + sorted(symbols)
+        self._column_index = {c: j for j, c in enumerate(self.columns)}
+
+    def random_answers(self, n: int, seed: Optional[int] = None) -> np.ndarray:
+        """
+        Draws answers uniformly: enum variables over their answer options, all other variables as booleans
+
+        :param n: number of respondents
+        :param seed: random seed
+        :return: answer matrix of shape (n, len(columns))
+        """
+        rng = np.random.default_rng(seed)
+        sizes = [len(e.member_vars) for e in self.enums] + [2] * (len(self.columns) - len(self.enums))
+        return np.stack([rng.integers(0, size, n) for size in sizes], axis=1) if sizes else np.zeros((n, 0), int)
+
+    def _values(self, answers: np.ndarray, rows: np.ndarray, name: str, cache: Dict[str, np.ndarray]) -> np.ndarray:
+        if name not in cache:
+            if name in self.derived:
+                column, members = self.derived[name]
+                cache[name] = members[self._values(answers, rows, column, cache).astype(int)]
+            else:
+                cache[name] = answers[rows, self._column_index[name]]
+        return cache[name]
+
+    def run(self, answers: np.ndarray) -> SimulationResult:
+        """
+        :param answers: answer matrix of shape (number of respondents, len(columns))
+        :return: `SimulationResult`
+        """
+        if answers.ndim != 2 or answers.shape[1] != len(self.columns):
+            raise ValueError(f"expected answer matrix with {len(self.columns)} columns: {self.columns}")
+
+        n = answers.shape[0]
+        arrivals = {v: [] for v in self.order}
+        arrivals[self.source].append(np.arange(n))
+        lengths = np.zeros(n, dtype=np.int32)
+
+        page_visits = {}
+        page_exits = {}
+        edge_traversals = {}
+        for u in self.order:
+            parts = arrivals.pop(u)
+            rows = np.concatenate(parts) if parts else np.zeros(0, dtype=int)
+            page_visits[u] = len(rows)
+            lengths[rows] += 1
+
+            cache = {}
+            # first-match semantics: a respondent follows the first edge whose filter holds
+            undecided = np.ones(len(rows), dtype=bool)
+            exits = np.zeros(len(rows), dtype=bool)
+            for _, v in self.g.out_edges(u):
+                fun, args = self.edge_masks[(u, v)]
+                mask = np.asarray(fun(*[self._values(answers, rows, a, cache) for a in args]), dtype=bool)
+                mask = np.broadcast_to(mask, undecided.shape) & undecided
+                undecided &= ~mask
+                edge_traversals[(u, v)] = int(np.count_nonzero(mask))
+                if v != u:
+                    arrivals[v].append(rows[mask])
+                else:
+                    exits |= mask
+            page_exits[u] = int(np.count_nonzero(exits | undecided))
+
+        return SimulationResult(page_visits, edge_traversals, page_exits, np.bincount(lengths))
@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from math import prod
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class Tracer:
+    """
+    Records spans as complete events ('ph': 'X') of the Chrome trace event format, which can be loaded into
+    `chrome://tracing` or https://ui.perfetto.dev
+
+    E.g.
+    >> with tracing() as tracer:
+    >>     graph_soundness_check(g, source, enums)
+    >> tracer.write('soundness.trace.json')
+    """
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self.pid = os.getpid()
+        self._start = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def record(self, name: str, cat: str, start: int, end: int, args: Dict[str, Any]) -> None:
+        """
+        :param name: name of the span
+        :param cat: category (phase) of the span
+        :param start: start time (`time.perf_counter_ns`)
+        :param end: end time (`time.perf_counter_ns`)
+        :param args: additional span information, e.g. node id or enum product size
+        """
+        event = {'name': name, 'cat': cat, 'ph': 'X', 'ts': (start - self._start) / 1000,
+                 'dur': (end - start) / 1000, 'pid': self.pid, 'tid': threading.get_ident(), 'args': args}
+        with self._lock:
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name: str, cat: str = 'fbc', **args) -> Iterator[Dict[str, Any]]:
+        """
+        Records the enclosed block as span. The yielded args may be extended within the block.
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            self.record(name, cat, start, time.perf_counter_ns(), args)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+
+    def write(self, path: str) -> None:
+        """
+        Writes the recorded spans as Chrome trace / Perfetto JSON file
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_json(), f, default=str)
+
+
+# active tracer; tracing is disabled if None
+_tracer: Optional[Tracer] = None
+
+
+def current_tracer() -> Optional[Tracer]:
+    """
+    :return: active tracer, or None if tracing is disabled
+    """
+    return _tracer
+
+
+def enable_tracing(tracer: Optional[Tracer] = None) -> Tracer:
+    """
+    :param tracer: tracer to record spans with (default: a new `Tracer`)
+    :return: the active tracer
+    """
+    global _tracer
+    _tracer = tracer if tracer is not None else Tracer()
+    return _tracer
+
+
+def disable_tracing() -> Optional[Tracer]:
+    """
+    :return: the previously active tracer
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+@contextmanager
+def tracing(path: Optional[str] = None, tracer: Optional[Tracer] = None) -> Iterator[Tracer]:
+    """
+    Context manager enabling tracing for the enclosed block. The previously active tracer is restored afterwards.
+
+    :param path: if given, the recorded spans are written to this file (see `Tracer.write`)
+    :param tracer: tracer to record spans with (default: a new `Tracer`)
+    :return: the active tracer
+    """
+    global _tracer
+    previous = _tracer
+    tracer = enable_tracing(tracer)
+    try:
+        yield tracer
+    finally:
+        _tracer = previous
+        if path is not None:
+            tracer.write(path)
+
+
+def span(name: str, cat: str = 'fbc', **args):
+    """
+    Records the enclosed block as span of the active tracer; a no-op context if tracing is disabled.
+
+    E.g.
+    >> for v in nodes:
+    >>     with span('node_predicate', node=v):
+    >>         ...
+    """
+    if _tracer is None:
+        return nullcontext({})
+    return _tracer.span(name, cat, **args)
+
+
+def traced(cat: str, args: Optional[Callable[..., Dict[str, Any]]] = None) -> Callable:
+    """
+    Decorator recording each call of the function as span of the active tracer. If tracing is disabled, the
+    function is called directly.
+
+    :param cat: category (phase) of the span
+    :param args: optional function of the call arguments returning additional span information
+    """
+    def decorator(func):
+        @wraps(func)
+        def traced_wrapper(*a, **kw):
+            if _tracer is None:
+                return func(*a, **kw)
+            with _tracer.span(func.__name__, cat, **(args(*a, **kw) if args is not None else {})):
+                return func(*a, **kw)
+        return traced_wrapper
+    return decorator
+
+
+def enum_product_size(enums) -> int:
+    """
+    :return: number of assignments of the given enums
+    """
+    return prod([len(e.members) for e in enums])
@@ -1,27 +1,26 @@
+from collections import deque
+
 import networkx as nx
 from networkx import bfs_edges
-from PIL import Image
-import io
-from pygraphviz.agraph import AGraph
 from typing import List, Any, Optional, Callable, Union, Dict, Tuple
 from contextlib import contextmanager
-from functools import wraps
 import time
 
+from fbc.trace import traced
+
+# rendering functions live in `fbc.visualize`, which is only imported on first access, so validation does not load
+# pygraphviz and Pillow
+_visualize_names = {'to_agraph', 'draw_graph', 'show_graph'}
+
 
-def timeit(func):
-    @wraps(func)
-    def timeit_wrapper(*args, **kwargs):
-        start_time = time.perf_counter()
-        result = func(*args, **kwargs)
-        end_time = time.perf_counter()
-        total_time = end_time - start_time
-        print(f'Function {func.__name__}{args} {kwargs} took {total_time:.4f} seconds')
-        return result
-    return timeit_wrapper
+def __getattr__(name: str) -> Any:
+    if name in _visualize_names:
+        from fbc import visualize
+        return getattr(visualize, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-@timeit
+@traced('graph', lambda g, source: {'source': source, 'nodes': g.number_of_nodes()})
 def bfs_nodes(g: nx.Graph, source: Any) -> List[Any]:
     """
     Returns nodes in breadth first search order
@@ -33,54 +32,37 @@ def bfs_nodes(g: nx.Graph, source: Any) -> List[Any]:
     return [source] + [v for _, v in bfs_edges(g, source=source)]
 
 
-@timeit
-def to_agraph(g: nx.Graph) -> AGraph:
-    """
-    Converts an `nx.Graph` to an `pygraphviz.agraph.AGraph`
-    :param g: nx.Graph
-    :return: pygraphviz.agraph.AGraph
-    """
-    tmp_g = g.copy()
-
-    # add edge 'filter' labels
-    for u, v, data in tmp_g.edges(data=True):
-        tmp_g.update(edges=[(u, v, {"label": (str(data["filter"]) if 'filter' in data else "")})])
-
-    # add node 'pred' labels
-    for u, data in tmp_g.nodes(data=True):
-        tmp_g.update(nodes=[(u, {"label": f"{u}\\n{(data['pred'] if 'pred' in data else '')}"})])
-
-    # convert to agraph
-    agraph = nx.nx_agraph.to_agraph(tmp_g)
-    agraph.node_attr['shape'] = 'box'
-    agraph.layout(prog='dot')
-
-    return agraph
-
-
-@timeit
-def draw_graph(g: nx.Graph, *args, **kwargs) -> None:
-    """
-    Draw a nx.Graph to a file. Uses the signature of `pygraphviz.agraph.AGraph.draw`
-
-    :param g: graph
-    :param args: args passed to `pygraphviz.agraph.AGraph.draw`
-    :param kwargs: kwargs passed to `pygraphviz.agraph.AGraph.draw`
-    """
-    to_agraph(g).draw(*args, **kwargs)
-
-
-def show_graph(g: nx.Graph, image_format='png') -> None:
+def topological_nodes(g: nx.DiGraph, source: Any) -> List[Any]:
     """
-    Show a nx.Graph in a pillow window
+    Returns all nodes reachable from `source` in topological order (parents before children). Self loops and
+    parents which are not reachable from `source` are ignored. Each node and edge is visited once.
 
     :param g: graph
-    :param image_format: image format to use
-    """
-    agraph = to_agraph(g)
-    image_data = agraph.draw(format=image_format)
-    image = Image.open(io.BytesIO(image_data))
-    image.show()
+    :param source: node to start from
+    :return: list of nodes
+    :raises ValueError: if the order cannot be completed. The error lists the blocking nodes, i.e. the nodes that
+                        are part of a cycle or depend on one
+    """
+    reachable = bfs_nodes(g, source=source)
+    reachable_set = set(reachable)
+    in_degree = {v: sum([1 for u in g.predecessors(v) if u != v and u in reachable_set]) for v in reachable}
+
+    queue = deque([v for v in reachable if in_degree[v] == 0])
+    order = []
+    while queue:
+        u = queue.popleft()
+        order.append(u)
+        for v in g.successors(u):
+            if v != u:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    queue.append(v)
+
+    if len(order) != len(reachable):
+        blocking = [v for v in reachable if in_degree[v] > 0]
+        raise ValueError(f"Could not process in evaluating node predicates: {blocking=}")
+
+    return order
 
 
 def flatten(ll):
@@ -0,0 +1,185 @@
+from dataclasses import dataclass, field
+from functools import reduce
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import networkx as nx
+from sympy import Expr, false, true
+
+from fbc.data import xml
+from fbc.eval import Enum, Interv, construct_graph, evaluate_node_predicates, in_degree_soundness_check, \
+    interval_dict, project_enums
+from fbc.logic.atoms import UnsupportedExpression
+from fbc.logic.classify import CONTRADICTION, TAUTOLOGY, classify, component_size, components, filter_checks
+from fbc.logic.sat import CNF
+from fbc.trace import span, traced
+from fbc.util import bfs_nodes
+
+
+@dataclass
+class Failure:
+    # name of the failed check: 'start_node', 'predicates', 'soundness', 'disjointness', 'reachability' or
+    # 'final_nodes'
+    check: str
+    message: str
+    nodes: List[Any] = field(default_factory=list)
+
+
+@dataclass
+class Report:
+    """
+    Result of `verify`: all failed checks of a questionnaire graph
+    """
+    nodes: int = 0
+    edges: int = 0
+    failures: List[Failure] = field(default_factory=list)
+    # number of assignments of each independent component of the outbound edge filters of a node (see `node_checks`)
+    components: Dict[Any, List[int]] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return len(self.failures) == 0
+
+    @property
+    def errors(self) -> List[str]:
+        """
+        :return: messages of all failures
+        """
+        return [f.message for f in self.failures]
+
+    def failed(self, check: str) -> List[Any]:
+        """
+        :param check: name of the check
+        :return: nodes failing the given check
+        """
+        return [v for f in self.failures if f.check == check for v in f.nodes]
+
+
+def node_checks(out_filters: List[Expr], enums: List[Union[Enum, Interv]], sat: bool = False, v: Any = None) \
+        -> Tuple[bool, bool, List[int]]:
+    """
+    Decides soundness (the disjunction of the outbound edge filters is true, see `fbc.eval.soundness_check`) and
+    disjointness (no assignment satisfies two filters, see `fbc.eval.disjointness_check`) of a node at once. The
+    filters are grouped into independent groups and one truth table per group feeds both checks (see
+    `fbc.logic.classify.filter_checks`), i.e. the assignments are enumerated per group instead of over the product of
+    all relevant enums. Only if the filters contain atoms the truth table cannot resolve, both checks are decided by
+    `fbc.logic.classify.classify`.
+
+    :param out_filters: outbound edge filters of the node
+    :param enums: list of enumerations regarded during evaluation
+    :param sat: decide the checks as satisfiability queries (see `fbc.logic.sat.CNF`)
+    :param v: node the filters belong to (for logging only)
+    :return: tuple (sound, disjoint, number of assignments of each component of the disjunction of the filters)
+    """
+    if len(out_filters) == 0:
+        return True, True, []
+
+    enums = project_enums(out_filters, enums, v)
+    disjunction = reduce(lambda a, b: a | b, out_filters)
+    sizes = [component_size(c) for c in components(disjunction, enums)]
+    try:
+        if sat:
+            cnf = CNF.from_exprs(out_filters, enums)
+            lits = [cnf.literal(f) for f in out_filters]
+            return cnf.is_valid(disjunction), \
+                not any([cnf.solve([a, b]) is not None for i, a in enumerate(lits) for b in lits[i + 1:]]), sizes
+
+        return (*filter_checks(out_filters, enums), sizes)
+    except UnsupportedExpression:
+        pass
+
+    sound = classify(disjunction, enums) is TAUTOLOGY
+    disjoint = all([classify(a & b, enums) is CONTRADICTION
+                    for i, a in enumerate(out_filters) for b in out_filters[i + 1:]])
+    return sound, disjoint, sizes
+
+
+@traced('verify', lambda g, source, enums, *args, **kwargs: {'source': source, 'nodes': g.number_of_nodes()})
+def verify_graph(g: nx.DiGraph, source: Any, enums: List[Union[Enum, Interv]], sat: bool = False,
+                 report: Optional[Report] = None, final_nodes: bool = False) -> Report:
+    """
+    Runs all checks on a graph with evaluated node predicates (see `evaluate_node_predicates`) in one pass over the
+    nodes reachable from `source`: a single start node (see `in_degree_soundness_check`), soundness and
+    disjointness of the outbound edge filters of each node (see `node_checks`) and reachability of all final nodes
+    (without out edges), i.e. their predicate is not false. Failing checks are collected instead of raising, the
+    component sizes of each node are recorded in `Report.components`.
+
+    With `final_nodes`, final nodes which are reachable only under some conditions (predicate neither true nor false)
+    fail the check 'final_nodes' in addition, i.e. every final node needs to be reached for all assignments.
+
+    :param g: graph
+    :param source: node to start from
+    :param enums: list of enumerations regarded during evaluation
+    :param sat: decide soundness and disjointness as satisfiability queries
+    :param report: report to add the failures to (default: a new report)
+    :param final_nodes: require the predicate of all final nodes to be true
+    :return: report
+    """
+    if report is None:
+        report = Report(g.number_of_nodes(), g.number_of_edges())
+
+    try:
+        in_degree_soundness_check(g)
+    except ValueError as err:
+        report.failures.append(Failure('start_node', str(err), [u for u, n in g.in_degree if n == 0]))
+
+    unsound, overlapping = [], []
+    for v in bfs_nodes(g, source):
+        with span('soundness_check', 'soundness', node=v):
+            sound, disjoint, report.components[v] = node_checks([d['filter'] for d in g[v].values()], enums, sat, v)
+        if not sound:
+            unsound.append(v)
+        if not disjoint:
+            overlapping.append(v)
+
+    if unsound:
+        report.failures.append(Failure(
+            'soundness', f'The following nodes do not pass soundness check (outgoing edges conditions): {unsound}',
+            unsound))
+    if overlapping:
+        report.failures.append(Failure(
+            'disjointness', f'The following nodes do not pass disjointness check (outgoing edges conditions overlap): '
+                            f'{overlapping}', overlapping))
+
+    unreachable = [v for v, data in g.nodes(data=True) if g.out_degree(v) == 0 and data.get('pred', false) == false]
+    if unreachable:
+        report.failures.append(Failure('reachability', f'final nodes cannot be reached: {unreachable=}', unreachable))
+
+    if final_nodes:
+        conditional = {v: data['pred'] for v, data in g.nodes(data=True)
+                       if g.out_degree(v) == 0 and v not in unreachable and data['pred'] != true}
+        for v, pred in conditional.items():
+            report.failures.append(Failure(
+                'final_nodes', f'Graph evaluation failed: final node "{v}" cannot be reached unless "{pred}"', [v]))
+
+    return report
+
+
+def verify(q: Union[xml.Questionnaire, xml.QuestionnaireStream], parser: str = 'pyparsing', sat: bool = False) \
+        -> Report:
+    """
+    Verifies a questionnaire: constructs its graph, evaluates the node predicates and runs all checks (see
+    `verify_graph`)
+
+    E.g.
+    >> report = verify(read_questionnaire('questionnaire.xml'))
+    >> report.ok, report.failed('soundness')
+    (False, ['A01'])
+
+    :param q: questionnaire
+    :param parser: parser backend for transition conditions (see `parse.parser_backends`)
+    :param sat: decide soundness and disjointness as satisfiability queries
+    :return: report
+    """
+    g = construct_graph(q, parser=parser)
+    enums = list(g.graph['enums'].values()) + list(interval_dict(q.variables).values())
+    # pages are added to the graph in document order, the first one is the start page
+    source = next(iter(g.nodes))
+    report = Report(g.number_of_nodes(), g.number_of_edges())
+
+    try:
+        evaluate_node_predicates(g, source, enums)
+    except ValueError as err:
+        report.failures.append(Failure('predicates', str(err)))
+        return report
+
+    return verify_graph(g, source, enums, sat, report)
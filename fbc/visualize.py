@@ -0,0 +1,188 @@
+import io
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+import networkx as nx
+from PIL import Image
+from pygraphviz.agraph import AGraph
+
+from fbc.trace import traced
+
+# sympy representations of enum comparisons and missing checks, rewritten to a compact notation
+_sympy_replacements = [(re.compile(pattern), replacement) for pattern, replacement in [
+    (r'Ne\(LIT_([a-zA-Z0-9]+)_NUM_([0-9]+), [a-zA-Z0-9]+_NUM\)', r'\1!=\2'),
+    (r'Ne\(LIT_([a-zA-Z0-9]+)_([0-9]+), [a-zA-Z0-9]+_NUM\)', r'\1!=\2'),
+    (r'Eq\(LIT_([a-zA-Z0-9]+)_NUM_([0-9]+), [a-zA-Z0-9]+_NUM\)', r'\1==\2'),
+    (r'Eq\(LIT_([a-zA-Z0-9]+)_([0-9]+), [a-zA-Z0-9]+_NUM\)', r'\1==\2'),
+    (r'~([a-zA-Z0-9]+)_IS_MISSING', r'\1==MIS'),
+    (r'([a-zA-Z0-9]+)_IS_MISSING', r'\1==MIS'),
+]]
+
+# layout attributes of nodes and edges computed by `dot` and reused by `render`; node sizes are not reused, they are
+# computed from the labels of each variant
+_node_layout_attributes = ('pos',)
+_edge_layout_attributes = ('pos', 'lp')
+
+
+def replace_sympy_expressions(input_str: str) -> str:
+    for pattern, replacement in _sympy_replacements:
+        input_str = pattern.sub(replacement, input_str)
+    return input_str
+
+
+def add_line_breaks_to_str(input_str: str, line_char_width: int = 20) -> str:
+    lines = []
+    while len(input_str) > line_char_width:
+        index = input_str.rfind(' ', 0, line_char_width)
+        if index == -1:
+            index = input_str.find(' ')
+        if index == -1:
+            break
+        lines.append(input_str[:index])
+        input_str = input_str[index + 1:]
+    lines.append(input_str)
+    return '\n'.join(lines)
+
+
+def tweak_label(label: str) -> str:
+    """
+    :return: label with compact enum comparisons (see `replace_sympy_expressions`) and line breaks
+    """
+    return add_line_breaks_to_str(replace_sympy_expressions(label))
+
+
+@dataclass
+class Layout:
+    """
+    Positions of nodes, edges and edge labels (in points) as computed by `dot`, keyed by node names
+    """
+    nodes: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    edges: Dict[Tuple[str, str], Dict[str, str]] = field(default_factory=dict)
+    bb: Optional[str] = None
+
+
+def _quote(s: Any) -> str:
+    return '"' + str(s).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+
+def _attributes(attributes: Dict[str, Any]) -> str:
+    return ', '.join(f'{k}={_quote(v)}' for k, v in attributes.items())
+
+
+def dot_lines(g: nx.Graph, label: Optional[Callable[[str], str]] = None, layout: Optional[Layout] = None) \
+        -> Iterator[str]:
+    """
+    Writes the graph in DOT format, reading the node and edge data views directly. Nodes are labeled with their name
+    and 'pred' attribute, edges with their 'filter' attribute.
+
+    :param g: graph
+    :param label: function applied to all 'pred' and 'filter' strings (e.g. `tweak_label`)
+    :param layout: if given, positions are written as well (see `render`)
+    :return: lines of the DOT source
+    """
+    label = label if label is not None else str
+    yield f'{"digraph" if g.is_directed() else "graph"} {{\n'
+    yield '\tnode [shape=box];\n'
+    if layout is not None and layout.bb is not None:
+        yield f'\tgraph [bb={_quote(layout.bb)}];\n'
+
+    for u, pred in g.nodes(data='pred'):
+        attributes = {'label': f"{u}\n{label(str(pred)) if pred is not None else ''}"}
+        if layout is not None:
+            attributes.update(layout.nodes.get(str(u), {}))
+        yield f'\t{_quote(u)} [{_attributes(attributes)}];\n'
+
+    connector = '->' if g.is_directed() else '--'
+    for u, v, f in g.edges(data='filter'):
+        attributes = {'label': label(str(f)) if f is not None else ''}
+        if layout is not None:
+            attributes.update(layout.edges.get((str(u), str(v)), {}))
+        yield f'\t{_quote(u)} {connector} {_quote(v)} [{_attributes(attributes)}];\n'
+    yield '}\n'
+
+
+@traced('render', lambda g, *args, **kwargs: {'nodes': g.number_of_nodes(), 'edges': g.number_of_edges()})
+def compute_layout(g: nx.Graph, label: Optional[Callable[[str], str]] = None) -> Layout:
+    """
+    Runs the `dot` layout once; the result can be reused for other label variants and output formats (see `render`)
+
+    :param g: graph
+    :param label: label function the layout is computed for (see `dot_lines`)
+    :return: layout
+    """
+    agraph = AGraph(string=''.join(dot_lines(g, label)))
+    agraph.layout(prog='dot')
+    layout = Layout(bb=agraph.graph_attr.get('bb'))
+    for n in agraph.nodes_iter():
+        layout.nodes[str(n)] = {k: n.attr[k] for k in _node_layout_attributes if n.attr.get(k)}
+    for e in agraph.edges_iter():
+        layout.edges[(str(e[0]), str(e[1]))] = {k: e.attr[k] for k in _edge_layout_attributes if e.attr.get(k)}
+    return layout
+
+
+@traced('render', lambda g, path=None, *args, **kwargs: {'path': str(path)})
+def render(g: nx.Graph, path: Union[str, Path, None] = None, image_format: Optional[str] = None,
+           label: Optional[Callable[[str], str]] = None, layout: Optional[Layout] = None) -> Tuple[Layout, bytes]:
+    """
+    Renders the graph with a precomputed layout. Only the first call needs to run `dot`; passing its layout to further
+    calls renders other label variants and formats with fixed positions (`nop2`, i.e. `neato -n2`).
+
+    E.g.
+    >> layout, _ = render(g, 'graph.png')
+    >> render(g, 'graph_label.png', label=tweak_label, layout=layout)
+    >> render(g, 'graph.svg', layout=layout)
+
+    :param g: graph
+    :param path: output file; if None the image data is returned only
+    :param image_format: image format (default: suffix of `path`)
+    :param label: label function (see `dot_lines`)
+    :param layout: layout to reuse (default: computed by `compute_layout`)
+    :return: layout and image data (empty if written to `path`)
+    """
+    if layout is None:
+        layout = compute_layout(g, label)
+    if image_format is None:
+        image_format = Path(path).suffix[1:] if path is not None else 'png'
+
+    agraph = AGraph(string=''.join(dot_lines(g, label, layout)))
+    data = agraph.draw(path=str(path) if path is not None else None, format=image_format, prog='nop2')
+    return layout, data if data is not None else b''
+
+
+@traced('render', lambda g: {'nodes': g.number_of_nodes(), 'edges': g.number_of_edges()})
+def to_agraph(g: nx.Graph) -> AGraph:
+    """
+    Converts an `nx.Graph` to an `pygraphviz.agraph.AGraph`
+    :param g: nx.Graph
+    :return: pygraphviz.agraph.AGraph
+    """
+    agraph = AGraph(string=''.join(dot_lines(g)))
+    agraph.layout(prog='dot')
+
+    return agraph
+
+
+@traced('render', lambda g, *args, **kwargs: {'nodes': g.number_of_nodes(), 'edges': g.number_of_edges()})
+def draw_graph(g: nx.Graph, *args, **kwargs) -> None:
+    """
+    Draw a nx.Graph to a file. Uses the signature of `pygraphviz.agraph.AGraph.draw`
+
+    :param g: graph
+    :param args: args passed to `pygraphviz.agraph.AGraph.draw`
+    :param kwargs: kwargs passed to `pygraphviz.agraph.AGraph.draw`
+    """
+    to_agraph(g).draw(*args, **kwargs)
+
+
+def show_graph(g: nx.Graph, image_format='png') -> None:
+    """
+    Show a nx.Graph in a pillow window
+
+    :param g: graph
+    :param image_format: image format to use
+    """
+    _, image_data = render(g, image_format=image_format)
+    image = Image.open(io.BytesIO(image_data))
+    image.show()
@@ -0,0 +1,74 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+import fbc
+from fbc import artifact
+from fbc.artifact import ArtifactStore, compile_questionnaire
+from fbc.cli import check_questionnaire
+
+
+class Test(TestCase):
+    context = Path('.', 'tests', 'context')
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = ArtifactStore(tmp.name)
+
+    def test_load_or_compile(self):
+        path = Path(self.context, 'questionnaire.xml')
+        compiled, hit = self.store.load_or_compile(path)
+        self.assertFalse(hit)
+        self.assertTrue(self.store.artifact_path(path.read_bytes()).exists())
+
+        loaded, hit = self.store.load_or_compile(path)
+        self.assertTrue(hit)
+        self.assertEqual((self.store.hits, self.store.misses), (1, 1))
+        self.assertEqual(loaded.source, 'index')
+        self.assertEqual(dict(loaded.graph.nodes(data='pred')), dict(compiled.graph.nodes(data='pred')))
+        self.assertEqual(list(loaded.graph.edges(data='filter')), list(compiled.graph.edges(data='filter')))
+        self.assertEqual(repr(loaded.enums), repr(compiled.enums))
+
+    def test_key(self):
+        data = Path(self.context, 'questionnaire.xml').read_bytes()
+        self.assertNotEqual(self.store.artifact_path(data), self.store.artifact_path(data + b'\n'))
+
+        path = self.store.artifact_path(data)
+        with patch.object(artifact, 'ARTIFACT_VERSION', artifact.ARTIFACT_VERSION + 1):
+            self.assertNotEqual(self.store.artifact_path(data), path)
+        with patch.object(fbc, '__version__', '0.0.0'):
+            self.assertNotEqual(self.store.artifact_path(data), path)
+        self.assertNotEqual(self.store.artifact_path(data, 'pratt'), path)
+
+    def test_parser(self):
+        path = Path(self.context, 'questionnaire.xml')
+        self.assertFalse(self.store.load_or_compile(path, parser='pratt')[1])
+        self.assertFalse(self.store.load_or_compile(path)[1])
+        self.assertTrue(self.store.load_or_compile(path, parser='pratt')[1])
+
+    def test_corrupt_artifact(self):
+        path = Path(self.context, 'questionnaire_simplified_enum.xml')
+        compiled, _ = self.store.load_or_compile(path)
+        artifact_path = self.store.artifact_path(path.read_bytes())
+
+        for data in [artifact_path.read_bytes()[:100], b'', b'no pickle']:
+            artifact_path.write_bytes(data)
+            loaded, hit = self.store.load_or_compile(path)
+            self.assertFalse(hit)
+            self.assertEqual(dict(compiled.graph.nodes(data='pred')), dict(loaded.graph.nodes(data='pred')))
+        self.assertTrue(self.store.load_or_compile(path)[1])
+
+    def test_compile_questionnaire(self):
+        compiled = compile_questionnaire(Path(self.context, 'questionnaire_simplified_enum.xml').read_bytes())
+        self.assertEqual(compiled.graph.number_of_nodes(), 9)
+        self.assertTrue(all('pred' in data for _, data in compiled.graph.nodes(data=True)))
+
+    def test_check_questionnaire(self):
+        path = Path(self.context, 'questionnaire_A01_soundness_fail.xml')
+        summaries = [check_questionnaire(path, artifacts=self.store.path) for _ in range(2)]
+        self.assertEqual([s['artifact'] for s in summaries], ['miss', 'hit'])
+        self.assertEqual(summaries[0]['errors'], summaries[1]['errors'])
+        self.assertEqual(summaries[1]['errors'], check_questionnaire(path)['errors'])
+        self.assertEqual(set(summaries[1]['timings']), {'compile', 'soundness', 'total'})
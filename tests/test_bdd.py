@@ -0,0 +1,73 @@
+from functools import reduce
+from unittest import TestCase
+
+from sympy import Symbol, true, false
+
+from fbc.eval import Enum, attach_bdd, evaluate_node_predicates, soundness_check, disjointness_check
+from fbc.logic.bdd import BDD, FALSE
+from tests.context.graphs import get_consistent_graph_01, get_inconsistent_graph_01, get_consistent_graph_03, \
+    get_inconsistent_graph_02a
+
+
+class Test(TestCase):
+    def test_bdd_tautology(self):
+        g, p1, p2 = get_consistent_graph_01()
+        exp = reduce(lambda a, b: a | b, [d['filter'] for d in g[1].values()])
+
+        bdd = BDD.from_exprs([exp], [p1, p2])
+        self.assertTrue(bdd.is_tautology(bdd.node(exp)))
+        self.assertEqual(bdd.domain, bdd.node(true))
+        self.assertEqual(FALSE, bdd.node(false))
+
+    def test_bdd_canonical(self):
+        p1 = Enum('p1', ['y', 'n', 'na'])
+        p2 = Enum('p2', ['y', 'n'])
+        flag = Symbol('flag', bool=True)
+
+        bdd = BDD.from_exprs([flag], [p1, p2])
+        self.assertEqual(bdd.node(p1.ne('y')), bdd.node(p1.eq('n') | p1.eq('na')))
+        self.assertEqual(bdd.node(~p1.eq('y') & flag), bdd.node(flag & (p1.eq('n') | p1.eq('na'))))
+        self.assertFalse(bdd.is_satisfiable(bdd.node(p1.eq('y') & p1.eq('n'))))
+        self.assertTrue(bdd.is_tautology(bdd.node(p2.eq('y') | p2.eq('n'))))
+
+    def test_bdd_not_tautology(self):
+        g, p1, p2 = get_inconsistent_graph_01()
+        exp = reduce(lambda a, b: a | b, [d['filter'] for d in g[1].values()])
+
+        bdd = BDD.from_exprs([exp], [p1, p2])
+        f = bdd.node(exp)
+        self.assertFalse(bdd.is_tautology(f))
+        self.assertEqual(f, bdd.node(bdd.to_expr(f)))
+
+    def test_evaluate_node_predicates_bdd(self):
+        g, p1 = get_consistent_graph_03()
+        h, _ = get_consistent_graph_03()
+
+        evaluate_node_predicates(g, 1, [p1], use_bdd=True)
+        evaluate_node_predicates(h, 1, [p1])
+
+        bdd = g.graph['bdd']
+        for v in g.nodes:
+            self.assertEqual(bdd.node(h.nodes[v]['pred']), g.nodes[v]['pred_bdd'])
+        self.assertEqual(true, g.nodes[22]['pred'])
+        self.assertEqual([soundness_check(h, v, [p1], true) for v in h.nodes],
+                         [soundness_check(g, v, [p1], true) for v in g.nodes])
+
+    def test_disjointness_check_bdd(self):
+        g, p1, p2 = get_inconsistent_graph_02a()
+
+        evaluate_node_predicates(g, 1, [p1, p2], use_bdd=True)
+        self.assertFalse(disjointness_check(g, 1, [p1, p2]))
+
+    def test_attach_bdd_unsupported(self):
+        g, p1, p2 = get_consistent_graph_01()
+        evaluate_node_predicates(g, 1, [p1, p2], use_bdd=True)
+        self.assertIn('bdd', g.graph)
+
+        # the filter cannot be represented in the BDD: stale BDD attributes must not be used by the checks
+        g.edges[1, 5]['filter'] = g.edges[1, 5]['filter'] & (Symbol('x') > 5)
+        self.assertIsNone(attach_bdd(g, [p1, p2]))
+        self.assertNotIn('bdd', g.graph)
+        self.assertTrue(all(['filter_bdd' not in d for _, _, d in g.edges(data=True)]))
+        self.assertTrue(all(['pred_bdd' not in d for _, d in g.nodes(data=True)]))
+        self.assertFalse(soundness_check(g, 1, [p1, p2], true))
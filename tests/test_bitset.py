@@ -0,0 +1,61 @@
+from functools import reduce
+from unittest import TestCase
+
+from sympy import Symbol, true, false
+
+from fbc.eval import brute_force_enums, Enum
+from fbc.logic.atoms import UnsupportedExpression
+from fbc.logic.bitset import TruthTable
+from tests.context.graphs import get_consistent_graph_01, get_inconsistent_graph_01
+
+
+class Test(TestCase):
+    def test_truth_table_tautology(self):
+        g, p1, p2 = get_consistent_graph_01()
+        exp = reduce(lambda a, b: a | b, [d['filter'] for d in g[1].values()])
+
+        tt = TruthTable.from_exprs([exp], [p1, p2])
+        self.assertEqual((2, 2), tt.shape)
+        self.assertTrue(tt.is_tautology(exp))
+
+    def test_truth_table_not_tautology(self):
+        g, p1, p2 = get_inconsistent_graph_01()
+        exp = reduce(lambda a, b: a | b, [d['filter'] for d in g[1].values()])
+
+        tt = TruthTable.from_exprs([exp], [p1, p2])
+        self.assertFalse(tt.is_tautology(exp))
+        self.assertTrue(tt.is_satisfiable(exp))
+        self.assertEqual(3, int(tt.table(exp).sum()))
+
+    def test_truth_table_broadcast(self):
+        p = [Enum(f'p{i}', ['y', 'n', 'na']) for i in range(20)]
+        exp = p[3].eq('y') | p[3].ne('y')
+
+        tt = TruthTable.from_exprs([exp], p)
+        # the mask only spans the axis of p3 instead of the 3^20 assignments
+        self.assertEqual(3, tt.mask(exp).size)
+        self.assertTrue(tt.is_tautology(exp))
+
+    def test_truth_table_boolean_symbols(self):
+        p1 = Enum('p1', ['y', 'n'])
+        flag = Symbol('flag', bool=True)
+        exp = (p1.eq('y') & flag) | (p1.eq('n') & flag) | ~flag
+
+        tt = TruthTable.from_exprs([exp], [p1])
+        self.assertEqual((2, 2), tt.shape)
+        self.assertTrue(tt.is_tautology(exp))
+
+    def test_truth_table_unsupported(self):
+        p1 = Enum('p1', ['y', 'n'])
+        exp = p1.eq('y') | (Symbol('x', real=True) > 5)
+
+        with self.assertRaises(UnsupportedExpression):
+            TruthTable.from_exprs([exp], [p1]).mask(exp)
+
+    def test_brute_force_enums_order(self):
+        p1 = Enum('p1', ['y', 'n'])
+        p2 = Enum('p2', ['y', 'n', 'na'])
+        exp = p1.eq('y') & p2.ne('na')
+
+        expected = [true if m1 == 'y' and m2 != 'na' else false for m1 in p1.members for m2 in p2.members]
+        self.assertEqual(expected, brute_force_enums(exp, [p1, p2]))
@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+from sympy import Symbol, And, Or, Not
+
+from fbc.cache import SimplifyCache, current_simplify_cache, default_simplify_cache, memoize_cached, simplify_cached, \
+    simplify_scope
+from fbc.eval import Enum
+from fbc.session import Session
+from tests.context.graphs import get_consistent_graph_01
+
+
+class Test(TestCase):
+    a, b, c = Symbol('a'), Symbol('b'), Symbol('c')
+
+    def test_lru(self):
+        cache = SimplifyCache(maxsize=2)
+        exps = [And(self.a, Not(self.a)), Or(self.b, Not(self.b)), And(self.a, self.b, self.a)]
+
+        cache(exps[0])
+        cache(exps[1])
+        cache(exps[0])  # exps[1] is now least recently used
+        cache(exps[2])
+
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 3)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(len(cache), 2)
+
+        cache(exps[0])
+        self.assertEqual(cache.hits, 2)
+        cache(exps[1])
+        self.assertEqual(cache.misses, 4)
+
+    def test_max_bytes(self):
+        cache = SimplifyCache(maxsize=None, max_bytes=2000)
+        for i in range(20):
+            cache(And(Symbol(f'x{i}'), Symbol(f'y{i}')))
+
+        self.assertLessEqual(cache.bytes, 2000)
+        self.assertGreater(cache.evictions, 0)
+        self.assertEqual(len(cache) + cache.evictions, 20)
+
+    def test_memoize(self):
+        cache = SimplifyCache(maxsize=2)
+        self.assertEqual(1, cache.memoize(('f', self.a), lambda: 1))
+        self.assertEqual(1, cache.memoize(('f', self.a), lambda: 2))
+        cache(And(self.a, self.b))
+        cache.memoize(('f', self.b), lambda: 3)
+
+        self.assertEqual((1, 3, 1), (cache.hits, cache.misses, cache.evictions))
+        with simplify_scope(cache):
+            self.assertEqual(3, memoize_cached(('f', self.b), lambda: 4))
+
+    def test_scope(self):
+        e = Enum('p1', ['y', 'n'])
+        with simplify_scope() as cache:
+            self.assertIs(current_simplify_cache(), cache)
+            e.eq('y')
+            e.eq('y')
+            simplify_cached(And(self.a, self.c))
+            with simplify_scope(SimplifyCache()) as inner:
+                e.eq('y')
+            self.assertIs(current_simplify_cache(), cache)
+
+        self.assertIs(current_simplify_cache(), default_simplify_cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertEqual((inner.hits, inner.misses), (0, 1))
+
+    def test_session(self):
+        g, p1, p2 = get_consistent_graph_01()
+        cache = SimplifyCache()
+        session = Session(g, 1, [p1, p2], cache=cache)
+
+        self.assertIs(session.cache, cache)
+        self.assertGreater(cache.misses, 0)
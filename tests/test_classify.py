@@ -0,0 +1,88 @@
+from functools import reduce
+from typing import Iterator
+from unittest import TestCase
+
+from sympy import Symbol, true, false
+
+from fbc.eval import Enum, Interv, brute_force_enums
+from fbc.cache import simplify_scope
+from fbc.logic.classify import CONTINGENT, CONTRADICTION, TAUTOLOGY, classify, component_size, \
+    components, split, substitute_enums
+
+
+class Test(TestCase):
+    def test_classify(self):
+        p1 = Enum('p1', ['y', 'n'])
+        p2 = Enum('p2', ['y', 'n', 'na'])
+
+        self.assertIs(TAUTOLOGY, classify(p1.eq('y') | p1.ne('y'), [p1, p2]))
+        self.assertIs(CONTRADICTION, classify(p1.eq('y') & p1.eq('n'), [p1, p2]))
+        self.assertIs(CONTINGENT, classify(p1.eq('y') & p2.ne('na'), [p1, p2]))
+        self.assertIs(TAUTOLOGY, classify(true, []))
+        self.assertIs(CONTRADICTION, classify(False, []))
+
+    def test_classify_intervals(self):
+        v1 = Interv('v1')
+        self.assertIs(TAUTOLOGY, classify((v1.var < 5) | (v1.var >= 5), [v1]))
+        self.assertIs(CONTINGENT, classify((v1.var < 5) | (v1.var > 5), [v1]))
+        self.assertIs(CONTRADICTION, classify((v1.var < 5) & (v1.var > 7), [v1]))
+
+    def test_classify_substitution(self):
+        # relations over a number variable without interval domain cannot be represented as bitset
+        p1 = Enum('p1', ['y', 'n'])
+        x = Symbol('x', real=True, finite=True)
+
+        self.assertIs(TAUTOLOGY, classify(p1.eq('y') | p1.ne('y') | (x > 5), [p1]))
+        self.assertIs(CONTRADICTION, classify(p1.eq('y') & p1.eq('n') & (x > 5), [p1]))
+        # unresolved after substitution
+        self.assertIs(CONTINGENT, classify(p1.eq('y') | (x > 5), [p1]))
+
+    def test_classify_memoized(self):
+        p1 = Enum('p1', ['y', 'n'])
+        exp = p1.eq('y') | p1.eq('n')
+
+        with simplify_scope() as cache:
+            classify(exp, [p1])
+            hits = cache.hits
+            self.assertIs(TAUTOLOGY, classify(exp, [p1]))
+            self.assertEqual(hits + 1, cache.hits)
+
+        # new boundaries of an interval domain change its cells, the memoized result is not reused
+        v1 = Interv('v1')
+        with simplify_scope() as cache:
+            classify(v1.var < 5, [v1])
+            misses = cache.misses
+            v1.refine([v1.var > 7])
+            self.assertIs(CONTINGENT, classify(v1.var < 5, [v1]))
+            self.assertGreater(cache.misses, misses)
+
+    def test_substitute_enums(self):
+        p1 = Enum('p1', ['y', 'n'])
+        p2 = Enum('p2', ['y', 'n', 'na'])
+        exp = p1.eq('y') & p2.ne('na')
+
+        substituted = substitute_enums(exp, [p1, p2])
+        self.assertIsInstance(substituted, Iterator)
+        self.assertEqual(brute_force_enums(exp, [p1, p2]), list(substituted))
+
+    def test_components(self):
+        p = [Enum(f'p{i}', ['y', 'n', 'na']) for i in range(9)]
+        exp = ((p[1].eq('y') & p[2].eq('y')) | p[1].eq('n')) & (p[7].eq('y') | p[8].eq('y'))
+
+        self.assertCountEqual([(p[1].eq('y') & p[2].eq('y')) | p[1].eq('n'), p[7].eq('y') | p[8].eq('y')],
+                              split(exp, p))
+        self.assertCountEqual([[p[1], p[2]], [p[7]], [p[8]]], components(exp, p))
+        self.assertCountEqual([9, 3, 3], [component_size(c) for c in components(exp, p)])
+        # negations are split as well
+        self.assertCountEqual([[p[1]], [p[2], p[3]], [p[7]], [p[8]]], components(
+            ~(p[1].eq('y') | (p[2].eq('n') & p[3].eq('n')) | p[2].eq('y')) | ~(p[7].eq('y') & p[8].eq('y')), p))
+        self.assertEqual([], components(true, p))
+
+    def test_classify_components(self):
+        p = [Enum(f'p{i}', ['y', 'n']) for i in range(24)]
+        # the product of all enums has 2 ** 24 assignments
+        tautology = reduce(lambda a, b: a & b, [e.eq('y') | e.eq('n') for e in p])
+        self.assertIs(TAUTOLOGY, classify(tautology, p))
+        self.assertIs(CONTINGENT, classify(tautology & p[0].eq('y'), p))
+        self.assertIs(CONTRADICTION, classify(tautology & p[0].eq('y') & p[0].eq('n'), p))
+        self.assertIs(TAUTOLOGY, classify(~tautology | p[3].eq('y') | p[3].eq('n'), p))
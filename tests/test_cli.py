@@ -0,0 +1,67 @@
+import json
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import TestCase
+
+from fbc.cli import check, check_questionnaire, main
+from fbc.data.parse import default_parse_caches
+
+
+class Test(TestCase):
+    context = Path('.', 'tests', 'context')
+
+    def test_check_questionnaire(self):
+        summary = check_questionnaire(Path(self.context, 'questionnaire_simplified_enum.xml'))
+        self.assertTrue(summary['ok'])
+        self.assertEqual(summary['errors'], [])
+        self.assertEqual(summary['pages'], 9)
+        self.assertEqual(set(summary['timings']), {'read', 'graph', 'predicates', 'soundness', 'total'})
+
+    def test_check_questionnaire_fail(self):
+        summary = check_questionnaire(Path(self.context, 'questionnaire_A01_soundness_fail.xml'))
+        self.assertFalse(summary['ok'])
+        self.assertIn("The following nodes do not pass soundness check (outgoing edges conditions): ['A01']",
+                      summary['errors'])
+
+    def test_check_questionnaire_parse_cache(self):
+        paths = [cache.path for cache in default_parse_caches.values()]
+        with tempfile.TemporaryDirectory() as tmp:
+            summary = check_questionnaire(Path(self.context, 'questionnaire_simplified_enum.xml'), parse_cache=tmp)
+            self.assertTrue(summary['ok'])
+            self.assertNotEqual([], list(Path(tmp).rglob('*')))
+        # the process wide parse caches are left unchanged
+        self.assertEqual(paths, [cache.path for cache in default_parse_caches.values()])
+
+    def test_check_jobs(self):
+        paths = [str(Path(self.context, f)) for f in ['questionnaire_simplified_enum.xml',
+                                                      'questionnaire_A01_soundness_fail.xml']]
+        sequential = [s['ok'] for s in check(paths)]
+        parallel = [s['ok'] for s in check(paths, jobs=2)]
+        self.assertEqual(sequential, [True, False])
+        self.assertEqual(parallel, sequential)
+
+    def test_main(self):
+        out = StringIO()
+        with redirect_stdout(out):
+            exit_code = main(['check', str(Path(self.context, 'questionnaire_simplified_enum.xml'))])
+        self.assertEqual(exit_code, 0)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(json.loads(lines[0])['ok'])
+
+    def test_main_trace(self):
+        with tempfile.TemporaryDirectory() as trace, redirect_stdout(StringIO()):
+            main(['check', '--trace', trace, str(Path(self.context, 'questionnaire_simplified_enum.xml'))])
+            with open(Path(trace, 'questionnaire_simplified_enum.trace.json')) as f:
+                events = json.load(f)['traceEvents']
+        self.assertIn('soundness_check', {e['name'] for e in events})
+
+    def test_main_connect_unsupported(self):
+        path = str(Path(self.context, 'questionnaire_simplified_enum.xml'))
+        for option in [['--render'], ['--jobs', '2'], ['--trace', 'trace']]:
+            with self.assertRaises(SystemExit) as cm, redirect_stderr(StringIO()) as err:
+                main(['check', '--connect', 'fbc.sock', *option, path])
+            self.assertEqual(2, cm.exception.code)
+            self.assertIn(f'not supported with --connect: {option[0]}', err.getvalue())
@@ -0,0 +1,70 @@
+import asyncio
+import os
+import socket
+import tempfile
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase
+
+from fbc.daemon import Daemon, request
+
+
+class Test(IsolatedAsyncioTestCase):
+    context = Path('.', 'tests', 'context')
+
+    async def asyncSetUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.socket_path = os.path.join(tmp.name, 'fbc.sock')
+        self.daemon = Daemon(self.socket_path, jobs=2)
+        await self.daemon.start()
+
+    async def asyncTearDown(self):
+        await self.daemon.close()
+
+    async def request(self, name: str, **options):
+        xml = Path(self.context, name).read_text(encoding='utf-8')
+        return await asyncio.get_running_loop().run_in_executor(None, lambda: request(self.socket_path, xml, name,
+                                                                                      **options))
+
+    async def test_check(self):
+        ok, fail = await asyncio.gather(self.request('questionnaire_simplified_enum.xml'),
+                                        self.request('questionnaire_A01_soundness_fail.xml', sat=True))
+        self.assertEqual((ok['path'], ok['ok'], ok['pages']), ('questionnaire_simplified_enum.xml', True, 9))
+        self.assertFalse(fail['ok'])
+        self.assertIn("The following nodes do not pass soundness check (outgoing edges conditions): ['A01']",
+                      fail['errors'])
+
+    async def test_invalid_request(self):
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        writer.write(b'{"path": "q.xml"}\nnot json\n')
+        await writer.drain()
+        responses = [await reader.readline(), await reader.readline()]
+        writer.close()
+        self.assertTrue(all(b'"ok": false' in r for r in responses))
+        self.assertIn(b"'xml'", responses[0])
+
+        response = await self.request('questionnaire_simplified_enum.xml')
+        self.assertTrue(response['ok'])
+
+    async def test_worker_error(self):
+        # errors other than invalid requests are answered as well
+        response = await self.request('questionnaire_simplified_enum.xml', parser='unknown')
+        self.assertFalse(response['ok'])
+        self.assertTrue(response['errors'][0].startswith('KeyError'))
+
+        response = await self.request('questionnaire_simplified_enum.xml')
+        self.assertTrue(response['ok'])
+
+    async def test_start_running(self):
+        with self.assertRaises(ValueError):
+            await Daemon(self.socket_path).start()
+        self.assertTrue((await self.request('questionnaire_simplified_enum.xml'))['ok'])
+
+    async def test_start_stale_socket(self):
+        socket_path = f'{self.socket_path}.stale'
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.bind(socket_path)
+        daemon = Daemon(socket_path)
+        await daemon.start()
+        self.addAsyncCleanup(daemon.close)
+        self.assertTrue(os.path.exists(socket_path))
@@ -1,11 +1,13 @@
 from functools import reduce
 from unittest import TestCase
 
-from sympy import simplify, true
+import networkx as nx
+from sympy import Symbol, simplify, true, Float, Integer, Interval, Rational, Union, oo
 
 from fbc.eval import soundness_check, brute_force_enums, disjointness_check, evaluate_node_predicates, \
-    evaluate_edge_filters
-from fbc.util import draw_graph
+    evaluate_edge_filters, Enum, relevant_enums, graph_soundness_check, Interv, filters_soundness_check, \
+    NumberVariable, SpringExpEnumEvaluator
+from fbc.visualize import draw_graph
 from tests.context.graphs import get_inconsistent_graph_01, get_inconsistent_graph_02, get_consistent_graph_01, \
     get_consistent_graph_02, get_consistent_graph_03, get_inconsistent_graph_03, get_inconsistent_graph_02a, \
     get_consistent_graph_04, get_consistent_graph_05
@@ -133,6 +135,16 @@ class Test(TestCase):
         self.assertTrue(result)
         # ToDo: It needs to be checked whether this actually covers the consistency conditions discussed in the paper!
 
+    def test_disjointness_check_unsupported(self):
+        # atoms the bitset cannot represent: the fallback decides overlap like the other paths
+        p1 = Enum('p1', ['y', 'n'])
+        x = Symbol('x', real=True, finite=True)
+        for extra in [true, x > 1]:
+            g = nx.DiGraph()
+            g.add_edges_from([(1, 2, {'filter': p1.eq('y') & p1.eq('n') & extra}),
+                              (1, 3, {'filter': p1.eq('y') & p1.eq('n') & extra})])
+            self.assertTrue(disjointness_check(g, 1, [p1]))
+
     def test_evaluate_node_predicates_01(self):
         g, p1 = get_consistent_graph_03()
 
@@ -175,6 +187,96 @@ class Test(TestCase):
         draw_graph(g, "test_evaluate_node_predicates_05.png")
         g = evaluate_node_predicates(g, 1, [p1])
         draw_graph(g, 'test_evaluate_node_predicates_05_predicates.png')
+        self.assertTrue(graph_soundness_check(g, 1, [p1]))
         g = evaluate_edge_filters(g, [p1])
         draw_graph(g, 'test_evaluate_node_predicates_05_filters.png')
-        self.fail()
+
+        self.assertEqual(p1.eq(200), g.nodes[3]['pred'])
+        self.assertEqual(p1.gt(800), g.nodes[16]['pred'])
+        self.assertEqual(p1.ge(500), g.nodes[17]['pred'])
+        self.assertEqual(true, g.nodes[11]['pred'])
+        self.assertTrue(all([disjointness_check(g, v, [p1]) for v in g.nodes]))
+
+    def test_evaluate_node_predicates_linear(self):
+        p1 = Enum('p1', ['y', 'n'])
+        g = nx.DiGraph()
+        nx.add_path(g, range(500), filter=true)
+        g.add_edge(0, 0, filter=p1.eq('y'))
+
+        g = evaluate_node_predicates(g, 0, [p1])
+        self.assertTrue(all([g.nodes[v]['pred'] == true for v in g.nodes]))
+
+    def test_evaluate_node_predicates_blocking(self):
+        p1 = Enum('p1', ['y', 'n'])
+        g = nx.DiGraph()
+        g.add_edges_from([(1, 2, {"filter": p1.eq('y')}),
+                          (1, 3, {"filter": p1.eq('n')}),
+                          (2, 4, {"filter": true}),
+                          (4, 2, {"filter": true}),
+                          (3, 5, {"filter": true})])
+
+        with self.assertRaises(ValueError) as cm:
+            evaluate_node_predicates(g, 1, [p1])
+        self.assertEqual(("Could not process in evaluating node predicates: blocking=[2, 4]",), cm.exception.args)
+
+    def test_relevant_enums(self):
+        g, p1, p2 = get_consistent_graph_01()
+        enums = [Enum(f'q{i}', ['y', 'n', 'na']) for i in range(20)]
+
+        out_predicates = [d['filter'] for d in g[1].values()]
+        self.assertEqual([p1, p2], relevant_enums(out_predicates, enums[:10] + [p1, p2] + enums[10:]))
+        self.assertEqual([], relevant_enums([true], enums))
+
+        with self.assertLogs('fbc.eval', level='DEBUG') as cm:
+            self.assertTrue(soundness_check(g, 1, [p1, p2] + enums, true))
+        self.assertIn(f'node 1: enumerating 4 of {4 * 3 ** 20} assignments ({4 * 3 ** 20 - 4} skipped)', cm.output[0])
+
+    def test_graph_soundness_check_jobs(self):
+        g, p1, p2 = get_consistent_graph_01()
+        self.assertTrue(graph_soundness_check(g, 1, [p1, p2], jobs=2))
+
+        g, p1, p2 = get_inconsistent_graph_01()
+        with self.assertRaises(ValueError) as serial:
+            graph_soundness_check(g, 1, [p1, p2])
+        with self.assertRaises(ValueError) as parallel:
+            graph_soundness_check(g, 1, [p1, p2], jobs=2)
+        self.assertEqual(serial.exception.args, parallel.exception.args)
+        self.assertEqual(("The following nodes do not pass soundness check (outgoing edges conditions): [1]",),
+                         parallel.exception.args)
+
+    def test_interval_cells(self):
+        v1 = Interv('v1', Union(Interval(0, 10), Interval(20, 30)))
+        v1.lt(5)
+        v1.ge(20)
+        self.assertEqual([Interval.Ropen(0, 5), {5}, Interval.Lopen(5, 10), {20}, Interval.Lopen(20, 30)], v1.cells)
+        self.assertTrue(all([next(iter(d.values())) in c for d, c in zip(v1.subs_dicts, v1.cells)]))
+
+    def test_interval_boundaries_normalized(self):
+        v1 = Interv('v1')
+        self.assertTrue(filters_soundness_check([v1.gt(Integer(5)), v1.le(Float(5.0))], [v1], true))
+        self.assertTrue(filters_soundness_check([v1.gt(Float(0.1)), v1.le(Rational(1, 10))], [v1], true, sat=True))
+        self.assertEqual([Interval.open(-oo, Rational(1, 10)), {Rational(1, 10)}, Interval.open(Rational(1, 10), 5),
+                          {5}, Interval.open(5, oo)], v1.cells)
+
+    def test_interval_soundness_check(self):
+        v1 = Interv('v1')
+        self.assertFalse(filters_soundness_check([v1.lt(500), v1.gt(500)], [v1], true))
+        self.assertTrue(filters_soundness_check([v1.lt(500), v1.ge(500)], [v1], true))
+        self.assertTrue(filters_soundness_check([v1.lt(500), v1.ge(500)], [v1], true, sat=True))
+
+        # the domain bounds the variable
+        v2 = Interv('v2', Interval(0, 10))
+        self.assertTrue(filters_soundness_check([v2.le(10)], [v2], true))
+        self.assertFalse(filters_soundness_check([v2.lt(10)], [v2], true))
+
+    def test_number_variable_filters(self):
+        evaluator = SpringExpEnumEvaluator({'age': NumberVariable('age')}, {})
+        age = Interv('age', Interval(0, oo))
+        filters = [evaluator('zofar.asNumber(age) lt 18'), evaluator('zofar.asNumber(age) ge 18 and '
+                                                                     'zofar.asNumber(age) le 65'),
+                   evaluator('zofar.asNumber(age) gt 65')]
+
+        self.assertEqual([age], relevant_enums(filters, [age]))
+        self.assertTrue(filters_soundness_check(filters, [age], true))
+        self.assertFalse(filters_soundness_check(filters[:1] + filters[2:], [age], true))
+        self.assertEqual([Interval.Ropen(0, 18), {18}, Interval.open(18, 65), {65}, Interval.open(65, oo)], age.cells)
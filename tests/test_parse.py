@@ -0,0 +1,51 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from fbc.data.parse import LispParser, ParseCache, PrattParser
+from fbc.samples.expressions import EXPRESSIONS, random_expressions
+
+
+class Test(TestCase):
+    exp = "var01.value == 'ao1' and !(var02.value gt 3)"
+
+    def assert_same_lisp(self, expressions):
+        lisp_parser = LispParser()
+        pratt_parser = PrattParser()
+
+        for s in expressions:
+            try:
+                lisp = lisp_parser.parse(s)
+            except Exception:
+                lisp = None
+
+            with self.subTest(s=s):
+                if lisp is None:
+                    self.assertRaises(ValueError, pratt_parser.parse, s)
+                else:
+                    # compare representations, since e.g. `True == 1` and `1 == 1.0`
+                    self.assertEqual(repr(pratt_parser.parse(s)), repr(lisp))
+
+    def test_pratt_parser(self):
+        self.assert_same_lisp(EXPRESSIONS)
+
+    def test_pratt_parser_random(self):
+        self.assert_same_lisp(random_expressions(300))
+
+    def test_parse_cache(self):
+        cache = ParseCache()
+        lisp = cache.parse(self.exp)
+
+        self.assertEqual(lisp, LispParser().parse(self.exp))
+        self.assertIs(cache.parse(self.exp), lisp)
+        self.assertEqual((cache.hits, cache.disk_hits, cache.misses), (1, 0, 1))
+
+    def test_parse_cache_disk(self):
+        with TemporaryDirectory() as path:
+            cache = ParseCache(path=path)
+            lisp = cache.parse(self.exp)
+            self.assertTrue(cache.expression_path(self.exp).exists())
+
+            # a new process wide cache reads the expression from disk instead of parsing it
+            cache = ParseCache(path=path)
+            self.assertEqual(cache.parse(self.exp), lisp)
+            self.assertEqual((cache.hits, cache.disk_hits, cache.misses), (0, 1, 0))
@@ -0,0 +1,42 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from fbc.cli import check_questionnaire
+from fbc.data.xml import read_questionnaire
+from fbc.samples.questionnaires import generate_questionnaire
+
+
+class Test(TestCase):
+
+    def generated(self, **kwargs) -> Path:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = Path(tmp.name, 'generated.xml')
+        path.write_text(generate_questionnaire(**kwargs))
+        return path
+
+    def test_shape(self):
+        q = read_questionnaire(self.generated(pages=12, branching=3, enums=5, members=4, loops=1.0, seed=3))
+        self.assertEqual([p.uid for p in q.pages], [f'p{i}' for i in range(12)])
+        self.assertEqual(sorted(evs.variable.name for p in q.pages for evs in p.enum_values),
+                         sorted(f'e{j}' for j in range(5)))
+        for i, p in enumerate(q.pages[:-1]):
+            targets = [t.target_uid for t in p.transitions]
+            self.assertEqual(targets[0] == p.uid, i > 0)
+            self.assertEqual(targets[-1], f'p{i + 1}')
+            self.assertLessEqual(len(targets), 4)
+        self.assertEqual(q.pages[-1].transitions, [])
+
+    def test_deterministic(self):
+        self.assertEqual(generate_questionnaire(pages=8, depth=3, seed=1),
+                         generate_questionnaire(pages=8, depth=3, seed=1))
+
+    def test_check(self):
+        summary = check_questionnaire(self.generated(pages=4, depth=2, loops=0.5, seed=0), parser='pratt')
+        self.assertEqual(summary['errors'], [])
+        self.assertEqual(summary['pages'], 4)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            generate_questionnaire(pages=0)
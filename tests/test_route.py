@@ -0,0 +1,73 @@
+import random
+from pathlib import Path
+from unittest import TestCase
+
+from sympy import Symbol, true
+
+from fbc.data import xml
+from fbc.data.xml import read_questionnaire
+from fbc.eval import construct_graph, enum_dict
+from fbc.route import Router
+
+
+class Test(TestCase):
+    def assert_same_as_filters(self, path: Path, samples: int = 50):
+        q = read_questionnaire(path)
+        g = construct_graph(q)
+        enums = enum_dict(q.pages)
+        router = Router.from_questionnaire(q)
+
+        booleans = sorted({str(s) for _, _, f in g.edges(data='filter') for s in f.free_symbols} -
+                          {str(e.var) for e in enums.values()} -
+                          {str(s) for e in enums.values() for s in e.member_vars.values()})
+        variables = [name for name in enums if f'{name}_NUM' in enums]
+
+        rnd = random.Random(0)
+        for _ in range(samples):
+            answers = {name: rnd.choice([True, False]) for name in booleans}
+            subs = {Symbol(name, bool=True): value for name, value in answers.items()}
+            for name in variables:
+                uid = rnd.choice(list(enums[name].member_vars))
+                answers[name] = uid
+                # substitute enum variables and literals by the index of the member
+                index = list(enums[name].member_vars).index(uid)
+                for e in [enums[name], enums[f'{name}_NUM']]:
+                    subs[e.var] = index
+                    subs.update({sym: i for i, sym in enumerate(e.member_vars.values())})
+
+            for page in q.pages:
+                target = router.next_page(page.uid, answers)
+                fired = [v for _, v, f in g.out_edges(page.uid, data='filter') if f.subs(subs) == true]
+                with self.subTest(page=page.uid, answers=answers):
+                    if target is None:
+                        self.assertEqual(fired, [])
+                    else:
+                        self.assertIn(target, fired)
+
+    def test_router(self):
+        for name in ['questionnaire.xml', 'questionnaire_A01_soundness_succ.xml',
+                     'questionnaire_simplified_enum.xml']:
+            self.assert_same_as_filters(Path('.', 'tests', 'context', name))
+
+    def test_path(self):
+        q = read_questionnaire(Path('.', 'tests', 'context', 'questionnaire.xml'))
+        router = Router.from_questionnaire(q)
+
+        self.assertEqual(router.path({'var01': True, 'var02': 'ao3'}), ['index', 'A01', 'A02', 'A05', 'A06', 'end'])
+        self.assertEqual(router.path({'var01': False, 'flag_index': True}), ['index', 'cancel1'])
+        self.assertEqual(router.next_page('A01', {'var01': True}), None)
+
+    def test_duplicate_values(self):
+        # answer options 'a' and 'b' share the value 1
+        v01 = xml.Variable('v01', 'enum')
+        values = [xml.EnumValue('a', 1, 'A'), xml.EnumValue('b', 1, 'B'), xml.EnumValue('c', 2, 'C')]
+        q = xml.Questionnaire({'v01': v01}, [
+            xml.Page('A01', [xml.Transition('A02', 'zofar.asNumber(v01) == 1'), xml.Transition('A03')], [],
+                     [xml.EnumValues(v01, values)]),
+            xml.Page('A02', [], [], []),
+            xml.Page('A03', [], [], [])])
+        router = Router.from_questionnaire(q)
+
+        self.assertEqual(router.next_page('A01', {'v01': 'a'}), 'A02')
+        self.assertEqual(router.next_page('A01', {'v01': 'b'}), 'A02')
+        self.assertEqual(router.next_page('A01', {'v01': 'c'}), 'A03')
@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from sympy import Symbol, true
+
+from fbc.eval import Enum, soundness_check, disjointness_check, graph_soundness_check
+from fbc.logic.sat import dpll, CNF
+from tests.context.graphs import get_consistent_graph_01, get_inconsistent_graph_01, get_consistent_graph_02, \
+    get_inconsistent_graph_02a
+
+
+class Test(TestCase):
+    def test_dpll(self):
+        self.assertIsNotNone(dpll([[1, 2], [-1, 2], [1, -2]], 2))
+        self.assertIsNone(dpll([[1, 2], [-1, 2], [1, -2], [-1, -2]], 2))
+        self.assertIsNone(dpll([[1], [-1]], 1))
+
+        model = dpll([[1, 2, 3], [-1], [-2]], 3)
+        self.assertEqual({1: False, 2: False, 3: True}, model)
+
+    def test_dpll_pigeonhole(self):
+        # 4 pigeons, 3 holes: variable 3 * p + h + 1 means pigeon p sits in hole h
+        clauses = [[3 * p + h + 1 for h in range(3)] for p in range(4)]
+        clauses += [[-(3 * p + h + 1), -(3 * q + h + 1)] for h in range(3) for p in range(4) for q in range(p + 1, 4)]
+        self.assertIsNone(dpll(clauses, 12))
+
+    def test_cnf_exactly_one(self):
+        p1 = Enum('p1', ['y', 'n', 'na'])
+        flag = Symbol('flag', bool=True)
+
+        cnf = CNF.from_exprs([flag], [p1])
+        self.assertTrue(cnf.is_valid(p1.eq('y') | p1.eq('n') | p1.eq('na')))
+        self.assertFalse(cnf.is_satisfiable(p1.eq('y') & p1.eq('n')))
+        self.assertTrue(cnf.is_valid(p1.ne('y') | (p1.eq('y') & flag) | ~flag))
+        self.assertFalse(cnf.is_valid(p1.ne('y') | flag))
+
+    def test_soundness_check_sat(self):
+        g, p1, p2 = get_consistent_graph_01()
+        self.assertTrue(all([soundness_check(g, v, [p1, p2], true, sat=True) for v in g.nodes]))
+        self.assertTrue(graph_soundness_check(g, 1, [p1, p2], sat=True))
+
+        g, p1, p2 = get_inconsistent_graph_01()
+        self.assertFalse(all([soundness_check(g, v, [p1, p2], true, sat=True) for v in g.nodes]))
+
+    def test_soundness_check_sat_wide(self):
+        # only two of the 40 enums are mentioned by the filters
+        g, p1, p2 = get_consistent_graph_01()
+        enums = [p1, p2] + [Enum(f'q{i}', ['y', 'n', 'na']) for i in range(40)]
+        self.assertTrue(soundness_check(g, 1, enums, true, sat=True))
+
+    def test_disjointness_check_sat(self):
+        g, p1, p2 = get_inconsistent_graph_02a()
+        self.assertFalse(all([disjointness_check(g, v, [p1, p2], sat=True) for v in g.nodes]))
+
+        g, p1, p2 = get_consistent_graph_02()
+        self.assertTrue(all([disjointness_check(g, v, [p1, p2], sat=True) for v in g.nodes]))
+
+    def test_disjointness_check_overlap(self):
+        p1 = Enum('p1', ['y', 'n'])
+        p2 = Enum('p2', ['y', 'n'])
+        g, _, _ = get_consistent_graph_01()
+        g.edges[1, 2]['filter'] = p1.eq('n')
+
+        # the filters of (1, 2) and (1, 3) overlap although their truth tables differ
+        self.assertFalse(disjointness_check(g, 1, [p1, p2], sat=True))
+        self.assertFalse(disjointness_check(g, 1, [p1, p2]))
@@ -0,0 +1,102 @@
+from pathlib import Path
+from unittest import TestCase
+
+from sympy import Symbol, true
+
+from fbc.data.xml import read_questionnaire
+from fbc.eval import Interv, evaluate_node_predicates, graph_soundness_check, soundness_check
+from fbc.logic.bdd import BDD
+from fbc.session import Session
+from fbc.verify import verify
+from tests.context.graphs import get_consistent_graph_01, get_consistent_graph_03
+
+
+class Test(TestCase):
+    def assert_same_as_full_evaluation(self, session: Session):
+        h = session.g.copy()
+        for _, data in h.nodes(data=True):
+            data.pop('pred', None)
+        evaluate_node_predicates(h, session.source, session.enums)
+
+        # predicates are compared as BDD nodes, since sympy does not simplify them to a canonical form
+        bdd = BDD.from_exprs([], session.enums)
+        self.assertEqual({v: bdd.node(d['pred']) for v, d in h.nodes(data=True) if 'pred' in d},
+                         {v: bdd.node(d['pred']) for v, d in session.g.nodes(data=True) if 'pred' in d})
+        self.assertEqual({v: soundness_check(h, v, session.enums, true) for v, d in h.nodes(data=True) if 'pred' in d},
+                         session.soundness)
+
+    def test_update_edge(self):
+        g, p1 = get_consistent_graph_03()
+        session = Session(g, 1, [p1])
+
+        session.update_edge(1500, 1501, p1.eq('a'))
+        self.assertEqual([1501, 16, 17, 18, 19, 11, 20, 21, 22], session.recomputed)
+        self.assert_same_as_full_evaluation(session)
+
+        session.update_edge(1500, 1501, p1.eq('d'))
+        self.assert_same_as_full_evaluation(session)
+
+    def test_update_edge_early_stop(self):
+        g, p1 = get_consistent_graph_03()
+        session = Session(g, 1, [p1], use_bdd=True)
+
+        # the predicate of node 3 stays p1 == 'a', so its descendants are not re-evaluated
+        session.update_edge(2, 3, p1.eq('a') | p1.eq('c'))
+        self.assertEqual([3], session.recomputed)
+        self.assert_same_as_full_evaluation(session)
+
+    def test_add_remove_edge(self):
+        g, p1 = get_consistent_graph_03()
+        session = Session(g, 1, [p1])
+
+        session.add_edge(22, 23, true)
+        self.assertEqual([23], session.recomputed)
+        self.assertEqual(true, g.nodes[23]['pred'])
+
+        session.remove_edge(12, 15)
+        self.assertNotIn('pred', g.nodes[15])
+        self.assertNotIn(15, session.soundness)
+        self.assert_same_as_full_evaluation(session)
+
+        session.add_edge(12, 15, ~p1.eq('c'))
+        self.assert_same_as_full_evaluation(session)
+
+    def test_soundness(self):
+        g, p1, p2 = get_consistent_graph_01()
+        session = Session(g, 1, [p1, p2])
+        self.assertTrue(session.check())
+
+        session.remove_edge(1, 5)
+        self.assertEqual([1], session.unsound_nodes)
+        with self.assertRaises(ValueError) as cm:
+            session.check()
+        self.assertEqual(("The following nodes do not pass soundness check (outgoing edges conditions): [1]",),
+                         cm.exception.args)
+
+        session.update_edge(1, 4, p1.eq('y'))
+        self.assertTrue(session.check())
+
+    def test_update_edge_unsupported_bdd(self):
+        g, p1, p2 = get_consistent_graph_01()
+        session = Session(g, 1, [p1, p2], use_bdd=True)
+        self.assertIsNotNone(session.bdd)
+        session.update_edge(1, 2, p1.eq('y'))
+        session.update_edge(1, 3, p1.eq('n'))
+
+        # the filter cannot be represented in the BDD: the session falls back to the sympy expressions
+        session.update_edge(1, 3, p1.eq('n') & (Symbol('x') > 5))
+        self.assertIsNone(session.bdd)
+        self.assertEqual(Session(g.copy(), 1, [p1, p2]).unsound_nodes, session.unsound_nodes)
+        self.assertIn(1, session.unsound_nodes)
+
+    def test_from_questionnaire(self):
+        q = read_questionnaire(Path('.', 'tests', 'context', 'questionnaire_A01_soundness_succ.xml'))
+        session = Session.from_questionnaire(q)
+        self.assertTrue(session.check())
+        self.assertTrue(graph_soundness_check(session.g, session.source, session.enums))
+        self.assertTrue(any([isinstance(e, Interv) for e in session.enums]))
+
+        # same verdict as the other entry points
+        for name in ['questionnaire_A01_soundness_succ.xml', 'questionnaire_A01_soundness_fail.xml']:
+            q = read_questionnaire(Path('.', 'tests', 'context', name))
+            self.assertEqual(verify(q).failed('soundness'), Session.from_questionnaire(q).unsound_nodes)
@@ -0,0 +1,41 @@
+from collections import Counter
+from pathlib import Path
+from unittest import TestCase
+
+import numpy as np
+
+from fbc.data.xml import read_questionnaire
+from fbc.eval import construct_graph, enum_dict
+from fbc.route import Router
+from fbc.simulate import Simulator
+
+
+class Test(TestCase):
+    def test_simulator(self):
+        q = read_questionnaire(Path('.', 'tests', 'context', 'questionnaire.xml'))
+        simulator = Simulator(construct_graph(q), 'index', list(enum_dict(q.pages).values()))
+        answers = simulator.random_answers(500, seed=0)
+        result = simulator.run(answers)
+
+        # compare with the paths of the single respondents
+        router = Router.from_questionnaire(q)
+        enums = {e.name: list(e.member_vars) for e in simulator.enums}
+        visits = Counter()
+        lengths = Counter()
+        for row in answers:
+            respondent = {c: enums[c][a] if c in enums else bool(a) for c, a in zip(simulator.columns, row)}
+            path = router.path(respondent)
+            visits.update(path)
+            lengths[len(path)] += 1
+
+        self.assertEqual({v: c for v, c in result.page_visits.items() if c > 0}, dict(visits))
+        self.assertEqual({k: c for k, c in enumerate(result.path_lengths) if c > 0}, dict(lengths))
+        self.assertEqual(sum(result.page_exits.values()), len(answers))
+        self.assertEqual(result.page_visits['A06'], result.edge_traversals[('A06', 'end')])
+
+    def test_simulator_columns(self):
+        q = read_questionnaire(Path('.', 'tests', 'context', 'questionnaire.xml'))
+        simulator = Simulator(construct_graph(q), 'index', list(enum_dict(q.pages).values()))
+
+        with self.assertRaises(ValueError):
+            simulator.run(np.zeros((10, len(simulator.columns) + 1), dtype=int))
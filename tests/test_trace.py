@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from fbc.eval import evaluate_node_predicates, graph_soundness_check, simplify_enums
+from fbc.trace import Tracer, current_tracer, span, traced, tracing
+from tests.context.graphs import get_consistent_graph_01
+
+
+@traced('test', lambda x: {'x': x})
+def double(x):
+    return 2 * x
+
+
+class Test(TestCase):
+
+    def test_disabled(self):
+        self.assertIsNone(current_tracer())
+        self.assertEqual(double(2), 4)
+        with span('block', node='A') as args:
+            self.assertEqual(args, {})
+            args['result'] = True
+        with span('block', node='B') as args:
+            self.assertEqual(args, {})
+
+    def test_traced(self):
+        with tracing() as tracer:
+            self.assertEqual(double(2), 4)
+            with span('block', 'test', node='A') as args:
+                args['size'] = 3
+        self.assertIsNone(current_tracer())
+
+        self.assertEqual([(e['name'], e['cat'], e['ph'], e['args']) for e in tracer.events],
+                         [('double', 'test', 'X', {'x': 2}), ('block', 'test', 'X', {'node': 'A', 'size': 3})])
+        self.assertTrue(all(e['dur'] >= 0 for e in tracer.events))
+
+    def test_nested(self):
+        outer = Tracer()
+        with tracing(tracer=outer):
+            with tracing() as inner:
+                double(1)
+            self.assertIs(current_tracer(), outer)
+        self.assertEqual(outer.events, [])
+        self.assertEqual(len(inner.events), 1)
+
+    def test_write(self):
+        g, p1, p2 = get_consistent_graph_01()
+        enums = [p1, p2]
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'trace.json')
+            with tracing(path):
+                evaluate_node_predicates(g, 1, enums)
+                graph_soundness_check(g, 1, enums)
+                simplify_enums(enums[0].eq('y') | enums[0].eq('n'), enums)
+            with open(path) as f:
+                events = json.load(f)['traceEvents']
+
+        names = [e['name'] for e in events]
+        self.assertEqual(names.count('node_predicate'), g.number_of_nodes())
+        self.assertIn('graph_soundness_check', names)
+        self.assertEqual({e['args']['enum_product'] for e in events if e['name'] == 'simplify_enums'}, {4})
+        self.assertEqual({e['args']['node'] for e in events if e['name'] == 'soundness_check'}, set(g.nodes))
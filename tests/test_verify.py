@@ -0,0 +1,109 @@
+import time
+from pathlib import Path
+from unittest import TestCase
+
+import networkx as nx
+from sympy import And, Symbol, true
+
+from fbc.data.xml import read_questionnaire, stream_questionnaire
+from fbc.eval import Enum, disjointness_check, evaluate_node_predicates
+from fbc.verify import node_checks, verify, verify_graph
+from tests.context.graphs import get_consistent_graph_01, get_consistent_graph_05
+
+
+class Test(TestCase):
+    context = Path('.', 'tests', 'context')
+
+    def test_verify(self):
+        report = verify(read_questionnaire(Path(self.context, 'questionnaire_simplified_enum.xml')))
+        self.assertTrue(report.ok)
+        self.assertEqual([], report.errors)
+        self.assertGreater(report.nodes, 0)
+
+    def test_verify_soundness_fail(self):
+        for sat in [False, True]:
+            report = verify(read_questionnaire(Path(self.context, 'questionnaire_A01_soundness_fail.xml')), sat=sat)
+            self.assertFalse(report.ok)
+            self.assertEqual(['A01'], report.failed('soundness'))
+            self.assertIn("The following nodes do not pass soundness check (outgoing edges conditions): ['A01']",
+                          report.errors)
+
+    def test_verify_stream(self):
+        path = Path(self.context, 'questionnaire_A01_soundness_fail.xml')
+        self.assertEqual(verify(read_questionnaire(path)), verify(stream_questionnaire(path)))
+
+    def test_verify_start_node(self):
+        report = verify(read_questionnaire(Path(self.context, 'questionnaire_too_many_start_nodes_fail01.xml')))
+        self.assertEqual(['index', 'cancel'], report.failed('start_node'))
+
+    def test_verify_graph(self):
+        g, p1 = get_consistent_graph_05()
+        evaluate_node_predicates(g, 1, [p1])
+        self.assertTrue(verify_graph(g, 1, [p1]).ok)
+
+        p2 = Enum('p2', ['y', 'n'])
+        g = nx.DiGraph()
+        g.add_edges_from([(1, 2, {'filter': p2.eq('y')}), (1, 3, {'filter': true}), (2, 4, {'filter': p2.eq('n')})])
+        evaluate_node_predicates(g, 1, [p2])
+
+        report = verify_graph(g, 1, [p2])
+        self.assertEqual([1], report.failed('disjointness'))
+        self.assertEqual([2], report.failed('soundness'))
+        self.assertEqual([4], report.failed('reachability'))
+        self.assertEqual(['soundness', 'disjointness', 'reachability'], [f.check for f in report.failures])
+
+    def test_verify_graph_final_nodes(self):
+        p2 = Enum('p2', ['y', 'n'])
+        g = nx.DiGraph()
+        g.add_edges_from([(1, 2, {'filter': p2.eq('y')}), (1, 3, {'filter': p2.eq('n')}), (3, 4, {'filter': true})])
+        evaluate_node_predicates(g, 1, [p2])
+
+        self.assertTrue(verify_graph(g, 1, [p2]).ok)
+        report = verify_graph(g, 1, [p2], final_nodes=True)
+        self.assertEqual([2, 4], report.failed('final_nodes'))
+        self.assertEqual([], report.failed('reachability'))
+
+    def test_node_checks(self):
+        g, p1, p2 = get_consistent_graph_01()
+        out_filters = [d['filter'] for d in g[1].values()]
+        self.assertEqual((True, True, [4]), node_checks(out_filters, [p1, p2]))
+        self.assertEqual((True, True, [4]), node_checks(out_filters, [p1, p2], sat=True))
+        self.assertEqual((True, True, []), node_checks([], [p1, p2]))
+
+        # atoms which cannot be represented as bitset
+        x = Symbol('x', real=True, finite=True)
+        self.assertEqual((False, True), node_checks([p1.eq('y') & (x > 5), p1.ne('y')], [p1])[:2])
+
+    def test_verify_graph_components(self):
+        enums = [Enum(f'q{i}', ['y', 'n', 'na']) for i in range(4)]
+        g = nx.DiGraph()
+        g.add_edges_from([(1, 2, {'filter': (enums[0].eq('y') & enums[1].eq('y')) | enums[0].eq('n')}),
+                          (1, 3, {'filter': enums[2].eq('y') | enums[3].eq('y')})])
+        evaluate_node_predicates(g, 1, enums)
+
+        report = verify_graph(g, 1, enums)
+        self.assertEqual([1], report.failed('soundness'))
+        self.assertCountEqual([9, 3, 3], report.components[1])
+        self.assertEqual([], report.components[2])
+
+    def test_verify_graph_independent_filters(self):
+        # the filters form two independent groups of 13 binary enums each, so each truth table has 2^13 instead of
+        # 2^26 assignments
+        enums = [Enum(f'q{i}', ['y', 'n']) for i in range(26)]
+        a = And(*[e.eq('y') for e in enums[:13]])
+        b = And(*[e.eq('y') for e in enums[13:]])
+        g = nx.DiGraph()
+        g.add_edges_from([(1, 2, {'filter': a}), (1, 3, {'filter': ~a}), (1, 4, {'filter': b & ~b})])
+        evaluate_node_predicates(g, 1, enums)
+
+        start = time.perf_counter()
+        report = verify_graph(g, 1, enums)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual([], report.failed('soundness'))
+        self.assertEqual([], report.failed('disjointness'))
+        self.assertCountEqual([2 ** 13, 2 ** 13], report.components[1])
+        self.assertTrue(disjointness_check(g, 1, enums))
+
+        g.add_edge(1, 5, filter=b)
+        self.assertFalse(disjointness_check(g, 1, enums))
+        self.assertEqual((True, False), node_checks([a, ~a, b], enums)[:2])
@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+from pygraphviz import AGraph
+from sympy import true
+
+import fbc.util
+from fbc.eval import evaluate_node_predicates
+from fbc import visualize
+from fbc.visualize import add_line_breaks_to_str, dot_lines, render, replace_sympy_expressions, tweak_label
+from tests.context.graphs import get_consistent_graph_01, get_consistent_graph_02
+
+
+class Test(TestCase):
+
+    def test_core_imports(self):
+        script = "import sys, fbc.cli, fbc.session\nprint(' '.join(sorted(sys.modules)))"
+        loaded = subprocess.run([sys.executable, '-c', script], check=True, capture_output=True, text=True)
+        modules = {m.split('.')[0] for m in loaded.stdout.split()}
+        self.assertNotIn('pygraphviz', modules)
+        self.assertNotIn('PIL', modules)
+        self.assertNotIn('fbc.visualize', loaded.stdout.split())
+
+    def test_util_reexports(self):
+        self.assertIs(fbc.util.draw_graph, visualize.draw_graph)
+        self.assertIs(fbc.util.to_agraph, visualize.to_agraph)
+        with self.assertRaises(AttributeError):
+            fbc.util.draw_graphs
+
+    def test_labels(self):
+        self.assertEqual(replace_sympy_expressions('Eq(LIT_var02_NUM_3, var02_NUM) & ~var01_IS_MISSING'),
+                         'var02==3 & var01==MIS')
+        self.assertEqual(add_line_breaks_to_str('aaaa bbbb ccccc', 9), 'aaaa\nbbbb\nccccc')
+        self.assertEqual(add_line_breaks_to_str('aaaaaaaaaaaa bb', 9), 'aaaaaaaaaaaa\nbb')
+        self.assertEqual(add_line_breaks_to_str('aaaaaaaaaaaa', 9), 'aaaaaaaaaaaa')
+
+    def test_dot_lines(self):
+        g, p1, p2 = get_consistent_graph_01()
+        g.nodes[1]['pred'] = true
+        agraph = AGraph(string=''.join(dot_lines(g)))
+        self.assertEqual(agraph.get_node(1).attr['label'], '1\\nTrue')
+        self.assertEqual(agraph.get_node(2).attr['label'], '2\\n')
+        self.assertEqual(agraph.get_edge(1, 2).attr['label'], str(g[1][2]['filter']))
+        self.assertEqual(agraph.number_of_edges(), g.number_of_edges())
+
+    def test_render_layout_reuse(self):
+        g, p1, p2 = get_consistent_graph_01()
+        with tempfile.TemporaryDirectory() as d:
+            layout, _ = render(g, os.path.join(d, 'graph.png'))
+            render(g, os.path.join(d, 'graph_label.svg'), label=tweak_label, layout=layout)
+            self.assertTrue(os.path.getsize(os.path.join(d, 'graph.png')) > 0)
+            self.assertTrue(os.path.getsize(os.path.join(d, 'graph_label.svg')) > 0)
+
+        _, data = render(g, image_format='dot', label=tweak_label, layout=layout)
+        positioned = AGraph(string=data.decode())
+
+        # the layout may be translated as a whole to fit the labels of the variant
+        def relative(positions):
+            x0, y0 = map(float, positions['1'].split(','))
+            return {n: tuple(round(float(c) - c0, 1) for c, c0 in zip(p.split(','), (x0, y0)))
+                    for n, p in positions.items()}
+
+        self.assertEqual(relative({n: attr['pos'] for n, attr in layout.nodes.items()}),
+                         relative({str(n): n.attr['pos'] for n in positioned.nodes_iter()}))
+
+        # node sizes fit the labels of the variant (with line breaks), not the labels the layout was computed for
+        g, p1, p2 = get_consistent_graph_02()
+        evaluate_node_predicates(g, 1, [p1, p2])
+        layout, _ = render(g, image_format='dot')
+        _, data = render(g, image_format='dot', label=tweak_label, layout=layout)
+        positioned = AGraph(string=data.decode())
+        _, data = render(g, image_format='dot', label=tweak_label)
+        computed = AGraph(string=data.decode())
+        self.assertEqual({str(n): (n.attr['width'], n.attr['height']) for n in computed.nodes_iter()},
+                         {str(n): (n.attr['width'], n.attr['height']) for n in positioned.nodes_iter()})
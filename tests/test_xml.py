@@ -0,0 +1,66 @@
+from pathlib import Path
+from unittest import TestCase
+from xml.etree import ElementTree
+
+from fbc.data.xml import EnumValue, Variable, ns, page, read_questionnaire, stream_questionnaire
+from fbc.eval import construct_graph
+
+
+class Test(TestCase):
+    path = Path('.', 'tests', 'context', 'questionnaire_A01_soundness_succ.xml')
+
+    def test_stream_questionnaire(self):
+        q = read_questionnaire(self.path)
+        stream = stream_questionnaire(self.path)
+
+        self.assertEqual(stream.variables, q.variables)
+        self.assertEqual(list(stream.pages), q.pages)
+
+    def test_construct_graph_from_stream(self):
+        g = construct_graph(read_questionnaire(self.path))
+        g_stream = construct_graph(stream_questionnaire(self.path))
+
+        self.assertEqual(list(g_stream.nodes), list(g.nodes))
+        self.assertEqual(dict(g_stream.edges), dict(g.edges))
+        self.assertEqual(repr(g_stream.graph['enums']), repr(g.graph['enums']))
+
+    def test_page(self):
+        element = ElementTree.fromstring(f"""
+            <zofar:page xmlns:zofar="{ns['zofar']}" uid="A01">
+                <zofar:body visible="v1">
+                    <zofar:section visible=" v2 ">
+                        <zofar:responseDomain variable="var01">
+                            <zofar:answerOption uid="ao1" value="1" label="yes"/>
+                            <zofar:answerOption uid="ao2" value="2" label="no" visible="v3"/>
+                        </zofar:responseDomain>
+                    </zofar:section>
+                    <zofar:open variable="var02"/>
+                </zofar:body>
+                <zofar:transitions>
+                    <zofar:transition target="A02" condition="var01.valueId == 'ao1'"/>
+                    <zofar:transition target="end"/>
+                </zofar:transitions>
+            </zofar:page>""")
+        variables = {'var01': Variable('var01', 'enum'), 'var02': Variable('var02', 'string')}
+
+        p = page(element, variables)
+        self.assertEqual([(t.target_uid, t.condition) for t in p.transitions],
+                         [('A02', "var01.valueId == 'ao1'"), ('end', None)])
+        self.assertEqual([(r.variable.name, r.condition) for r in p.var_refs],
+                         [('var01', ['v1', 'v2']), ('var02', ['v1'])])
+        self.assertEqual(len(p.enum_values), 1)
+        self.assertEqual(p.enum_values[0].values, [EnumValue('ao1', 1, 'yes'), EnumValue('ao2', 2, 'no')])
+
+        with self.assertRaises(ValueError):
+            page(element, {'var01': Variable('var01', 'enum')})
+
+    def test_page_deep_body(self):
+        element = ElementTree.fromstring(f'<zofar:page xmlns:zofar="{ns["zofar"]}" uid="A01"><zofar:body/></zofar:page>')
+        inner = element[0]
+        for _ in range(5000):
+            inner = ElementTree.SubElement(inner, f"{{{ns['zofar']}}}section", visible='v')
+        ElementTree.SubElement(inner, f"{{{ns['zofar']}}}open", variable='var01')
+
+        p = page(element, {'var01': Variable('var01', 'string')})
+        self.assertEqual(len(p.var_refs), 1)
+        self.assertEqual(len(p.var_refs[0].condition), 5000)